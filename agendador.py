@@ -0,0 +1,227 @@
+"""
+🗓️ Agenda da campanha: prioridade dos contatos, janelas de envio e previsão de término
+
+Os contatos são ordenados por prioridade: primeiro quem aparece em mais
+fontes, depois o peso da fonte e a recência do cadastro. A fila fica gravada
+em JSON (troca atômica do arquivo) e cada contato concluído sai dela na hora,
+então a campanha pode parar no fim do expediente e continuar no dia seguinte
+de onde parou, sem fatiar o CSV à mão. Os envios só acontecem dentro das
+janelas configuradas (ex.: "seg-sex 09:00-12:00") e a previsão de término
+distribui o tempo restante, medido pela vazão real, por essas janelas.
+"""
+
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from itertools import count
+
+import numpy as np
+import pandas as pd
+
+CAMINHO_FILA_PADRAO = 'fila_campanha.json'
+
+DIAS_SEMANA = ['seg', 'ter', 'qua', 'qui', 'sex', 'sab', 'dom']
+JANELAS_PADRAO = ['seg-sex 09:00-12:00', 'seg-sex 14:00-18:00']
+
+# Cada fonte a mais vale mais que o peso da fonte e a recência somados
+PONTOS_POR_ORIGEM = 10
+PESOS_ORIGEM_PADRAO = {'Lojas Interessadas': 3, 'Inscritos na Live': 2, 'Lojas com Potencial': 1}
+PONTOS_RECENCIA = 5
+MEIA_VIDA_RECENCIA_DIAS = 30
+COLUNAS_DATA = ['Data', 'Data de Inscrição', 'Data de inscrição', 'Data_Cadastro', 'criado_em', 'atualizado_em']
+
+# Espera máxima de cada sleep fora da janela (o relógio é conferido de novo a cada volta)
+PASSO_ESPERA = 60
+
+
+# Função para pontuar os leads (maior = envia antes)
+def pontuar_leads(df, pesos_origem=None, agora=None):
+    """
+    Usa o que o CSV tiver: Qtd_Origens ou Todas_Origens (lista consolidada)
+    para contar as fontes, Origem/Todas_Origens para o peso da fonte e a
+    primeira coluna de data conhecida para a recência (meia-vida de 30 dias).
+    Sem essas colunas, todos empatam e a ordem do arquivo é mantida.
+    """
+    pesos_origem = PESOS_ORIGEM_PADRAO if pesos_origem is None else pesos_origem
+    quantidade = np.ones(len(df))
+    peso = np.zeros(len(df))
+
+    # Cada texto de origens distinto é quebrado uma vez só
+    coluna_origens = next((coluna for coluna in ['Todas_Origens', 'Origem'] if coluna in df.columns), None)
+    if coluna_origens:
+        codigos, textos = pd.factorize(df[coluna_origens].fillna('').astype(str))
+        listas = [[origem.strip() for origem in texto.split(',') if origem.strip()] for texto in textos]
+        quantidade = np.array([len(origens) for origens in listas] or [0], dtype=float)[codigos]
+        peso = np.array([max((pesos_origem.get(origem, 0) for origem in origens), default=0) for origens in listas]
+                        or [0], dtype=float)[codigos]
+    if 'Qtd_Origens' in df.columns:
+        quantidade = pd.to_numeric(df['Qtd_Origens'], errors='coerce').fillna(1).to_numpy(dtype=float)
+
+    recencia = np.zeros(len(df))
+    coluna_data = next((coluna for coluna in COLUNAS_DATA if coluna in df.columns), None)
+    if coluna_data:
+        datas = pd.to_datetime(df[coluna_data], errors='coerce', dayfirst=True)
+        dias = (pd.Timestamp(agora or datetime.now()) - datas).dt.total_seconds() / 86400
+        recencia = (PONTOS_RECENCIA * 0.5 ** (dias.clip(lower=0) / MEIA_VIDA_RECENCIA_DIAS)).fillna(0).to_numpy()
+
+    return np.round(PONTOS_POR_ORIGEM * (np.maximum(quantidade, 1) - 1) + peso + recencia, 3)
+
+
+# Pesos de origem passados como "ORIGEM=PESO" na linha de comando (completam os padrões)
+def ler_pesos_origem(especificacoes):
+    pesos = dict(PESOS_ORIGEM_PADRAO)
+    for especificacao in especificacoes or []:
+        origem, separador, peso = especificacao.rpartition('=')
+        if not separador or not origem.strip():
+            raise ValueError(f"Peso de origem inválido: {especificacao!r} (use ORIGEM=PESO)")
+        pesos[origem.strip()] = float(peso)
+    return pesos
+
+
+# "seg-sex 09:00-12:00", "sab 9:00-13:00" ou "seg,qua 14:00-18:00" -> [(dia, minuto inicial, minuto final)]
+def _ler_janela(especificacao):
+    encontrado = re.fullmatch(r'\s*([a-z,\-]+)\s+(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*', especificacao.lower())
+    if not encontrado:
+        raise ValueError(f"Janela inválida: {especificacao!r} (use, por exemplo, 'seg-sex 09:00-18:00')")
+    dias_texto, h1, m1, h2, m2 = encontrado.groups()
+    inicio, fim = int(h1) * 60 + int(m1), int(h2) * 60 + int(m2)
+    if not 0 <= inicio < fim <= 24 * 60:
+        raise ValueError(f"Janela inválida: {especificacao!r} (o início precisa ser antes do fim, no mesmo dia)")
+
+    dias = []
+    for parte in dias_texto.split(','):
+        primeiro, _, ultimo = parte.partition('-')
+        if primeiro not in DIAS_SEMANA or (ultimo and ultimo not in DIAS_SEMANA):
+            raise ValueError(f"Dia inválido em {especificacao!r} (use {', '.join(DIAS_SEMANA)})")
+        a, b = DIAS_SEMANA.index(primeiro), DIAS_SEMANA.index(ultimo or primeiro)
+        dias.extend(range(a, b + 1) if a <= b else list(range(a, 7)) + list(range(0, b + 1)))
+    return [(dia, inicio, fim) for dia in dias]
+
+
+class JanelasEnvio:
+    """
+    Horários em que a campanha pode enviar, por dia da semana. Janelas
+    sobrepostas do mesmo dia são unidas.
+    """
+
+    def __init__(self, especificacoes=JANELAS_PADRAO):
+        por_dia = {dia: [] for dia in range(7)}
+        for especificacao in especificacoes:
+            for dia, inicio, fim in _ler_janela(especificacao):
+                por_dia[dia].append([inicio, fim])
+        if not any(por_dia.values()):
+            raise ValueError("Nenhuma janela de envio configurada")
+
+        self.por_dia = {}
+        for dia, janelas in por_dia.items():
+            unidas = []
+            for inicio, fim in sorted(janelas):
+                if unidas and inicio <= unidas[-1][1]:
+                    unidas[-1][1] = max(unidas[-1][1], fim)
+                else:
+                    unidas.append([inicio, fim])
+            self.por_dia[dia] = unidas
+
+    # Intervalos (início, fim) em ordem, do que contém `momento` (ou do próximo) em diante
+    def _intervalos(self, momento):
+        meia_noite = momento.replace(hour=0, minute=0, second=0, microsecond=0)
+        for dias in count():
+            dia = meia_noite + timedelta(days=dias)
+            for inicio, fim in self.por_dia[dia.weekday()]:
+                fim_intervalo = dia + timedelta(minutes=fim)
+                if fim_intervalo > momento:
+                    yield dia + timedelta(minutes=inicio), fim_intervalo
+
+    def aberta(self, momento):
+        inicio, _ = next(self._intervalos(momento))
+        return inicio <= momento
+
+    # Agora, se a janela estiver aberta; senão, a próxima abertura
+    def proxima_abertura(self, momento):
+        inicio, _ = next(self._intervalos(momento))
+        return max(inicio, momento)
+
+    # Quando terminam `segundos` de envio, contando só o tempo dentro das janelas
+    def projetar_termino(self, momento, segundos):
+        restante = timedelta(seconds=max(segundos, 0))
+        for inicio, fim in self._intervalos(momento):
+            inicio = max(inicio, momento)
+            if fim - inicio >= restante:
+                return inicio + restante
+            restante -= fim - inicio
+
+
+# Previsão de término da campanha; sem janelas, é só agora + o tempo restante
+def prever_termino(janelas, segundos, agora=None):
+    agora = agora or datetime.now()
+    if janelas is None:
+        return agora + timedelta(seconds=max(segundos, 0))
+    return janelas.projetar_termino(agora, segundos)
+
+
+# Dorme até `momento` em passos curtos (sobrevive a ajustes de relógio e suspensão da máquina)
+def esperar_ate(momento):
+    while True:
+        falta = (momento - datetime.now()).total_seconds()
+        if falta <= 0:
+            return
+        time.sleep(min(falta, PASSO_ESPERA))
+
+
+class FilaCampanha:
+    """
+    Contatos pendentes da campanha em ordem de prioridade, gravados em JSON
+    a cada mudança. Contatos concluídos (enviados ou sem WhatsApp) saem da
+    fila e ficam registrados, então rodar de novo com o mesmo CSV só
+    acrescenta os leads novos. Falhas comuns ficam na fila para a próxima
+    execução.
+    """
+
+    def __init__(self, caminho=CAMINHO_FILA_PADRAO):
+        self.caminho = caminho
+        self.pendentes = {}
+        self.concluidos = {}
+        self.sequencia = 0
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                dados = json.load(f)
+            self.concluidos = dados.get('concluidos', {})
+            for contato in dados.get('pendentes', []):
+                self._incluir(contato)
+
+    def __len__(self):
+        return len(self.pendentes)
+
+    def _incluir(self, contato):
+        self.pendentes[contato['telefone']] = dict(contato, sequencia=self.sequencia)
+        self.sequencia += 1
+
+    # Acrescenta contatos ainda desconhecidos (nem pendentes nem concluídos); retorna quantos entraram
+    def adicionar(self, contatos):
+        novos = [c for c in contatos if c['telefone'] not in self.pendentes and c['telefone'] not in self.concluidos]
+        for contato in novos:
+            self._incluir(contato)
+        self.salvar()
+        return len(novos)
+
+    # Pendentes do mais para o menos prioritário (empates na ordem em que entraram)
+    def em_ordem(self):
+        return sorted(self.pendentes.values(), key=lambda c: (-c.get('prioridade', 0), c['sequencia']))
+
+    def concluir(self, telefone, estado):
+        self.pendentes.pop(telefone, None)
+        self.concluidos[telefone] = estado
+        self.salvar()
+
+    def salvar(self):
+        dados = {
+            'atualizada_em': datetime.now().isoformat(timespec='seconds'),
+            'pendentes': self.em_ordem(),
+            'concluidos': self.concluidos,
+        }
+        temporario = f'{self.caminho}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
@@ -1,102 +1,181 @@
 import streamlit as st
 import pandas as pd
-import re
+import numpy as np
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
 from io import BytesIO
 
+from base_leads import (
+    CAMINHO_BASE_PADRAO, abrir_base, fonte_ja_importada, importar_fonte, ler_consolidado, ler_registros, versao_base
+)
+from busca_leads import TAMANHOS_PAGINA, IndiceBusca, filtrar_leads, pagina, total_paginas
+from consolidacao import analisar_duplicatas, consolidar_leads
+from fontes import descompactar, ler_fontes, origem_do_arquivo
+from exportacao import PARQUET_DISPONIVEL, escrever_csv_whatsapp, escrever_parquet, escrever_xlsx
+from origens import com_todas_origens
+from similaridade import encontrar_semelhantes
+from supressao import CAMINHO_SUPRESSAO_PADRAO, ListaSupressao, abrir_supressao, versao_supressao
+from tabela_leads import TabelaLeads, memoria_objeto
+
 st.set_page_config(page_title="Sistema de Gestão de Leads", layout="wide", page_icon="📊")
 
-# Função para limpar números de telefone
-def limpar_telefone(telefone):
-    if pd.isna(telefone):
-        return ""
-    telefone_str = str(telefone)
-    # Remove tudo que não é número
-    numeros = re.sub(r'\D', '', telefone_str)
-    return numeros
+# Limites dos caches (entradas mais antigas são descartadas)
+MAX_CACHE_UPLOADS = 16
+MAX_CACHE_CONSOLIDACOES = 8
+MAX_CACHE_EXPORTS = 8
 
-# Função para normalizar nomes (remover espaços extras, converter para minúsculas)
-def normalizar_texto(texto):
-    if pd.isna(texto):
-        return ""
-    return str(texto).strip().lower()
+# Hash do conteúdo de um upload, usado como chave dos caches
+def hash_upload(file):
+    return hashlib.sha256(file.getvalue()).hexdigest()
 
-# Função para ler o CSV com cabeçalho específico
-def ler_inscritos_live(file):
-    # Ler o arquivo pulando as linhas de cabeçalho
-    df = pd.read_csv(file, skiprows=5, encoding='utf-8-sig')
-    
-    # Padronizar colunas
-    df_clean = pd.DataFrame()
-    df_clean['Nome'] = df['Nome'].fillna('') + ' ' + df['Sobrenome'].fillna('')
-    df_clean['Nome'] = df_clean['Nome'].str.strip()
-    df_clean['Email'] = df['E-mail']
-    df_clean['Telefone'] = df['Informe o seu WhatsApp'].apply(limpar_telefone)
-    df_clean['Empresa'] = df['Informe a razão social de sua farmácia']
-    df_clean['CNPJ'] = df['Informe o CNPJ de sua farmácia']
-    df_clean['Origem'] = 'Inscritos na Live'
-    
-    return df_clean
+# Leituras já feitas, na forma compacta, por (hash, origem, streaming); as mais antigas saem primeiro
+# O dicionário é compartilhado entre as sessões, então todo acesso passa pela trava
+@st.cache_resource
+def leituras_cache():
+    return OrderedDict(), threading.Lock()
 
-# Função para ler arquivos Excel
-def ler_excel(file, origem):
-    df = pd.read_excel(file)
-    
-    # Tentar identificar as colunas relevantes
-    df_clean = pd.DataFrame()
-    
-    # Mapear colunas possíveis
-    colunas_nome = [col for col in df.columns if 'nome' in col.lower() or 'razao' in col.lower() or 'empresa' in col.lower()]
-    colunas_telefone = [col for col in df.columns if 'telefone' in col.lower() or 'whats' in col.lower() or 'contato' in col.lower()]
-    colunas_email = [col for col in df.columns if 'email' in col.lower() or 'e-mail' in col.lower()]
-    colunas_cnpj = [col for col in df.columns if 'cnpj' in col.lower()]
-    
-    df_clean['Nome'] = df[colunas_nome[0]] if colunas_nome else ''
-    df_clean['Email'] = df[colunas_email[0]] if colunas_email else ''
-    df_clean['Telefone'] = df[colunas_telefone[0]].apply(limpar_telefone) if colunas_telefone else ''
-    df_clean['Empresa'] = df[colunas_nome[0]] if colunas_nome else ''
-    df_clean['CNPJ'] = df[colunas_cnpj[0]] if colunas_cnpj else ''
-    df_clean['Origem'] = origem
-    
-    return df_clean
+# Lê em paralelo só os uploads que ainda não estão no cache
+# Recebe [(chave, origem, file)] e retorna {chave: (compacta, estatisticas_streaming)}
+def ler_uploads(pendentes, streaming):
+    leituras, trava = leituras_cache()
+    resultado = {}
+    with trava:
+        for chave, _, _ in pendentes:
+            if chave in leituras:
+                leituras.move_to_end(chave)
+                resultado[chave] = leituras[chave]
+    
+    # A leitura em si fica fora da trava, para não segurar as outras sessões
+    faltando = [(chave, origem, file) for chave, origem, file in pendentes if chave not in resultado]
+    lidas = ler_fontes([(origem, file.getvalue(), file.name) for _, origem, file in faltando], streaming=streaming)
+    
+    with trava:
+        for (chave, _, _), lida in zip(faltando, lidas):
+            leituras[chave] = lida
+            resultado[chave] = lida
+        while len(leituras) > MAX_CACHE_UPLOADS:
+            leituras.popitem(last=False)
+    return resultado
 
-# Função para consolidar leads
-def consolidar_leads(dfs_dict):
-    # Concatenar todos os DataFrames
-    df_todos = pd.concat(dfs_dict.values(), ignore_index=True)
-    
-    # Remover linhas completamente vazias
-    df_todos = df_todos[df_todos['Telefone'].str.len() > 0]
-    
-    # Criar colunas normalizadas para comparação
-    df_todos['telefone_norm'] = df_todos['Telefone'].apply(normalizar_texto)
-    df_todos['email_norm'] = df_todos['Email'].apply(normalizar_texto)
-    df_todos['nome_norm'] = df_todos['Nome'].apply(normalizar_texto)
-    
-    # Identificar duplicatas por telefone
+# Consolidação memoizada pela combinação de (origem, hash) dos uploads
+@st.cache_data(max_entries=MAX_CACHE_CONSOLIDACOES, show_spinner=False)
+def consolidar_leads_cache(chave_dados, _dfs_dict):
+    return consolidar_leads(_dfs_dict)
+
+# Conexão única com a base persistente, compartilhada entre as sessões
+# A trava serializa o uso da conexão: a importação recria as tabelas temporárias da conexão
+# e uma leitura no meio dela veria dados ainda não confirmados
+@st.cache_resource
+def abrir_base_cache():
+    return abrir_base(CAMINHO_BASE_PADRAO), threading.Lock()
+
+# Lê a consolidação da base no mesmo formato devolvido por consolidar_leads
+def ler_base_consolidada(conn):
+    df_todos = ler_registros(conn)
+    df_todos['telefone_norm'] = df_todos['Telefone']
     df_todos['duplicata_telefone'] = df_todos.duplicated(subset=['telefone_norm'], keep=False)
-    
-    # Identificar duplicatas por email
-    df_todos['duplicata_email'] = df_todos.duplicated(subset=['email_norm'], keep=False)
-    
-    # Criar lista única (remover duplicatas mantendo o primeiro registro)
-    df_unico = df_todos.drop_duplicates(subset=['telefone_norm'], keep='first')
-    
-    # Agrupar origens para leads duplicados
-    origens_por_telefone = df_todos.groupby('telefone_norm')['Origem'].apply(lambda x: ', '.join(sorted(set(x)))).to_dict()
-    df_unico['Todas_Origens'] = df_unico['telefone_norm'].map(origens_por_telefone)
-    
-    # Remover colunas auxiliares
-    df_unico = df_unico.drop(columns=['telefone_norm', 'email_norm', 'nome_norm', 'duplicata_telefone', 'duplicata_email'])
-    
-    return df_todos, df_unico
+    df_todos['duplicata_lead'] = df_todos.duplicated(subset=['lead_id'], keep=False)
+    return df_todos, ler_consolidado(conn)
+
+# Tabela compacta da consolidação, uma só para todas as sessões (cache_resource: sem cópia por sessão)
+@st.cache_resource(max_entries=MAX_CACHE_CONSOLIDACOES, show_spinner=False)
+def tabela_leads_cache(chave_dados, _df_todos, _df_unico, _posicoes_unicos):
+    return TabelaLeads(_df_todos, _df_unico, _posicoes_unicos)
 
-# Função para converter DataFrame para Excel
-def to_excel(df):
+# Conexão única com a lista de supressão, compartilhada entre as sessões
+@st.cache_resource
+def abrir_supressao_cache():
+    return abrir_supressao(CAMINHO_SUPRESSAO_PADRAO)
+
+# Lista de supressão em memória, recarregada só quando a base muda
+@st.cache_resource(max_entries=2, show_spinner=False)
+def lista_supressao_cache(versao):
+    return ListaSupressao(abrir_supressao_cache())
+
+# Pares de leads com nome/empresa parecidos, calculados uma vez por consolidação
+@st.cache_data(max_entries=MAX_CACHE_CONSOLIDACOES, show_spinner=False)
+def encontrar_semelhantes_cache(chave_dados, _tabela):
+    return encontrar_semelhantes(_tabela.unicos.df())
+
+# Análise de duplicatas calculada uma vez por consolidação (cache_resource: as sessões só guardam a chave)
+@st.cache_resource(max_entries=MAX_CACHE_CONSOLIDACOES, show_spinner=False)
+def analisar_duplicatas_cache(chave_dados, _tabela):
+    return analisar_duplicatas(_tabela.todos.df(), _tabela.unicos.df())
+
+# Índice de busca da lista única, montado uma vez por consolidação (cache_resource: sem cópia a cada uso)
+@st.cache_resource(max_entries=MAX_CACHE_CONSOLIDACOES, show_spinner="Montando índice de busca...")
+def indice_busca_cache(chave_dados, _tabela):
+    return IndiceBusca(_tabela.unicos.df())
+
+# Exports gerados sob demanda e mantidos em cache até a consolidação mudar
+# Os DataFrames só são montados a partir da tabela compacta na hora de escrever
+# `_posicoes` restringe o CSV para WhatsApp a alguns leads da lista única (ex.: fora da supressão)
+@st.cache_data(max_entries=MAX_CACHE_EXPORTS, show_spinner=False)
+def gerar_export_cache(chave_dados, tipo, _tabela, _posicoes=None):
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Leads')
+    if tipo == 'csv_whatsapp':
+        unicos = _tabela.unicos
+        escrever_csv_whatsapp(output, unicos.df() if _posicoes is None else unicos.linhas(_posicoes))
+    elif tipo == 'parquet_unico':
+        escrever_parquet(output, _tabela.unicos.df())
+    elif tipo == 'xlsx_todos':
+        escrever_xlsx(output, {'Leads': _tabela.todos.df()})
+    elif tipo == 'xlsx_completo':
+        df_unico = _tabela.unicos.df()
+        escrever_xlsx(output, {
+            'Leads Únicos': df_unico,
+            'Todos os Leads': _tabela.todos.df(),
+            'Leads Engajados': df_unico[df_unico['Qtd_Origens'] > 1],
+        })
+    else:
+        escrever_xlsx(output, {'Leads': _tabela.unicos.df()})
     return output.getvalue()
 
+# Botão "preparar" + download: o arquivo só é montado quando alguém pede
+def botao_export_sob_demanda(chave_dados, tipo, tabela, rotulo, file_name, mime, posicoes=None):
+    chave_pedido = f'export_{tipo}'
+    if st.session_state.get(chave_pedido) != chave_dados:
+        if not st.button(f"📦 Preparar {rotulo}", key=f'preparar_{tipo}', use_container_width=True):
+            return
+        st.session_state[chave_pedido] = chave_dados
+
+    with st.spinner(f"Gerando {rotulo}..."):
+        dados = gerar_export_cache(chave_dados, tipo, tabela, posicoes)
+    st.download_button(
+        label=f"⬇️ Baixar {rotulo}",
+        data=dados,
+        file_name=file_name,
+        mime=mime,
+        use_container_width=True
+    )
+
+# Tabela paginada: só as linhas da página visível vão para o navegador (df pode ser uma visão da TabelaLeads)
+# `filtros` identifica a busca/filtro atual; quando muda, a tabela volta para a primeira página
+def tabela_paginada(df, chave, posicoes=None, filtros=None, height=400):
+    posicoes = np.arange(len(df)) if posicoes is None else posicoes
+    
+    col_tamanho, col_pagina, col_info = st.columns([1, 1, 2])
+    with col_tamanho:
+        tamanho = st.selectbox("Linhas por página", TAMANHOS_PAGINA, key=f'{chave}_tamanho')
+    
+    paginas = total_paginas(len(posicoes), tamanho)
+    chave_pagina = f'{chave}_pagina'
+    if st.session_state.get(f'{chave}_filtros') != filtros:
+        st.session_state[f'{chave}_filtros'] = filtros
+        st.session_state[chave_pagina] = 1
+    st.session_state[chave_pagina] = min(st.session_state.get(chave_pagina, 1), paginas)
+    
+    with col_pagina:
+        numero = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, step=1, key=chave_pagina)
+    with col_info:
+        inicio = (numero - 1) * tamanho
+        fim = min(inicio + tamanho, len(posicoes))
+        st.caption(f"Mostrando {inicio + 1 if fim else 0}–{fim} de {len(posicoes)} registros")
+    
+    st.dataframe(pagina(df, posicoes, numero, tamanho), use_container_width=True, height=height)
+
 # Interface principal
 st.title("📊 Sistema de Gestão de Leads E-commerce")
 st.markdown("---")
@@ -105,60 +184,134 @@ st.markdown("---")
 with st.sidebar:
     st.header("📁 Upload de Arquivos")
     
-    inscritos_file = st.file_uploader("Inscritos na Live (CSV)", type=['csv'], key='inscritos')
-    interessadas_file = st.file_uploader("Lojas Interessadas (XLSX)", type=['xlsx'], key='interessadas')
-    potencial_file = st.file_uploader("Lojas com Potencial (XLSX)", type=['xlsx'], key='potencial')
+    arquivos = st.file_uploader(
+        "Fontes de leads (CSV da Live ou XLSX)", type=['csv', 'xlsx'], accept_multiple_files=True, key='fontes',
+        help="Envie quantos arquivos quiser; eles são lidos em paralelo."
+    )
+    
+    # Origem de cada arquivo, sugerida pelo nome e editável (pela posição: dois uploads podem ter o mesmo nome)
+    origens_arquivos = []
+    for indice, file in enumerate(arquivos or []):
+        origens_arquivos.append(st.text_input(
+            f"Origem de {file.name}", value=origem_do_arquivo(file.name), key=f'origem_{indice}_{file.name}'
+        ))
+    
+    streaming = st.checkbox(
+        "Modo streaming para a Live (arquivos grandes)",
+        help="Lê o CSV em blocos e já descarta telefones repetidos, usando memória proporcional aos leads únicos."
+    )
+    usar_base = st.checkbox(
+        f"Usar base persistente ({CAMINHO_BASE_PADRAO})",
+        help="Mescla os uploads na base de leads por telefone e mostra a consolidação acumulada entre campanhas."
+    )
     
     processar = st.button("🚀 Processar Dados", type="primary", use_container_width=True)
 
 # Processar dados quando o botão for clicado
 if processar:
     dfs = {}
+    hashes = []
+    estatisticas_streaming = {}
+    fontes_na_base = []
     
     with st.spinner("Processando dados..."):
-        # Ler arquivos
-        if inscritos_file:
-            dfs['Inscritos na Live'] = ler_inscritos_live(inscritos_file)
+        conn, trava_base = abrir_base_cache() if usar_base else (None, nullcontext())
         
-        if interessadas_file:
-            dfs['Lojas Interessadas'] = ler_excel(interessadas_file, 'Lojas Interessadas')
+        # Arquivos a ler (com a base, arquivos já importados nem são lidos de novo)
+        pendentes = []
+        for file, origem_digitada in zip(arquivos or [], origens_arquivos):
+            origem = origem_digitada.strip() or origem_do_arquivo(file.name)
+            hash_conteudo = hash_upload(file)
+            hashes.append((origem, hash_conteudo))
+            
+            if conn is not None:
+                with trava_base:
+                    ja_importada = fonte_ja_importada(conn, hash_conteudo)
+                if ja_importada:
+                    fontes_na_base.append(origem)
+                    continue
+            pendentes.append(((hash_conteudo, origem, streaming), origem, file))
         
-        if potencial_file:
-            dfs['Lojas com Potencial'] = ler_excel(potencial_file, 'Lojas com Potencial')
+        # Todos os arquivos são lidos ao mesmo tempo (reaproveitando o cache quando o conteúdo já foi processado)
+        lidas = ler_uploads(pendentes, streaming)
+        for chave, origem, file in pendentes:
+            compacta, estatisticas = lidas[chave]
+            df = descompactar(compacta)
+            if estatisticas:
+                estatisticas_streaming[file.name] = estatisticas
+            
+            if conn is not None:
+                with trava_base:
+                    importar_fonte(conn, df, origem, chave[0], file.name)
+            
+            # Arquivos diferentes com a mesma origem viram uma fonte só
+            dfs[origem] = pd.concat([dfs[origem], df], ignore_index=True) if origem in dfs else df
         
-        if not dfs:
+        if not dfs and conn is None:
             st.error("Por favor, faça upload de pelo menos um arquivo!")
             st.stop()
         
-        # Consolidar leads
-        df_todos, df_unico = consolidar_leads(dfs)
+        # Consolidar leads (ou ler a consolidação direto da base)
+        if conn is not None:
+            with trava_base:
+                chave_dados = ('base',) + versao_base(conn)
+                df_todos, df_unico = ler_base_consolidada(conn)
+            posicoes_unicos = None
+        else:
+            chave_dados = tuple(sorted(hashes)) + (('streaming', streaming),)
+            df_todos, df_unico = consolidar_leads_cache(chave_dados, _dfs_dict=dfs)
+            # Cada lead único é um dos registros: a lista única vira só posições na tabela
+            posicoes_unicos = df_todos.index.get_indexer(df_unico.index)
+        
+        tabela = tabela_leads_cache(chave_dados, df_todos, df_unico, posicoes_unicos)
+        analisar_duplicatas_cache(chave_dados, tabela)
         
-        # Salvar no session_state
-        st.session_state['dfs'] = dfs
-        st.session_state['df_todos'] = df_todos
-        st.session_state['df_unico'] = df_unico
+        # Salvar no session_state (só a referência à tabela compartilhada, nada de cópias dos DataFrames)
+        st.session_state['chave_dados'] = chave_dados
+        st.session_state['tabela'] = tabela
+        st.session_state['estatisticas_streaming'] = estatisticas_streaming
+        st.session_state['fontes_na_base'] = fontes_na_base
 
 # Mostrar resultados se já processados
-if 'df_unico' in st.session_state:
-    dfs = st.session_state['dfs']
-    df_todos = st.session_state['df_todos']
-    df_unico = st.session_state['df_unico']
+if 'tabela' in st.session_state:
+    tabela = st.session_state['tabela']
+    todos, unicos = tabela.todos, tabela.unicos
+    chave_dados = st.session_state['chave_dados']
+    
+    for nome_arquivo, estatisticas in st.session_state['estatisticas_streaming'].items():
+        st.caption(
+            f"🌊 {nome_arquivo} (streaming): {estatisticas['linhas_lidas']} linhas lidas, "
+            f"{estatisticas['duplicatas_descartadas']} telefones repetidos e "
+            f"{estatisticas['sem_telefone']} sem telefone descartados na leitura"
+        )
+    
+    if st.session_state['fontes_na_base']:
+        st.caption(f"💾 Já estavam na base (não foram reprocessados): {', '.join(st.session_state['fontes_na_base'])}")
+    
+    # Quanto cada item da sessão ocupa; a tabela é compartilhada entre as sessões e aparece à parte
+    with st.sidebar.expander("🧠 Memória da sessão"):
+        tamanhos = pd.Series(
+            {chave: memoria_objeto(valor) for chave, valor in st.session_state.items() if chave != 'tabela'}, dtype='int64'
+        ).sort_values(ascending=False)
+        st.dataframe((tamanhos / 2**20).round(2).rename('MB'), use_container_width=True)
+        st.caption(f"Total da sessão: {tamanhos.sum() / 2**20:.1f} MB")
+        st.caption(f"Tabela de leads (compartilhada): {tabela.memoria() / 2**20:.1f} MB")
     
     # Métricas gerais
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📋 Total de Registros", len(df_todos))
+        st.metric("📋 Total de Registros", len(todos))
     
     with col2:
-        st.metric("✅ Leads Únicos", len(df_unico))
+        st.metric("✅ Leads Únicos", len(unicos))
     
     with col3:
-        duplicatas = len(df_todos) - len(df_unico)
+        duplicatas = len(todos) - len(unicos)
         st.metric("🔄 Duplicatas Removidas", duplicatas)
     
     with col4:
-        taxa_dedup = (duplicatas / len(df_todos) * 100) if len(df_todos) > 0 else 0
+        taxa_dedup = (duplicatas / len(todos) * 100) if len(todos) > 0 else 0
         st.metric("📊 Taxa de Duplicação", f"{taxa_dedup:.1f}%")
     
     st.markdown("---")
@@ -169,33 +322,20 @@ if 'df_unico' in st.session_state:
     with tab1:
         st.subheader("Visualização dos Dados por Origem")
         
-        for nome, df in dfs.items():
-            with st.expander(f"📂 {nome} ({len(df)} registros)", expanded=False):
-                st.dataframe(df, use_container_width=True, height=300)
+        for nome in tabela.origens:
+            posicoes_origem = tabela.posicoes_origem(nome)
+            with st.expander(f"📂 {nome} ({len(posicoes_origem)} registros)", expanded=False):
+                tabela_paginada(todos, f'origem_{nome}', posicoes_origem, filtros=chave_dados, height=300)
     
     with tab2:
         st.subheader("🔍 Análise de Duplicatas")
         
-        # Análise de duplicatas
-        duplicatas_por_origem = df_todos[df_todos['duplicata_telefone']].copy()
+        # Análise de duplicatas (registros do mesmo lead: telefone, e-mail ou CNPJ em comum), já calculada no processamento
+        analise = analisar_duplicatas_cache(chave_dados, tabela)
         
-        if len(duplicatas_por_origem) > 0:
-            st.write(f"**{len(duplicatas_por_origem)} registros duplicados encontrados**")
-            
-            # Agrupar por telefone
-            duplicatas_agrupadas = duplicatas_por_origem.groupby('telefone_norm').agg({
-                'Nome': lambda x: ' / '.join(x.unique()),
-                'Email': lambda x: ' / '.join(x.unique()),
-                'Telefone': 'first',
-                'Origem': lambda x: list(x)
-            }).reset_index()
-            
-            duplicatas_agrupadas['Qtd_Origens'] = duplicatas_agrupadas['Origem'].apply(len)
-            duplicatas_agrupadas['Origens'] = duplicatas_agrupadas['Origem'].apply(lambda x: ', '.join(x))
-            duplicatas_agrupadas = duplicatas_agrupadas.drop(columns=['Origem', 'telefone_norm'])
-            
-            # Filtrar apenas quem aparece em múltiplas origens
-            duplicatas_multiplas = duplicatas_agrupadas[duplicatas_agrupadas['Qtd_Origens'] > 1]
+        if analise['registros_duplicados'] > 0:
+            st.write(f"**{analise['registros_duplicados']} registros duplicados encontrados**")
+            duplicatas_multiplas = analise['clusters']
             
             col1, col2 = st.columns(2)
             
@@ -204,45 +344,74 @@ if 'df_unico' in st.session_state:
             
             with col2:
                 if len(duplicatas_multiplas) > 0:
-                    max_origens = duplicatas_multiplas['Qtd_Origens'].max()
-                    st.metric("Máximo de Origens por Lead", int(max_origens))
+                    st.metric("Máximo de Origens por Lead", analise['max_origens'])
             
             if len(duplicatas_multiplas) > 0:
                 st.write("**Leads que aparecem em múltiplas origens:**")
-                st.dataframe(
-                    duplicatas_multiplas.sort_values('Qtd_Origens', ascending=False),
-                    use_container_width=True,
-                    height=400
-                )
+                tabela_paginada(duplicatas_multiplas, 'duplicatas_multiplas', filtros=chave_dados)
         else:
             st.success("✅ Nenhuma duplicata encontrada!")
+        
+        if len(analise['sobreposicao']) > 1:
+            st.write("**Sobreposição entre origens (leads em comum):**")
+            st.dataframe(analise['sobreposicao'], use_container_width=True)
+        
+        # Leads diferentes que podem ser a mesma pessoa/farmácia escrita de outro jeito
+        st.markdown("---")
+        if st.checkbox("🔎 Procurar nomes/empresas parecidos", help="Compara só leads do mesmo CNPJ raiz ou do mesmo DDD com início de nome/empresa igual."):
+            with st.spinner("Procurando leads parecidos..."):
+                semelhantes = encontrar_semelhantes_cache(chave_dados, tabela)
+            
+            if len(semelhantes) > 0:
+                st.write(f"**{len(semelhantes)} pares suspeitos para revisão:**")
+                tabela_paginada(semelhantes, 'semelhantes', filtros=chave_dados)
+            else:
+                st.success("✅ Nenhum par suspeito encontrado!")
     
     with tab3:
         st.subheader("✨ Lista Consolidada de Leads (Sem Duplicatas)")
         
-        st.info(f"📌 Total de {len(df_unico)} leads únicos prontos para campanha!")
+        st.info(f"📌 Total de {len(unicos)} leads únicos prontos para campanha!")
         
         # Mostrar distribuição por origem
         col1, col2 = st.columns([1, 2])
         
         with col1:
             st.write("**Distribuição por Origem Principal:**")
-            distribuicao = df_unico['Origem'].value_counts()
+            distribuicao = unicos['Origem'].value_counts()
             st.dataframe(distribuicao, use_container_width=True)
         
         with col2:
             st.write("**Leads em Múltiplas Origens:**")
-            multiplas = df_unico[df_unico['Todas_Origens'].str.contains(',', na=False)]
+            multiplas = np.flatnonzero(unicos['Qtd_Origens'].to_numpy() > 1)
             st.metric("Total", len(multiplas))
             if len(multiplas) > 0:
                 st.dataframe(
-                    multiplas[['Nome', 'Telefone', 'Email', 'Todas_Origens']].head(10),
+                    com_todas_origens(unicos.linhas(multiplas[:10]))[['Nome', 'Telefone', 'Email', 'Todas_Origens']],
                     use_container_width=True
                 )
         
         st.markdown("---")
         st.write("**Lista Completa de Leads Únicos:**")
-        st.dataframe(df_unico, use_container_width=True, height=500)
+        
+        # Busca e filtros rodam no servidor; o índice só é montado na primeira busca
+        col_busca, col_origens, col_multiplas = st.columns([2, 2, 1])
+        with col_busca:
+            consulta = st.text_input("🔍 Buscar por nome, empresa, telefone, e-mail ou CNPJ", key='busca_leads')
+        with col_origens:
+            presentes = int(np.bitwise_or.reduce(unicos['Mascara_Origens'].to_numpy())) if len(unicos) else 0
+            origens_filtro = st.multiselect(
+                "Origens", [origem for bit, origem in enumerate(unicos.attrs['origens']) if (presentes >> bit) & 1], key='filtro_origens'
+            )
+        with col_multiplas:
+            so_multiplas = st.checkbox("Só em múltiplas origens", key='filtro_multiplas')
+        
+        indice = indice_busca_cache(chave_dados, tabela) if consulta.strip() else None
+        posicoes = filtrar_leads(unicos, indice, consulta, origens_filtro, so_multiplas)
+        tabela_paginada(
+            unicos, 'lista_unica', posicoes,
+            filtros=(chave_dados, consulta, tuple(origens_filtro), so_multiplas), height=500
+        )
     
     with tab4:
         st.subheader("📥 Downloads")
@@ -251,39 +420,56 @@ if 'df_unico' in st.session_state:
         
         with col1:
             st.write("**Lista Consolidada (Sem Duplicatas)**")
-            st.write(f"Total: {len(df_unico)} leads")
+            st.write(f"Total: {len(unicos)} leads")
             
-            excel_unico = to_excel(df_unico)
-            st.download_button(
-                label="⬇️ Baixar Lista Consolidada (XLSX)",
-                data=excel_unico,
-                file_name="leads_consolidados_sem_duplicatas.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
+            botao_export_sob_demanda(
+                chave_dados, 'xlsx_unico', tabela,
+                "Lista Consolidada (XLSX)",
+                "leads_consolidados_sem_duplicatas.xlsx",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
             
-            # CSV simplificado para WhatsApp
-            df_whatsapp = df_unico[['Nome', 'Telefone', 'Email', 'Todas_Origens']].copy()
-            csv_whatsapp = df_whatsapp.to_csv(index=False).encode('utf-8-sig')
-            st.download_button(
-                label="⬇️ Baixar para WhatsApp (CSV)",
-                data=csv_whatsapp,
-                file_name="leads_whatsapp.csv",
-                mime="text/csv",
-                use_container_width=True
+            # CSV simplificado para WhatsApp, sem a lista de supressão (uma busca sobre as chaves int64 da tabela)
+            versao = versao_supressao(abrir_supressao_cache())
+            suprimidos = lista_supressao_cache(versao).suprimidos_chaves(tabela.telefones[unicos.posicoes])
+            if suprimidos.any():
+                st.caption(f"🚫 {suprimidos.sum()} leads da lista de supressão ficam fora do CSV para WhatsApp")
+            botao_export_sob_demanda(
+                chave_dados + (('supressao',) + tuple(versao),), 'csv_whatsapp', tabela,
+                "para WhatsApp (CSV)",
+                "leads_whatsapp.csv",
+                "text/csv",
+                posicoes=np.flatnonzero(~suprimidos)
             )
         
         with col2:
             st.write("**Lista Completa (Com Duplicatas)**")
-            st.write(f"Total: {len(df_todos)} registros")
+            st.write(f"Total: {len(todos)} registros")
             
-            excel_todos = to_excel(df_todos)
-            st.download_button(
-                label="⬇️ Baixar Lista Completa (XLSX)",
-                data=excel_todos,
-                file_name="leads_completos_com_duplicatas.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
+            botao_export_sob_demanda(
+                chave_dados, 'xlsx_todos', tabela,
+                "Lista Completa (XLSX)",
+                "leads_completos_com_duplicatas.xlsx",
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+        
+        st.markdown("---")
+        st.write("**Tudo em um arquivo / outros formatos**")
+        
+        # Planilha única com uma aba por lista
+        botao_export_sob_demanda(
+            chave_dados, 'xlsx_completo', tabela,
+            "Planilha Única (XLSX, 3 abas)",
+            "leads_consolidacao.xlsx",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        
+        if PARQUET_DISPONIVEL:
+            botao_export_sob_demanda(
+                chave_dados, 'parquet_unico', tabela,
+                "Lista Consolidada (Parquet)",
+                "leads_consolidados_sem_duplicatas.parquet",
+                "application/octet-stream"
             )
 
 else:
@@ -293,7 +479,7 @@ else:
     st.markdown("""
     ### 📋 Como usar este sistema:
     
-    1. **Upload dos Arquivos**: Use a barra lateral para fazer upload de:
+    1. **Upload dos Arquivos**: Use a barra lateral para enviar quantas fontes quiser, por exemplo:
        - Inscritos na Live (arquivo CSV)
        - Lojas Interessadas (arquivo XLSX)
        - Lojas com Potencial (arquivo XLSX)
@@ -0,0 +1,314 @@
+"""
+🗄️ Base persistente de leads (SQLite)
+
+Guarda a lista consolidada entre campanhas: um registro por telefone
+canônico (índice único), com índices secundários em e-mail e CNPJ e o
+lead_id da resolução de identidade (identidade.py), calculado sobre as
+chaves (telefone, e-mail, CNPJ) de todos os registros importados, guardadas
+em lead_chaves. Cada arquivo de origem é importado uma única vez (pelo
+hash do conteúdo) e mesclado por upsert, então só o delta de cada fonte
+nova é processado.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from identidade import normalizar_cnpjs, normalizar_emails, resolver_identidades
+from origens import adicionar_origens
+
+CAMINHO_BASE_PADRAO = 'leads.db'
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    telefone TEXT PRIMARY KEY,
+    nome TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    empresa TEXT NOT NULL DEFAULT '',
+    cnpj TEXT NOT NULL DEFAULT '',
+    email_norm TEXT NOT NULL DEFAULT '',
+    cnpj_norm TEXT NOT NULL DEFAULT '',
+    origem TEXT NOT NULL,
+    todas_origens TEXT NOT NULL DEFAULT '',
+    lead_id INTEGER,
+    criado_em TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leads_email ON leads(email_norm) WHERE email_norm != '';
+CREATE INDEX IF NOT EXISTS idx_leads_cnpj ON leads(cnpj_norm) WHERE cnpj_norm != '';
+
+-- Primeiro registro de cada telefone em cada origem (base da análise de duplicatas)
+CREATE TABLE IF NOT EXISTS lead_origens (
+    telefone TEXT NOT NULL,
+    origem TEXT NOT NULL,
+    nome TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    empresa TEXT NOT NULL DEFAULT '',
+    cnpj TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (telefone, origem)
+);
+
+-- Chaves de identidade de todos os registros importados (sem repetição), base da resolução de identidade
+CREATE TABLE IF NOT EXISTS lead_chaves (
+    telefone TEXT NOT NULL,
+    email_norm TEXT NOT NULL DEFAULT '',
+    cnpj_norm TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (telefone, email_norm, cnpj_norm)
+);
+CREATE INDEX IF NOT EXISTS idx_chaves_email ON lead_chaves(email_norm) WHERE email_norm != '';
+CREATE INDEX IF NOT EXISTS idx_chaves_cnpj ON lead_chaves(cnpj_norm) WHERE cnpj_norm != '';
+
+CREATE TABLE IF NOT EXISTS fontes_importadas (
+    hash TEXT PRIMARY KEY,
+    origem TEXT NOT NULL,
+    arquivo TEXT NOT NULL DEFAULT '',
+    linhas INTEGER NOT NULL,
+    importado_em TEXT NOT NULL
+);
+"""
+
+COLUNAS_DELTA = ['telefone', 'nome', 'email', 'empresa', 'cnpj', 'email_norm', 'cnpj_norm', 'origem']
+
+# Versão 1: cnpj_norm guarda o CNPJ como na resolução de identidade (inteiro sem zeros à esquerda)
+# Versão 2: lead_chaves guarda as chaves de todos os registros, não só as do registro mantido em leads
+VERSAO_ESQUEMA = 2
+
+
+# Abre (e cria, se preciso) a base de leads
+def abrir_base(caminho=CAMINHO_BASE_PADRAO):
+    conn = sqlite3.connect(caminho, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(ESQUEMA)
+
+    # Bases criadas antes da resolução de identidade não têm lead_id
+    colunas = [linha[1] for linha in conn.execute("PRAGMA table_info(leads)")]
+    if 'lead_id' not in colunas:
+        conn.execute("ALTER TABLE leads ADD COLUMN lead_id INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_lead_id ON leads(lead_id)")
+
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    if versao < VERSAO_ESQUEMA:
+        with conn:
+            if versao < 1:
+                cnpjs = pd.read_sql_query("SELECT telefone, cnpj FROM leads", conn)
+                conn.executemany(
+                    "UPDATE leads SET cnpj_norm = ? WHERE telefone = ?",
+                    zip(_normalizar_cnpjs(cnpjs['cnpj']), cnpjs['telefone']),
+                )
+            if versao < 2:
+                # Os registros de bases antigas só sobrevivem em lead_origens (um por telefone e origem) e em leads
+                registros = pd.read_sql_query(
+                    "SELECT telefone, email, cnpj FROM lead_origens UNION ALL SELECT telefone, email, cnpj FROM leads",
+                    conn,
+                )
+                _gravar_chaves(conn, registros['telefone'], registros['email'], registros['cnpj'])
+            conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+            _atualizar_identidades(conn)
+    return conn
+
+
+# CNPJ como texto do inteiro usado na resolução de identidade ('' quando inválido)
+def _normalizar_cnpjs(serie):
+    return [str(cnpj) if cnpj else '' for cnpj in normalizar_cnpjs(serie).tolist()]
+
+
+# Grava as chaves de identidade (telefone, e-mail, CNPJ normalizados) de cada registro, sem repetir
+def _gravar_chaves(conn, telefones, emails, cnpjs):
+    chaves = pd.DataFrame({
+        'telefone': telefones.fillna('').astype(str).to_numpy(),
+        'email_norm': normalizar_emails(emails).to_numpy(),
+        'cnpj_norm': _normalizar_cnpjs(cnpjs),
+    })
+    chaves = chaves[chaves['telefone'].str.len() > 0].drop_duplicates()
+    conn.executemany("INSERT OR IGNORE INTO lead_chaves VALUES (?, ?, ?)", chaves.itertuples(index=False, name=None))
+
+
+# Telefones dos componentes que podem mudar com um delta: os do delta, os que dividem
+# telefone, e-mail ou CNPJ com eles e os leads inteiros a que pertencem, até fechar
+def _telefones_afetados(conn):
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS afetados (telefone TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM afetados")
+    conn.execute("INSERT OR IGNORE INTO afetados SELECT telefone FROM delta")
+    while True:
+        antes = conn.total_changes
+        conn.execute("""
+            INSERT OR IGNORE INTO afetados
+            SELECT telefone FROM lead_chaves WHERE email_norm != '' AND email_norm IN (
+                SELECT c.email_norm FROM lead_chaves c JOIN afetados a ON a.telefone = c.telefone WHERE c.email_norm != '')
+            UNION
+            SELECT telefone FROM lead_chaves WHERE cnpj_norm != '' AND cnpj_norm IN (
+                SELECT c.cnpj_norm FROM lead_chaves c JOIN afetados a ON a.telefone = c.telefone WHERE c.cnpj_norm != '')
+            UNION
+            SELECT telefone FROM leads WHERE lead_id IN (
+                SELECT l.lead_id FROM leads l JOIN afetados a ON a.telefone = l.telefone WHERE l.lead_id IS NOT NULL)
+        """)
+        if conn.total_changes == antes:
+            return
+
+
+# Recalcula o lead_id e grava só o que mudou (dentro da transação de quem chama)
+def _atualizar_identidades(conn, so_afetados=False):
+    """
+    A resolução usa as chaves de todos os registros importados (lead_chaves),
+    então dá o mesmo resultado que consolidar as fontes em memória. Sem
+    `so_afetados`, resolve a base inteira. Com ele, resolve só os
+    componentes que tocam o delta (tabela temporária `delta`): esse conjunto
+    não divide nenhuma chave com o resto da base, então o resultado é o
+    mesmo da resolução completa.
+    """
+    filtro = "WHERE telefone IN (SELECT telefone FROM afetados)" if so_afetados else ""
+    if so_afetados:
+        _telefones_afetados(conn)
+    chaves = pd.read_sql_query(f"SELECT telefone, email_norm, cnpj_norm FROM lead_chaves {filtro}", conn)
+    chaves['novo_lead_id'] = resolver_identidades(chaves['telefone'], chaves['email_norm'], chaves['cnpj_norm'])
+
+    # Registros do mesmo telefone caem sempre no mesmo lead
+    leads = pd.read_sql_query(f"SELECT telefone, lead_id FROM leads {filtro}", conn)
+    leads['novo_lead_id'] = leads['telefone'].map(chaves.drop_duplicates('telefone').set_index('telefone')['novo_lead_id'])
+
+    mudou = leads[leads['lead_id'].isna() | (leads['lead_id'] != leads['novo_lead_id'])]
+    conn.executemany(
+        "UPDATE leads SET lead_id = ? WHERE telefone = ?",
+        zip(mudou['novo_lead_id'].astype(int).tolist(), mudou['telefone']),
+    )
+
+
+# Hash do conteúdo de um arquivo (caminho ou bytes), usado para não importar a mesma fonte duas vezes
+def hash_arquivo(arquivo):
+    if isinstance(arquivo, bytes):
+        return hashlib.sha256(arquivo).hexdigest()
+
+    sha = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def fonte_ja_importada(conn, hash_conteudo):
+    return conn.execute("SELECT 1 FROM fontes_importadas WHERE hash = ?", (hash_conteudo,)).fetchone() is not None
+
+
+# Monta as linhas do delta já normalizadas (uma por telefone, mantendo a primeira)
+def _preparar_delta(df, origem):
+    df = df[df['Telefone'].str.len() > 0].drop_duplicates(subset=['Telefone'], keep='first')
+
+    delta = pd.DataFrame({
+        'telefone': df['Telefone'],
+        'nome': df['Nome'],
+        'email': df['Email'],
+        'empresa': df['Empresa'],
+        'cnpj': df['CNPJ'],
+    }).fillna('').astype(str)
+    delta['email_norm'] = delta['email'].str.strip().str.lower()
+    delta['cnpj_norm'] = _normalizar_cnpjs(delta['cnpj'])
+    delta['origem'] = origem
+    return delta[COLUNAS_DELTA]
+
+
+# Função para mesclar uma fonte na base por upsert
+def importar_fonte(conn, df, origem, hash_conteudo, arquivo=''):
+    """
+    Mescla os leads de uma fonte na base. Telefones novos são inseridos;
+    telefones existentes só ganham os campos que ainda estavam vazios e a
+    nova origem em Todas_Origens. Retorna um dicionário com as contagens.
+
+    Usa tabelas temporárias da conexão (delta, afetados): com a conexão
+    compartilhada entre threads, chame sob uma trava, sem outras consultas
+    na mesma conexão durante a importação.
+    """
+    if fonte_ja_importada(conn, hash_conteudo):
+        return {'ignorada': True, 'novos': 0, 'atualizados': 0}
+
+    delta = _preparar_delta(df, origem)
+    agora = datetime.now().isoformat(timespec='seconds')
+
+    with conn:
+        conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS delta ({', '.join(COLUNAS_DELTA)})")
+        conn.execute("DELETE FROM delta")
+        conn.executemany(
+            f"INSERT INTO delta VALUES ({', '.join('?' * len(COLUNAS_DELTA))})",
+            delta.itertuples(index=False, name=None),
+        )
+        novos = conn.execute(
+            "SELECT COUNT(*) FROM delta WHERE telefone NOT IN (SELECT telefone FROM leads)"
+        ).fetchone()[0]
+
+        # "WHERE true" evita a ambiguidade do parser entre SELECT ... ON CONFLICT e JOIN ... ON
+        conn.execute("""
+            INSERT INTO leads (telefone, nome, email, empresa, cnpj, email_norm, cnpj_norm,
+                               origem, criado_em, atualizado_em)
+            SELECT telefone, nome, email, empresa, cnpj, email_norm, cnpj_norm, origem, :agora, :agora
+            FROM delta WHERE true
+            ON CONFLICT(telefone) DO UPDATE SET
+                nome = CASE WHEN leads.nome = '' THEN excluded.nome ELSE leads.nome END,
+                email = CASE WHEN leads.email = '' THEN excluded.email ELSE leads.email END,
+                email_norm = CASE WHEN leads.email_norm = '' THEN excluded.email_norm ELSE leads.email_norm END,
+                empresa = CASE WHEN leads.empresa = '' THEN excluded.empresa ELSE leads.empresa END,
+                cnpj = CASE WHEN leads.cnpj = '' THEN excluded.cnpj ELSE leads.cnpj END,
+                cnpj_norm = CASE WHEN leads.cnpj_norm = '' THEN excluded.cnpj_norm ELSE leads.cnpj_norm END,
+                atualizado_em = excluded.atualizado_em
+        """, {'agora': agora})
+
+        conn.execute("""
+            INSERT OR IGNORE INTO lead_origens (telefone, origem, nome, email, empresa, cnpj)
+            SELECT telefone, origem, nome, email, empresa, cnpj FROM delta
+        """)
+
+        # Todas_Origens só é recalculado para os telefones tocados por este delta
+        conn.execute("""
+            UPDATE leads SET todas_origens = (
+                SELECT group_concat(origem, ', ') FROM (
+                    SELECT origem FROM lead_origens WHERE lead_origens.telefone = leads.telefone ORDER BY origem
+                )
+            )
+            WHERE telefone IN (SELECT telefone FROM delta)
+        """)
+
+        # Chaves de todos os registros (o delta guarda só o primeiro de cada telefone)
+        _gravar_chaves(conn, df['Telefone'], df['Email'], df['CNPJ'])
+
+        # Na mesma transação: a fonte só conta como importada com o lead_id de todos já gravado
+        _atualizar_identidades(conn, so_afetados=True)
+
+        conn.execute(
+            "INSERT INTO fontes_importadas (hash, origem, arquivo, linhas, importado_em) VALUES (?, ?, ?, ?, ?)",
+            (hash_conteudo, origem, str(arquivo), len(df), agora),
+        )
+
+    return {'ignorada': False, 'novos': novos, 'atualizados': len(delta) - novos}
+
+
+# Lista consolidada (um registro por lead_id, o primeiro importado), no mesmo formato de consolidar_leads
+def ler_consolidado(conn):
+    df_unico = pd.read_sql_query("""
+        SELECT l.nome AS Nome, l.email AS Email, l.telefone AS Telefone, l.empresa AS Empresa,
+               l.cnpj AS CNPJ, l.origem AS Origem, l.lead_id AS lead_id
+        FROM leads l
+        WHERE l.rowid IN (SELECT MIN(rowid) FROM leads GROUP BY lead_id)
+        ORDER BY l.rowid
+    """, conn)
+
+    # Origens de cada lead como máscara de bits (sem group_concat por lead)
+    origens = pd.read_sql_query("""
+        SELECT l.lead_id AS lead_id, lo.origem AS Origem
+        FROM lead_origens lo JOIN leads l ON l.telefone = lo.telefone
+    """, conn)
+    return adicionar_origens(df_unico, origens)
+
+
+# Registros por origem (com duplicatas entre origens), para a análise de duplicatas
+def ler_registros(conn):
+    return pd.read_sql_query("""
+        SELECT lo.nome AS Nome, lo.email AS Email, lo.telefone AS Telefone, lo.empresa AS Empresa,
+               lo.cnpj AS CNPJ, lo.origem AS Origem, l.lead_id AS lead_id
+        FROM lead_origens lo JOIN leads l ON l.telefone = lo.telefone
+        ORDER BY lo.rowid
+    """, conn)
+
+
+# Identifica o estado atual da base (muda a cada fonte importada), para invalidar caches
+def versao_base(conn):
+    return tuple(linha[0] for linha in conn.execute("SELECT hash FROM fontes_importadas ORDER BY rowid"))
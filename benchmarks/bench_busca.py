@@ -0,0 +1,53 @@
+"""
+🔍 Benchmark da busca na lista única: varredura com str.contains x IndiceBusca
+
+O índice é montado uma vez; cada busca depois disso é uma busca binária por
+termo. A varredura refaz o trabalho inteiro a cada tecla.
+
+Uso: python benchmarks/bench_busca.py [linhas]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from busca_leads import IndiceBusca, filtrar_leads
+from consolidacao import consolidar_leads
+from gerar_leads import gerar_fontes
+from ingestao import padronizar_inscritos_live
+
+CONSULTAS = ['silva 12', '(41) 9000', 'lead1000@', '12.000.000/0001', 'farmacia 123']
+
+
+# Busca antiga: qualquer coluna contendo o texto digitado
+def varrer(df, consulta):
+    encontrados = np.zeros(len(df), dtype=bool)
+    for coluna in ['Nome', 'Empresa', 'Email', 'Telefone', 'CNPJ']:
+        encontrados |= df[coluna].astype(str).str.contains(consulta, case=False, regex=False).to_numpy()
+    return np.flatnonzero(encontrados)
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 250_000
+    live = gerar_fontes(linhas, dup_telefone=0.1, dup_email=0.05, dup_cnpj=0.05)['Inscritos na Live']
+    _, df_unico = consolidar_leads({'Inscritos na Live': padronizar_inscritos_live(live)})
+
+    inicio = time.perf_counter()
+    indice = IndiceBusca(df_unico)
+    tempo_indice = time.perf_counter() - inicio
+
+    print(f"🔍 {len(df_unico):,} leads únicos, índice com {len(indice.tokens):,} tokens em {tempo_indice:.2f}s")
+    print(f"   {'consulta':<18}{'varredura':>10}{'índice':>10}{'achados':>9}")
+    for consulta in CONSULTAS:
+        inicio = time.perf_counter()
+        varrer(df_unico, consulta)
+        tempo_varredura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        achados = filtrar_leads(df_unico, indice, consulta)
+        tempo_busca = time.perf_counter() - inicio
+        print(f"   {consulta:<18}{tempo_varredura * 1000:>8.1f}ms{tempo_busca * 1000:>8.1f}ms{len(achados):>9,}")
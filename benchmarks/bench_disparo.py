@@ -0,0 +1,65 @@
+"""
+📲 Benchmark do disparo contra o WhatsApp Web falso (servidor_whatsapp_falso.py)
+
+Sobe o servidor local, abre o Chrome headless com um perfil temporário e
+envia para contatos sintéticos sem o intervalo entre mensagens, nos dois
+caminhos de navegação (pesquisa de nova conversa e URL). Mede só o custo do disparador e das
+esperas na página, sem celular e sem risco de bloqueio.
+
+Uso: python benchmarks/bench_disparo.py [contatos] [--chromedriver CAMINHO]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.common.exceptions import TimeoutException
+
+from servidor_whatsapp_falso import iniciar_servidor
+from whatsapp_web import (MODO_APP, MODO_URL, NavegadorConversas, NumeroInvalido, enviar_mensagem_aberta,
+                          formatar_tempos, iniciar_whatsapp)
+
+PORTA = 8098
+
+
+def disparar(driver, url_base, modo, contatos):
+    navegador = NavegadorConversas(driver, modo=modo, url_base=url_base)
+    enviados = invalidos = falhas = 0
+    inicio = time.perf_counter()
+    for i in range(contatos):
+        telefone = f"+55419{i:08d}"
+        try:
+            caixa, _, _ = navegador.abrir(telefone, f"Olá, contato {i}! 👋")
+            enviar_mensagem_aberta(driver, caixa)
+            enviados += 1
+        except NumeroInvalido:
+            invalidos += 1
+        except TimeoutException:
+            falhas += 1
+    return time.perf_counter() - inicio, enviados, invalidos, falhas, navegador.resumo()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('contatos', type=int, nargs='?', default=50)
+    parser.add_argument('--chromedriver', default=None)
+    parser.add_argument('--taxa-invalidos', type=float, default=0.05)
+    args = parser.parse_args()
+
+    servidor = iniciar_servidor(PORTA, taxa_invalidos=args.taxa_invalidos)
+    url_base = f"http://127.0.0.1:{PORTA}"
+    with tempfile.TemporaryDirectory() as perfil:
+        driver, tempos = iniciar_whatsapp(perfil, args.chromedriver, timeout_login=30, url_base=url_base, headless=True)
+        print(f"🚀 Inicialização: {formatar_tempos(tempos)}")
+        try:
+            for modo in [MODO_APP, MODO_URL]:
+                duracao, enviados, invalidos, falhas, resumo = disparar(driver, url_base, modo, args.contatos)
+                print(f"{modo:<5}{duracao:>8.1f}s {args.contatos / duracao * 60:>8.1f} contatos/min "
+                      f"(✅ {enviados}  🚫 {invalidos}  ❌ {falhas}) {resumo}")
+        finally:
+            driver.quit()
+            servidor.shutdown()
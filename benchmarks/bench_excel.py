@@ -0,0 +1,87 @@
+"""
+📗 Benchmark da leitura de planilhas largas: leitura completa x cabeçalho primeiro + colunas usadas
+
+O loader antigo (read_excel de tudo + mapeamento por substring) é reproduzido
+aqui como referência. A planilha tem as 4 colunas úteis no meio de dezenas de
+colunas que o importador não usa.
+
+Uso: python benchmarks/bench_excel.py [linhas] [colunas_extras]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingestao import MOTOR_EXCEL, ler_excel
+from telefones import canonicalizar_telefones
+
+
+# Loader anterior, mantido só para comparação
+def ler_excel_antigo(file, origem):
+    df = pd.read_excel(file)
+    colunas_nome = [col for col in df.columns if 'nome' in col.lower() or 'razao' in col.lower() or 'empresa' in col.lower()]
+    colunas_telefone = [col for col in df.columns if 'telefone' in col.lower() or 'whats' in col.lower() or 'contato' in col.lower()]
+    colunas_email = [col for col in df.columns if 'email' in col.lower() or 'e-mail' in col.lower()]
+    colunas_cnpj = [col for col in df.columns if 'cnpj' in col.lower()]
+
+    df_clean = pd.DataFrame()
+    df_clean['Nome'] = df[colunas_nome[0]] if colunas_nome else ''
+    df_clean['Email'] = df[colunas_email[0]] if colunas_email else ''
+    df_clean['Telefone'] = canonicalizar_telefones(df[colunas_telefone[0]]) if colunas_telefone else ''
+    df_clean['Empresa'] = df[colunas_nome[0]] if colunas_nome else ''
+    df_clean['CNPJ'] = df[colunas_cnpj[0]] if colunas_cnpj else ''
+    df_clean['Origem'] = origem
+    return df_clean
+
+
+# Planilha larga: colunas extras antes e depois das colunas úteis
+def gerar_planilha(caminho, linhas, colunas_extras, seed=42):
+    rng = np.random.default_rng(seed)
+    extras = {f'Campo Extra {i}': rng.integers(0, 1_000_000, linhas) for i in range(colunas_extras)}
+    metade = colunas_extras // 2
+
+    uteis = {
+        'Razao Social': 'Farmácia ' + pd.Series(np.arange(linhas)).astype(str),
+        'Telefone Contato': (41_900_000_000 + np.arange(linhas)).astype(str),
+        'E-mail': 'loja' + pd.Series(np.arange(linhas)).astype(str) + '@farmacia.com.br',
+        'CNPJ': '12.345.678/0001-90',
+    }
+    nomes_extras = list(extras)
+    df = pd.DataFrame({
+        **{nome: extras[nome] for nome in nomes_extras[:metade]},
+        **uteis,
+        **{nome: extras[nome] for nome in nomes_extras[metade:]},
+    })
+    df.to_excel(caminho, index=False)
+
+
+def medir(funcao, caminho):
+    inicio = time.perf_counter()
+    df = funcao(caminho, 'Lojas com Potencial')
+    return time.perf_counter() - inicio, df
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    colunas_extras = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / 'larga.xlsx'
+        print(f"📝 Gerando planilha com {linhas:,} linhas e {colunas_extras + 4} colunas...")
+        gerar_planilha(caminho, linhas, colunas_extras)
+
+        tempo_antigo, df_antigo = medir(ler_excel_antigo, caminho)
+        tempo_novo, df_novo = medir(ler_excel, caminho)
+        tempo_repetido, _ = medir(ler_excel, caminho)
+
+    pd.testing.assert_frame_equal(df_antigo, df_novo)
+    print(f"📗 Motor: {MOTOR_EXCEL or 'padrão do pandas (openpyxl)'}")
+    print(f"{'leitura completa':<32}{tempo_antigo:>8.2f}s")
+    print(f"{'cabeçalho + colunas usadas':<32}{tempo_novo:>8.2f}s")
+    print(f"{'mesmo layout (mapeamento em cache)':<32}{tempo_repetido:>8.2f}s")
@@ -0,0 +1,60 @@
+"""
+📤 Benchmark da exportação XLSX: DataFrame.to_excel (workbook em memória) x escrever_xlsx (streaming)
+
+O tempo inclui o custo do tracemalloc, que pesa bastante nos dois lados.
+
+Uso: python benchmarks/bench_exportacao.py [linhas]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exportacao import escrever_xlsx, xlsxwriter
+
+
+def gerar_lista(linhas):
+    indices = pd.Series(np.arange(linhas)).astype(str)
+    df = pd.DataFrame({
+        'Nome': 'Lead ' + indices,
+        'Email': 'lead' + indices + '@farmacia.com.br',
+        'Telefone': '+554199' + indices.str.zfill(7),
+        'Empresa': 'Farmácia ' + indices,
+        'CNPJ': '12.345.678/0001-90',
+        'Origem': 'Inscritos na Live',
+        'lead_id': np.arange(linhas),
+        'Mascara_Origens': np.ones(linhas, dtype=np.int64),
+        'Qtd_Origens': np.ones(linhas, dtype=np.int64),
+    })
+    df.attrs['origens'] = ['Inscritos na Live']
+    return df
+
+
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracao, pico / 1024 ** 2
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = gerar_lista(linhas)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        tempo_antigo, pico_antigo = medir(lambda: df.to_excel(Path(pasta) / 'antigo.xlsx', index=False))
+        tempo_novo, pico_novo = medir(lambda: escrever_xlsx(Path(pasta) / 'novo.xlsx', {'Leads': df}))
+
+    print(f"📤 {linhas:,} linhas, writer: {'xlsxwriter (constant_memory)' if xlsxwriter else 'openpyxl (write_only)'}")
+    print(f"{'DataFrame.to_excel':<24}{tempo_antigo:>8.2f}s {pico_antigo:>9.1f} MB")
+    print(f"{'escrever_xlsx':<24}{tempo_novo:>8.2f}s {pico_novo:>9.1f} MB")
@@ -0,0 +1,88 @@
+"""
+🧩 Benchmark de escala da resolução de identidade (telefone OU e-mail OU CNPJ)
+
+O tempo por registro deve ficar praticamente constante entre os tamanhos:
+não há comparação entre pares. No fim, confere que a base persistente
+(importando uma fonte de cada vez) chega aos mesmos leads que a
+consolidação em memória, com fontes sintéticas que repetem telefone, e-mail
+e CNPJ também dentro da mesma fonte.
+
+Uso: python benchmarks/bench_identidade.py [tamanho_maximo] [linhas_conferencia]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base_leads import abrir_base, hash_arquivo, importar_fonte
+from consolidacao import consolidar_leads
+from fontes import ler_fonte
+from gerar_leads import gerar_fontes, salvar_fontes
+from identidade import resolver_identidades
+from telefones import canonicalizar_telefones
+
+
+# Registros sintéticos: ~10% repetem telefone, ~10% repetem só o e-mail, ~10% só o CNPJ
+def gerar_registros(linhas, seed=42):
+    rng = np.random.default_rng(seed)
+    pessoa = np.arange(linhas)
+    sorteio = rng.random(linhas)
+    outra = rng.integers(0, linhas, linhas)
+
+    telefone = np.where(sorteio < 0.1, outra, pessoa)
+    email = np.where((sorteio >= 0.1) & (sorteio < 0.2), outra, pessoa)
+    cnpj = np.where((sorteio >= 0.2) & (sorteio < 0.3), outra, pessoa)
+
+    return pd.DataFrame({
+        'Telefone': canonicalizar_telefones(pd.Series((41_900_000_000 + telefone).astype(str))),
+        'Email': 'lead' + pd.Series(email).astype(str) + '@farmacia.com.br',
+        'CNPJ': pd.Series(10_000_000_000_000 + cnpj).astype(str),
+    })
+
+
+# Função para conferir a base contra a consolidação em memória; retorna (leads em memória, leads na base, divergências)
+def conferir_base(linhas, seed=42):
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = salvar_fontes(pasta, gerar_fontes(linhas, seed=seed))
+        dfs = {origem: ler_fonte(str(caminho), origem)[0] for origem, caminho in caminhos.items()}
+
+        conn = abrir_base(str(Path(pasta) / 'leads.db'))
+        for origem, caminho in caminhos.items():
+            importar_fonte(conn, dfs[origem], origem, hash_arquivo(caminho), caminho)
+        base = pd.read_sql_query("SELECT telefone, lead_id FROM leads", conn).set_index('telefone')['lead_id']
+        conn.close()
+
+    # O lead_id é o menor telefone do grupo, então os dois lados são comparáveis telefone a telefone
+    df_todos, df_unico = consolidar_leads(dfs)
+    memoria = df_todos.drop_duplicates('Telefone').set_index('Telefone')['lead_id']
+    divergencias = int((memoria.reindex(base.index) != base).sum())
+    return len(df_unico), base.nunique(), divergencias
+
+
+if __name__ == '__main__':
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    linhas_conferencia = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    print("🧩 Benchmark de resolução de identidade")
+    print(f"   {'registros':>10} {'leads':>10} {'tempo':>8} {'µs/registro':>12}")
+
+    tamanho = 10_000
+    while tamanho <= maximo:
+        df = gerar_registros(tamanho)
+        inicio = time.perf_counter()
+        lead_id = resolver_identidades(df['Telefone'], df['Email'], df['CNPJ'])
+        duracao = time.perf_counter() - inicio
+        print(f"   {tamanho:>10,} {len(np.unique(lead_id)):>10,} {duracao:>7.2f}s {duracao / tamanho * 1e6:>12.2f}")
+        tamanho *= 10
+
+    leads_memoria, leads_base, divergencias = conferir_base(linhas_conferencia)
+    print(f"\n🗄️ Base x memória ({linhas_conferencia:,} linhas): {leads_memoria:,} leads em memória, "
+          f"{leads_base:,} na base, {divergencias} telefones com lead_id diferente")
+    if divergencias or leads_memoria != leads_base:
+        sys.exit("❌ A base persistente não chegou aos mesmos leads da consolidação em memória")
@@ -0,0 +1,49 @@
+"""
+📚 Benchmark da leitura das fontes: uma depois da outra x em paralelo (ler_fontes)
+
+Usa as fontes sintéticas de gerar_leads.py (CSV da Live + duas planilhas XLSX).
+Em paralelo o tempo deve ficar perto do da planilha mais lenta; com uma CPU
+só não há ganho.
+
+Uso: python benchmarks/bench_leitura_paralela.py [linhas]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fontes import descompactar, ler_fonte, ler_fontes
+from gerar_leads import gerar_fontes, salvar_fontes
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = salvar_fontes(pasta, gerar_fontes(linhas))
+        fontes = [(origem, caminho, caminho.name) for origem, caminho in caminhos.items()]
+
+        tempos_por_fonte = {}
+        inicio = time.perf_counter()
+        sequencial = []
+        for origem, caminho, nome in fontes:
+            marco = time.perf_counter()
+            sequencial.append(ler_fonte(caminho, origem, nome)[0])
+            tempos_por_fonte[origem] = time.perf_counter() - marco
+        tempo_sequencial = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        paralelo = [descompactar(compacta) for compacta, _ in ler_fontes(fontes)]
+        tempo_paralelo = time.perf_counter() - inicio
+
+    for df_sequencial, df_paralelo in zip(sequencial, paralelo):
+        assert df_sequencial.equals(df_paralelo)
+
+    print(f"📚 {linhas:,} linhas em {len(fontes)} fontes, {os.cpu_count()} CPU(s)")
+    for origem, segundos in tempos_por_fonte.items():
+        print(f"   {origem:<24}{segundos:>8.2f}s")
+    print(f"{'uma depois da outra':<27}{tempo_sequencial:>8.2f}s")
+    print(f"{'em paralelo':<27}{tempo_paralelo:>8.2f}s")
@@ -0,0 +1,132 @@
+"""
+⏱️ Benchmark por etapa do processamento, com baseline e detecção de regressão
+
+Gera as fontes sintéticas (gerar_leads.py) em cada tamanho e mede o tempo e o
+pico de memória de cada etapa: ler_inscritos_live, ler_excel (as duas
+planilhas), consolidar_leads e escrever_xlsx (listas única e completa). O
+tempo sai de uma execução sem tracemalloc; o pico, de uma segunda execução
+com tracemalloc (que deixa o código bem mais lento).
+
+Os números são comparados com benchmarks/baseline_pipeline.json: se alguma
+etapa ficar mais lenta ou gastar mais memória que a baseline além da
+tolerância, ou se o número de leads únicos mudar, o script sai com código 1.
+
+Uso: python benchmarks/bench_pipeline.py [--linhas 10000 100000] [--tolerancia 0.3] [--salvar-baseline]
+     (1M de linhas: --linhas 1000000, leva vários minutos)
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from consolidacao import consolidar_leads
+from exportacao import escrever_xlsx
+from gerar_leads import gerar_fontes, salvar_fontes
+from ingestao import ler_excel, ler_inscritos_live
+
+CAMINHO_BASELINE = Path(__file__).resolve().parent / 'baseline_pipeline.json'
+
+# Diferenças de tempo abaixo disso são ruído, mesmo que passem da tolerância
+FOLGA_SEGUNDOS = 0.05
+
+
+# Roda a etapa sem e com tracemalloc; retorna (resultado, segundos, pico em MB)
+def medir(funcao, memoria=True):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    if not memoria:
+        return resultado, segundos, None
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico / 1024 ** 2
+
+
+def executar(linhas, pasta, memoria=True):
+    caminhos = salvar_fontes(pasta, gerar_fontes(linhas))
+    planilhas = [(origem, caminho) for origem, caminho in caminhos.items() if caminho.suffix == '.xlsx']
+    etapas = {}
+
+    def etapa(nome, funcao):
+        resultado, segundos, pico = medir(funcao, memoria)
+        etapas[nome] = {'segundos': round(segundos, 3), 'pico_mb': round(pico, 1) if pico is not None else None}
+        return resultado
+
+    dfs = {'Inscritos na Live': etapa('ler_inscritos_live', lambda: ler_inscritos_live(caminhos['Inscritos na Live']))}
+    dfs.update(etapa('ler_excel', lambda: {origem: ler_excel(caminho, origem) for origem, caminho in planilhas}))
+    df_todos, df_unico = etapa('consolidar_leads', lambda: consolidar_leads(dfs))
+    etapa('escrever_xlsx', lambda: escrever_xlsx(Path(pasta) / 'saida.xlsx', {
+        'Leads Únicos': df_unico,
+        'Todos os Leads': df_todos.drop(columns=['telefone_norm', 'email_norm', 'nome_norm']),
+    }))
+    return {'leads_unicos': len(df_unico), 'etapas': etapas}
+
+
+# Lista de problemas em relação à baseline (vazia se está tudo dentro da tolerância)
+def comparar(atual, baseline, tolerancia):
+    problemas = []
+    if atual['leads_unicos'] != baseline['leads_unicos']:
+        problemas.append(f"leads únicos: {atual['leads_unicos']:,} (baseline {baseline['leads_unicos']:,})")
+
+    for nome, medida in atual['etapas'].items():
+        referencia = baseline['etapas'].get(nome)
+        if referencia is None:
+            continue
+        limite = referencia['segundos'] * (1 + tolerancia) + FOLGA_SEGUNDOS
+        if medida['segundos'] > limite:
+            problemas.append(f"{nome}: {medida['segundos']:.2f}s (baseline {referencia['segundos']:.2f}s)")
+        if medida['pico_mb'] is not None and referencia['pico_mb'] is not None:
+            if medida['pico_mb'] > referencia['pico_mb'] * (1 + tolerancia):
+                problemas.append(f"{nome}: {medida['pico_mb']:.1f} MB (baseline {referencia['pico_mb']:.1f} MB)")
+    return problemas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark por etapa do processamento de leads")
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--tolerancia', type=float, default=0.3,
+                        help="piora aceita em relação à baseline (padrão: 0.3 = 30%%)")
+    parser.add_argument('--sem-memoria', action='store_true', help="mede só o tempo (bem mais rápido)")
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help=f"grava os resultados como nova baseline em {CAMINHO_BASELINE.name}")
+    args = parser.parse_args()
+
+    baselines = json.loads(CAMINHO_BASELINE.read_text(encoding='utf-8')) if CAMINHO_BASELINE.exists() else {}
+    regressoes = []
+
+    for linhas in args.linhas:
+        with tempfile.TemporaryDirectory() as pasta:
+            resultado = executar(linhas, pasta, memoria=not args.sem_memoria)
+
+        print(f"\n⏱️ {linhas:,} linhas -> {resultado['leads_unicos']:,} leads únicos")
+        for nome, medida in resultado['etapas'].items():
+            pico = f"{medida['pico_mb']:>9.1f} MB" if medida['pico_mb'] is not None else ''
+            print(f"   {nome:<20}{medida['segundos']:>8.2f}s {pico}")
+
+        chave = str(linhas)
+        if args.salvar_baseline:
+            baselines[chave] = resultado
+        elif chave in baselines:
+            problemas = comparar(resultado, baselines[chave], args.tolerancia)
+            for problema in problemas:
+                print(f"   ❌ Regressão em {problema}")
+            if not problemas:
+                print("   ✅ Dentro da baseline")
+            regressoes += problemas
+        else:
+            print("   ⚠️ Sem baseline para este tamanho (use --salvar-baseline)")
+
+    if args.salvar_baseline:
+        CAMINHO_BASELINE.write_text(json.dumps(baselines, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"\n💾 Baseline salva em {CAMINHO_BASELINE}")
+
+    sys.exit(1 if regressoes else 0)
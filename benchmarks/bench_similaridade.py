@@ -0,0 +1,62 @@
+"""
+🔎 Benchmark da busca de nomes/empresas parecidos com blocagem
+
+Uso: python benchmarks/bench_similaridade.py [leads]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from similaridade import encontrar_semelhantes
+from telefones import canonicalizar_telefones
+
+PRIMEIROS_NOMES = np.array(['Ana', 'João', 'Maria', 'José', 'Lucas', 'Paula', 'Carlos', 'Fernanda', 'Pedro', 'Juliana'])
+SILABAS = ['Ba', 'Co', 'Mi', 'Ra', 'Te', 'Lu', 'Fe', 'Sa']
+SOBRENOMES = np.array(
+    ['Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Costa', 'Ribeiro', 'Alves', 'Gomes']
+    + [a + b.lower() + 'ni' for a in SILABAS for b in SILABAS]
+)
+PALAVRAS = np.array(['Saúde', 'Vida', 'Popular', 'Central', 'Bem Estar', 'Nova', 'Esperança', 'Pague Menos', 'Sul', 'Norte'])
+
+
+# Lista consolidada sintética: ~5% dos leads repetem a empresa de outro lead com grafia diferente
+def gerar_leads(linhas, seed=42):
+    rng = np.random.default_rng(seed)
+    numero = pd.Series(rng.integers(1, 5000, linhas)).astype(str)
+    empresa = 'Farmácia ' + pd.Series(PALAVRAS[rng.integers(0, 10, linhas)]) + ' ' + numero
+
+    repete = rng.random(linhas) < 0.05
+    outra = rng.integers(0, linhas, linhas)
+    empresa[repete] = empresa.to_numpy()[outra[repete]].astype(str)
+    empresa[repete] = empresa[repete].str.upper().str.replace('FARMÁCIA', 'DROGARIA', regex=False) + ' LTDA'
+
+    ddd = rng.integers(11, 100, linhas)
+    return pd.DataFrame({
+        'Nome': (
+            pd.Series(PRIMEIROS_NOMES[rng.integers(0, len(PRIMEIROS_NOMES), linhas)])
+            + ' ' + SOBRENOMES[rng.integers(0, len(SOBRENOMES), linhas)]
+            + ' ' + SOBRENOMES[rng.integers(0, len(SOBRENOMES), linhas)]
+        ),
+        'Empresa': empresa,
+        'Telefone': canonicalizar_telefones(pd.Series((ddd * 1_000_000_000 + 900_000_000 + np.arange(linhas)).astype(str))),
+        'CNPJ': '',
+        'lead_id': np.arange(linhas),
+    })
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df = gerar_leads(linhas)
+
+    inicio = time.perf_counter()
+    pares = encontrar_semelhantes(df)
+    duracao = time.perf_counter() - inicio
+
+    print(f"🔎 {linhas:,} leads -> {len(pares):,} pares suspeitos em {duracao:.2f}s")
+    print(pares.head(5).to_string(index=False))
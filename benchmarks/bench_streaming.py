@@ -0,0 +1,87 @@
+"""
+🌊 Benchmark de memória: ler_inscritos_live (tudo em memória) x ler_inscritos_live_streaming
+
+Mantém o número de leads únicos fixo e multiplica as linhas do CSV repetindo
+inscrições. O pico do modo streaming deve ficar praticamente constante,
+enquanto o da leitura completa cresce com o arquivo.
+
+Uso: python benchmarks/bench_streaming.py [leads_unicos]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingestao import COLUNAS_LIVE, ler_inscritos_live, ler_inscritos_live_streaming
+
+PREAMBULO = "Relatório de inscritos\nEvento: Live\nData: 07/01/2026\nPlataforma: Webinar\n\n"
+
+
+# Gera um CSV da Live com `unicos` telefones distintos repetidos até somar `linhas`
+def gerar_csv_live(caminho, unicos, linhas, seed=42):
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, unicos, linhas)
+    indices[:unicos] = np.arange(unicos)
+    telefones = (47_900_000_000 + indices).astype(str)
+
+    df = pd.DataFrame({
+        'Nome': 'Lead',
+        'Sobrenome': 'Silva ' + pd.Series(indices).astype(str),
+        'E-mail': 'lead' + pd.Series(indices).astype(str) + '@farmacia.com.br',
+        'Informe o seu WhatsApp': telefones,
+        'Informe a razão social de sua farmácia': 'Farmácia ' + pd.Series(indices % 1000).astype(str),
+        'Informe o CNPJ de sua farmácia': '00.000.000/0001-00',
+    }, columns=COLUNAS_LIVE)
+
+    with open(caminho, 'w', encoding='utf-8-sig') as f:
+        f.write(PREAMBULO)
+        df.to_csv(f, index=False)
+
+
+# Mede tempo e pico de memória (tracemalloc cobre os buffers do numpy/pandas)
+def medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    unicos = funcao()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(unicos), duracao, pico / 1024 ** 2
+
+
+def leitura_completa(caminho):
+    df = ler_inscritos_live(caminho)
+    df = df[df['Telefone'].str.len() > 0]
+    return df.drop_duplicates(subset=['Telefone'], keep='first')
+
+
+if __name__ == '__main__':
+    unicos = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    print(f"🌊 Benchmark de memória com {unicos:,} leads únicos")
+    print(f"   {'linhas':>10} {'modo':<10} {'únicos':>8} {'tempo':>8} {'pico MB':>9}")
+
+    picos_streaming = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for fator in (1, 4, 16):
+            caminho = Path(pasta) / f'live_{fator}.csv'
+            gerar_csv_live(caminho, unicos, unicos * fator)
+
+            for modo, funcao in (
+                ('completo', lambda: leitura_completa(caminho)),
+                ('streaming', lambda: ler_inscritos_live_streaming(caminho, chunksize=20_000)[0]),
+            ):
+                encontrados, duracao, pico = medir(funcao)
+                print(f"   {unicos * fator:>10,} {modo:<10} {encontrados:>8,} {duracao:>7.2f}s {pico:>9.1f}")
+                if modo == 'streaming':
+                    picos_streaming.append(pico)
+
+    crescimento = picos_streaming[-1] / picos_streaming[0]
+    print(f"   Pico do streaming com 16x mais linhas: {crescimento:.2f}x o pico com 1x")
@@ -0,0 +1,62 @@
+"""
+⏱️ Benchmark: limpar_telefone via Series.apply (caminho antigo) x canonicalizar_telefones
+
+Uso: python benchmarks/bench_telefones.py [linhas]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from telefones import canonicalizar_telefones
+
+
+# Caminho antigo, copiado de app_leads.py / processar_leads.py
+def limpar_telefone(telefone):
+    if pd.isna(telefone):
+        return ""
+    telefone_str = str(telefone)
+    numeros = re.sub(r'\D', '', telefone_str)
+    return numeros
+
+
+# Gera telefones nos formatos que aparecem nas planilhas reais
+def gerar_telefones(linhas, seed=42):
+    rng = np.random.default_rng(seed)
+    ddd = rng.integers(11, 99, linhas).astype(str)
+    assinante = rng.integers(90000000, 99999999, linhas).astype(str)
+    formato = rng.integers(0, 6, linhas)
+
+    telefones = pd.Series(ddd, dtype=object) + '9' + assinante
+    telefones[formato == 1] = '55' + telefones[formato == 1]
+    telefones[formato == 2] = '(' + pd.Series(ddd)[formato == 2] + ') 9' + pd.Series(assinante)[formato == 2]
+    telefones[formato == 3] = pd.Series(ddd)[formato == 3] + pd.Series(assinante)[formato == 3]
+    telefones[formato == 4] = '0' + telefones[formato == 4]
+    telefones[formato == 5] = None
+    return telefones
+
+
+def medir(nome, funcao, serie):
+    inicio = time.perf_counter()
+    resultado = funcao(serie)
+    duracao = time.perf_counter() - inicio
+    print(f"   {nome:<32} {duracao:8.2f}s  ({len(serie) / duracao:,.0f} linhas/s)")
+    return resultado, duracao
+
+
+if __name__ == '__main__':
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    serie = gerar_telefones(linhas)
+
+    print(f"📱 Benchmark de telefones com {linhas:,} linhas")
+    _, antigo = medir("apply(limpar_telefone)", lambda s: s.apply(limpar_telefone), serie)
+    canonicos, novo = medir("canonicalizar_telefones", canonicalizar_telefones, serie)
+
+    print(f"   Válidos em E.164: {(canonicos != '').sum():,}")
+    print(f"   Razão novo/antigo: {novo / antigo:.2f}x")
@@ -0,0 +1,136 @@
+"""
+🧬 Gerador de fontes de leads sintéticas (CSV da Live + planilhas XLSX)
+
+Gera as três fontes do processamento com o layout real: o CSV da Live com as
+5 linhas de preâmbulo e as planilhas de lojas com colunas no formato que o
+ler_excel reconhece. As duplicatas são controladas por chave: uma fração das
+linhas reaproveita o telefone, o e-mail ou o CNPJ de uma linha anterior
+(de qualquer fonte), então a consolidação encontra grupos entre fontes.
+
+Com a mesma semente o resultado é sempre o mesmo.
+
+Uso: python benchmarks/gerar_leads.py PASTA [linhas] [--dup-telefone 0.1] [--dup-email 0.05] [--dup-cnpj 0.05]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exportacao import escrever_xlsx
+from ingestao import COLUNAS_LIVE
+from telefones import DDDS_VALIDOS
+
+PREAMBULO = "Relatório de inscritos\nEvento: Live\nData: 07/01/2026\nPlataforma: Webinar\n\n"
+
+# Origem, arquivo e fração das linhas de cada fonte
+FONTES = [
+    ('Inscritos na Live', 'INSCRITOS_NA_LIVE.csv', 0.5),
+    ('Lojas Interessadas', 'LOJAS_INTERESSADAS_NO_ECOMMERCE.xlsx', 0.25),
+    ('Lojas com Potencial', 'LOJAS_QUE_TEM_POTENCIAL_PARA_ECOMMERCE.xlsx', 0.25),
+]
+
+DDDS = np.array(sorted(DDDS_VALIDOS), dtype=np.int64)
+
+
+# Para cada linha, o id de quem fornece a chave: ela mesma ou, com probabilidade `taxa`, uma linha anterior
+def _ids_com_duplicatas(rng, linhas, taxa):
+    ids = np.arange(linhas, dtype=np.int64)
+    repetir = (rng.random(linhas) < taxa) & (ids > 0)
+    ids[repetir] = (rng.random(int(repetir.sum())) * ids[repetir]).astype(np.int64)
+    return ids
+
+
+def _telefones(ids):
+    ddd = pd.Series(DDDS[ids % len(DDDS)]).astype(str)
+    numero = pd.Series(ids).astype(str).str.zfill(8)
+    return '(' + ddd + ') 9' + numero.str[:4] + '-' + numero.str[4:]
+
+
+def _emails(ids):
+    return 'lead' + pd.Series(ids).astype(str) + '@farmacia.com.br'
+
+
+def _cnpjs(ids):
+    digitos = pd.Series(12_000_000_000_000 + ids).astype(str).str.zfill(14)
+    return (digitos.str[:2] + '.' + digitos.str[2:5] + '.' + digitos.str[5:8] + '/'
+            + digitos.str[8:12] + '-' + digitos.str[12:])
+
+
+# Função para gerar as fontes em memória, no layout original de cada arquivo
+def gerar_fontes(linhas, dup_telefone=0.1, dup_email=0.05, dup_cnpj=0.05, seed=42):
+    """
+    Retorna {origem: DataFrame} somando `linhas` linhas entre as três fontes.
+    """
+    rng = np.random.default_rng(seed)
+    ids_telefone = _ids_com_duplicatas(rng, linhas, dup_telefone)
+    ids_email = _ids_com_duplicatas(rng, linhas, dup_email)
+    ids_cnpj = _ids_com_duplicatas(rng, linhas, dup_cnpj)
+
+    telefones = _telefones(ids_telefone)
+    emails = _emails(ids_email)
+    cnpjs = _cnpjs(ids_cnpj)
+    nomes = pd.Series(np.arange(linhas)).astype(str)
+    empresas = 'Farmácia ' + pd.Series(ids_cnpj).astype(str)
+
+    fontes = {}
+    inicio = 0
+    for i, (origem, _, fracao) in enumerate(FONTES):
+        fim = linhas if i == len(FONTES) - 1 else inicio + int(linhas * fracao)
+        fatia = slice(inicio, fim)
+        if origem == 'Inscritos na Live':
+            df = pd.DataFrame({
+                'Nome': 'Lead',
+                'Sobrenome': 'Silva ' + nomes[fatia],
+                'E-mail': emails[fatia],
+                'Informe o seu WhatsApp': telefones[fatia],
+                'Informe a razão social de sua farmácia': empresas[fatia],
+                'Informe o CNPJ de sua farmácia': cnpjs[fatia],
+            }, columns=COLUNAS_LIVE)
+        else:
+            df = pd.DataFrame({
+                'Razao Social': empresas[fatia],
+                # Nas planilhas o telefone vem como número, sem máscara
+                'Telefone Contato': telefones[fatia].str.replace(r'\D', '', regex=True).astype(np.int64),
+                'E-mail': emails[fatia],
+                'CNPJ': cnpjs[fatia],
+            })
+        fontes[origem] = df.reset_index(drop=True)
+        inicio = fim
+    return fontes
+
+
+# Função para gravar as fontes na pasta; retorna {origem: caminho}
+def salvar_fontes(pasta, fontes):
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminhos = {}
+    for origem, arquivo, _ in FONTES:
+        caminho = pasta / arquivo
+        if caminho.suffix == '.csv':
+            with open(caminho, 'w', encoding='utf-8-sig') as f:
+                f.write(PREAMBULO)
+                fontes[origem].to_csv(f, index=False)
+        else:
+            escrever_xlsx(caminho, {'Planilha1': fontes[origem]})
+        caminhos[origem] = caminho
+    return caminhos
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera fontes de leads sintéticas")
+    parser.add_argument('pasta')
+    parser.add_argument('linhas', type=int, nargs='?', default=10_000)
+    parser.add_argument('--dup-telefone', type=float, default=0.1)
+    parser.add_argument('--dup-email', type=float, default=0.05)
+    parser.add_argument('--dup-cnpj', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    fontes = gerar_fontes(args.linhas, args.dup_telefone, args.dup_email, args.dup_cnpj, args.seed)
+    for origem, caminho in salvar_fontes(args.pasta, fontes).items():
+        print(f"🧬 {origem}: {len(fontes[origem]):,} linhas -> {caminho}")
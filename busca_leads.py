@@ -0,0 +1,156 @@
+"""
+🔍 Busca, filtros e paginação da lista de leads, feitos no servidor
+
+O índice é montado uma vez por consolidação: cada lead vira um conjunto de
+tokens (palavras do nome/empresa, partes do e-mail, dígitos do telefone e do
+CNPJ) guardados num array ordenado. Uma busca procura cada termo por prefixo
+com busca binária e cruza os leads encontrados, sem varrer a lista a cada
+tecla. Filtros por origem usam a máscara de bits e só a página visível é
+montada para o navegador.
+"""
+
+import re
+import unicodedata
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from origens import bits_origens, com_todas_origens
+
+TAMANHOS_PAGINA = [50, 100, 500]
+
+# Tudo que não é letra minúscula ou dígito vira espaço (translate é bem mais rápido que regex)
+_SEPARADORES = str.maketrans({chr(c): ' ' for c in range(128) if not chr(c).isalnum() or chr(c).isupper()})
+
+
+# Termos de um texto: minúsculas, sem acentos; tudo que não é letra ou dígito separa termos
+def _termos(texto):
+    texto = texto.lower()
+    if not texto.isascii():
+        texto = unicodedata.normalize('NFKD', texto).encode('ascii', errors='ignore').decode('ascii')
+    return texto.translate(_SEPARADORES).split()
+
+
+# Tokens de texto livre: (posições, tokens); cada texto distinto é quebrado uma vez só
+def _tokens_texto(serie):
+    codigos, unicos = pd.factorize(serie.fillna('').astype(str))
+    termos = [_termos(texto) for texto in unicos]
+    quantidades = np.fromiter(map(len, termos), dtype=np.int64, count=len(termos))
+    tokens = np.fromiter(chain.from_iterable(termos), dtype=object, count=int(quantidades.sum()))
+
+    # Um par (posição, token) para cada token do texto de cada linha
+    ordem = np.argsort(codigos, kind='stable')
+    por_linha = quantidades[codigos[ordem]]
+    posicoes = np.repeat(ordem, por_linha)
+    inicio_texto = np.concatenate([[0], np.cumsum(quantidades)[:-1]])
+    deslocamento = np.arange(len(posicoes)) - np.repeat(np.cumsum(por_linha) - por_linha, por_linha)
+    return posicoes, tokens[np.repeat(inicio_texto[codigos[ordem]], por_linha) + deslocamento]
+
+
+# Telefone E.164 indexado inteiro, sem o 55 e sem o DDD, para achar "4199..." ou só "99..."
+def _tokens_telefone(serie):
+    digitos = serie.fillna('').astype(str).str.lstrip('+')
+    posicoes, tokens = [], []
+    for variante in [digitos, digitos.str[2:], digitos.str[4:]]:
+        validos = variante.str.len() > 0
+        posicoes.append(np.flatnonzero(validos.to_numpy()))
+        tokens.append(variante[validos].to_numpy(dtype=object))
+    return np.concatenate(posicoes), np.concatenate(tokens)
+
+
+# CNPJ só com os dígitos (com ou sem pontuação na busca)
+def _tokens_cnpj(serie):
+    digitos = serie.fillna('').astype(str).str.replace(r'\.0+$|\D', '', regex=True)
+    digitos = digitos.where(digitos.str.len() < 12, digitos.str.zfill(14))
+    validos = (digitos.str.len() > 0).to_numpy()
+    return np.flatnonzero(validos), digitos[validos].to_numpy(dtype=object)
+
+
+class IndiceBusca:
+    """
+    Tokens distintos num array ordenado e, para cada um, as posições (iloc)
+    dos leads que o têm, lado a lado num único array (como uma matriz
+    esparsa CSR). Monte uma vez por consolidação e reaproveite.
+    """
+
+    def __init__(self, df):
+        partes = [_tokens_texto(df[coluna]) for coluna in ['Nome', 'Empresa', 'Email'] if coluna in df.columns]
+        if 'Telefone' in df.columns:
+            partes.append(_tokens_telefone(df['Telefone']))
+        if 'CNPJ' in df.columns:
+            partes.append(_tokens_cnpj(df['CNPJ']))
+
+        posicoes = np.concatenate([p for p, _ in partes]) if partes else np.empty(0, dtype=np.int64)
+        tokens = np.concatenate([t for _, t in partes]) if partes else np.empty(0, dtype=object)
+
+        # Cada token distinto é ordenado uma vez só; as posições seguem a ordem dos tokens
+        codigos, distintos = pd.factorize(tokens)
+        # Texto de largura fixa ordena bem mais rápido que objetos str
+        ordem_distintos = np.argsort(distintos.astype(str))
+        posto = np.empty(len(distintos), dtype=np.int64)
+        posto[ordem_distintos] = np.arange(len(distintos))
+        chaves = posto[codigos]
+        ordem = np.argsort(chaves, kind='stable')
+
+        self.tokens = distintos[ordem_distintos]
+        self.posicoes = posicoes[ordem].astype(np.int32)
+        self.inicios = np.searchsorted(chaves[ordem], np.arange(len(distintos) + 1))
+        self.total = len(df)
+
+    # Posições dos leads que têm algum token começando com `prefixo`
+    def _com_prefixo(self, prefixo):
+        primeiro = np.searchsorted(self.tokens, prefixo, side='left')
+        ultimo = np.searchsorted(self.tokens, prefixo + '\uffff', side='left')
+        return np.unique(self.posicoes[self.inicios[primeiro]:self.inicios[ultimo]])
+
+    def buscar(self, consulta):
+        """
+        Posições (ordenadas) dos leads que casam com todos os termos da
+        consulta; None quando a consulta está vazia (nenhum filtro).
+        """
+        termos = _termos(str(consulta))
+        if not termos:
+            return None
+
+        # Só números e pontuação ("(41) 99876-", "12.345.678/0001"): um termo só com os dígitos
+        if not re.search(r'[a-z]', ' '.join(termos)):
+            termos = [''.join(termos)]
+
+        encontrados = None
+        for termo in dict.fromkeys(termos):
+            posicoes = self._com_prefixo(termo)
+            encontrados = posicoes if encontrados is None else np.intersect1d(encontrados, posicoes, assume_unique=True)
+            if len(encontrados) == 0:
+                break
+        return encontrados
+
+
+# Função para aplicar busca e filtros; retorna as posições (iloc) dos leads selecionados
+def filtrar_leads(df, indice=None, consulta='', origens=None, so_multiplas=False):
+    selecionados = np.ones(len(df), dtype=bool)
+    if origens:
+        bits = np.bitwise_or.reduce(bits_origens(pd.Series(list(origens)), df.attrs['origens']))
+        selecionados &= (df['Mascara_Origens'].to_numpy() & bits) != 0
+    if so_multiplas:
+        selecionados &= df['Qtd_Origens'].to_numpy() > 1
+
+    encontrados = indice.buscar(consulta) if indice is not None else None
+    if encontrados is None:
+        return np.flatnonzero(selecionados)
+    return encontrados[selecionados[encontrados]]
+
+
+# Só as linhas da página pedida (numeradas a partir de 1), já com o texto das origens
+# `df` pode ser um DataFrame ou uma visão da TabelaLeads (só a página é montada)
+def pagina(df, posicoes, numero, tamanho):
+    inicio = (numero - 1) * tamanho
+    posicoes_pagina = posicoes[inicio:inicio + tamanho]
+    trecho = df.iloc[posicoes_pagina] if isinstance(df, pd.DataFrame) else df.linhas(posicoes_pagina)
+    if 'Mascara_Origens' in trecho.columns:
+        trecho = com_todas_origens(trecho)
+    return trecho
+
+
+def total_paginas(quantidade, tamanho):
+    return max(1, -(-quantidade // tamanho))
@@ -0,0 +1,110 @@
+"""
+🔗 Consolidação das fontes de leads (uma linha por lead, com as origens)
+
+Separado do app para ser usado fora do Streamlit (benchmarks, scripts). A
+análise de duplicatas também sai daqui, calculada uma vez por consolidação
+com reduções vetorizadas, para a interface só mostrar tabelas prontas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from identidade import resolver_identidades
+from origens import adicionar_origens, contar_origens, mascara_por_lead, rotular_origens
+
+
+# Função para normalizar nomes (remover espaços extras, converter para minúsculas)
+def normalizar_texto(texto):
+    if pd.isna(texto):
+        return ""
+    return str(texto).strip().lower()
+
+
+# Função para consolidar leads
+def consolidar_leads(dfs_dict):
+    # Concatenar todos os DataFrames
+    df_todos = pd.concat(dfs_dict.values(), ignore_index=True)
+    
+    # Remover linhas completamente vazias
+    df_todos = df_todos[df_todos['Telefone'].str.len() > 0]
+    
+    # Criar colunas normalizadas para comparação
+    # Telefone já chega canonicalizado em E.164 pelos leitores
+    df_todos['telefone_norm'] = df_todos['Telefone']
+    df_todos['email_norm'] = df_todos['Email'].apply(normalizar_texto)
+    df_todos['nome_norm'] = df_todos['Nome'].apply(normalizar_texto)
+    
+    # Identificar duplicatas por telefone
+    df_todos['duplicata_telefone'] = df_todos.duplicated(subset=['telefone_norm'], keep=False)
+    
+    # Resolver identidade: mesmo telefone, e-mail ou CNPJ = mesmo lead
+    df_todos['lead_id'] = resolver_identidades(df_todos['Telefone'], df_todos['Email'], df_todos['CNPJ'])
+    df_todos['duplicata_lead'] = df_todos.duplicated(subset=['lead_id'], keep=False)
+    
+    # Criar lista única (remover duplicatas mantendo o primeiro registro de cada lead)
+    df_unico = df_todos.drop_duplicates(subset=['lead_id'], keep='first')
+    
+    # Origens de cada lead como máscara de bits (o texto só é montado no export)
+    df_unico = adicionar_origens(df_unico, df_todos)
+    
+    # Remover colunas auxiliares
+    df_unico = df_unico.drop(columns=['telefone_norm', 'email_norm', 'nome_norm', 'duplicata_telefone', 'duplicata_lead'])
+    
+    return df_todos, df_unico
+
+
+# Valores distintos de cada grupo (na ordem em que aparecem) unidos pelo separador, sem uma função por grupo
+def _juntar_por_grupo(grupos, valores, separador=' / '):
+    tabela = pd.DataFrame({'grupo': np.asarray(grupos), 'valor': np.asarray(valores, dtype=object)}).dropna()
+    tabela['valor'] = tabela['valor'].astype(str)
+    tabela = tabela.drop_duplicates().sort_values('grupo', kind='stable')
+    if len(tabela) == 0:
+        return pd.Series(dtype=object)
+
+    grupo = tabela['grupo'].to_numpy()
+    valor = tabela['valor'].to_numpy(dtype=object)
+    primeiro = np.r_[True, grupo[1:] != grupo[:-1]]
+    inicios = np.flatnonzero(primeiro)
+    pedacos = np.where(primeiro, valor, separador + valor)
+    return pd.Series(np.add.reduceat(pedacos, inicios), index=grupo[inicios])
+
+
+# Leads presentes em cada par de origens (diagonal = leads da origem)
+def matriz_sobreposicao(mascaras, origens):
+    mascaras = np.asarray(mascaras, dtype=np.int64)
+    bits = [bit for bit in range(len(origens)) if np.any((mascaras >> bit) & 1)]
+    presenca = np.stack([(mascaras >> bit) & 1 for bit in bits], axis=1) if bits else np.zeros((len(mascaras), 0), dtype=np.int64)
+    nomes = [origens[bit] for bit in bits]
+    return pd.DataFrame(presenca.T @ presenca, index=nomes, columns=nomes)
+
+
+# Função para montar a análise de duplicatas a partir da consolidação
+def analisar_duplicatas(df_todos, df_unico):
+    """
+    Retorna um dicionário com o total de registros duplicados, os leads em
+    múltiplas origens (valores distintos de nome/e-mail/telefone, registros e
+    origens de cada um), o máximo de origens por lead e a matriz de
+    sobreposição entre origens.
+    """
+    origens = df_unico.attrs['origens']
+    duplicados = df_todos[df_todos['lead_id'].duplicated(keep=False)]
+    lead_ids, mascaras = mascara_por_lead(duplicados['lead_id'], duplicados['Origem'], origens)
+    qtd_origens = contar_origens(mascaras)
+    em_multiplas = qtd_origens > 1
+
+    multiplas = duplicados[duplicados['lead_id'].isin(lead_ids[em_multiplas])]
+    ids = lead_ids[em_multiplas]
+    clusters = pd.DataFrame({'lead_id': ids})
+    for coluna in ['Nome', 'Email', 'Telefone']:
+        clusters[coluna] = _juntar_por_grupo(multiplas['lead_id'], multiplas[coluna]).reindex(ids).fillna('').to_numpy()
+    clusters['Qtd_Registros'] = multiplas['lead_id'].value_counts().reindex(ids).to_numpy()
+    clusters['Qtd_Origens'] = qtd_origens[em_multiplas]
+    clusters['Origens'] = rotular_origens(mascaras[em_multiplas], origens)
+    clusters = clusters.sort_values(['Qtd_Origens', 'lead_id'], ascending=[False, True], kind='stable')
+
+    return {
+        'registros_duplicados': len(duplicados),
+        'clusters': clusters.reset_index(drop=True),
+        'max_origens': int(qtd_origens.max()) if len(qtd_origens) else 0,
+        'sobreposicao': matriz_sobreposicao(df_unico['Mascara_Origens'], origens),
+    }
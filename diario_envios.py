@@ -0,0 +1,86 @@
+"""
+📓 Diário de envios (JSONL, só acrescenta, com fsync a cada linha)
+
+Cada mudança de estado de um contato vira uma linha no arquivo, gravada no
+disco antes do próximo passo. Se o disparo cair (Ctrl+C, navegador fechado,
+queda de energia), o diário diz exatamente quem já recebeu a mensagem e o
+--resume dos disparadores pula esses contatos.
+
+Estados: 'tentando' (abrindo a conversa), 'enviado' (balão com tique
+confirmado) e 'falha'. Os registros finais ('enviado'/'falha') levam em
+`etapas` os instantes monotônicos de cada etapa do contato (navegar,
+conversa_pronta, submetido, confirmado, falha), lidos por relatorio_envios.py.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+CAMINHO_DIARIO_PADRAO = 'diario_envios.jsonl'
+
+ESTADO_TENTANDO = 'tentando'
+ESTADO_ENVIADO = 'enviado'
+ESTADO_FALHA = 'falha'
+
+# Etapas de um contato, na ordem em que acontecem
+ETAPAS = ['navegar', 'conversa_pronta', 'submetido', 'confirmado']
+
+
+# Registros de um diário, na ordem em que foram gravados
+def ler_diario(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        for linha in f:
+            try:
+                yield json.loads(linha)
+            except json.JSONDecodeError:
+                # Última linha cortada por uma queda no meio da escrita
+                continue
+
+
+class DiarioEnvios:
+    """
+    Diário de envios com índice em memória (telefone canônico -> último
+    estado), então saber se um contato já foi enviado é O(1).
+    """
+
+    def __init__(self, caminho=CAMINHO_DIARIO_PADRAO):
+        self.caminho = Path(caminho)
+        self.estados = {}
+        if self.caminho.exists():
+            self._carregar()
+        self.arquivo = open(self.caminho, 'a', encoding='utf-8')
+
+        # Linha cortada no fim: começa a próxima numa linha nova para não emendar os registros
+        if self.caminho.stat().st_size > 0:
+            with open(self.caminho, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self.arquivo.write('\n')
+
+    def _carregar(self):
+        for registro in ler_diario(self.caminho):
+            self.estados[registro['telefone']] = registro['estado']
+
+    def registrar(self, telefone, estado, **detalhes):
+        registro = {'momento': datetime.now().isoformat(timespec='milliseconds'), 'telefone': telefone, 'estado': estado}
+        registro.update(detalhes)
+        self.arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        self.estados[telefone] = estado
+
+    def ja_enviado(self, telefone):
+        return self.estados.get(telefone) == ESTADO_ENVIADO
+
+    # Contatos em que o disparo caiu no meio: a mensagem pode ou não ter saído
+    def interrompidos(self):
+        return [telefone for telefone, estado in self.estados.items() if estado == ESTADO_TENTANDO]
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+# Status da planilha que indicam que o lead já recebeu a mensagem ("Menssagem enviada", "1º Menssagem enviada")
+def status_ja_enviado(serie):
+    return serie.fillna('').astype(str).str.contains('enviada', case=False, regex=False)
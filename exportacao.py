@@ -0,0 +1,130 @@
+"""
+📤 Exportação das listas de leads (XLSX em streaming, CSV e Parquet)
+
+As planilhas são escritas linha a linha em blocos, sem montar o workbook
+inteiro em memória: xlsxwriter em modo constant_memory quando instalado,
+senão openpyxl em modo write_only. Várias listas podem sair como abas de um
+único arquivo. O texto de Todas_Origens é montado aqui, a partir da máscara
+de bits (origens.py), só na hora de escrever.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from origens import rotular_origens
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_DISPONIVEL = True
+    except ImportError:
+        PARQUET_DISPONIVEL = False
+
+LINHAS_POR_BLOCO = 50_000
+COLUNAS_WHATSAPP = ['Nome', 'Telefone', 'Email', 'Todas_Origens']
+COLUNAS_INTERNAS = ['Mascara_Origens', 'Qtd_Origens']
+
+
+# Colunas de saída sem copiar os dados: referências às colunas originais + Todas_Origens em texto
+def colunas_exportacao(df, colunas=None):
+    colunas = colunas or [col for col in df.columns if col not in COLUNAS_INTERNAS] + (
+        ['Todas_Origens'] if 'Mascara_Origens' in df.columns else []
+    )
+    saida = {}
+    for coluna in colunas:
+        if coluna == 'Todas_Origens' and 'Mascara_Origens' in df.columns:
+            saida[coluna] = rotular_origens(df['Mascara_Origens'], df.attrs['origens'])
+        else:
+            saida[coluna] = df[coluna]
+    return saida
+
+
+# Linhas de um bloco como tuplas prontas para a planilha (NaN vira célula vazia)
+def _linhas_do_bloco(colunas, inicio, fim):
+    valores = []
+    for serie in colunas.values():
+        bloco = np.asarray(serie[inicio:fim], dtype=object)
+        valores.append(np.where(pd.isna(bloco), None, bloco))
+    return zip(*valores)
+
+
+def _escrever_xlsxwriter(destino, abas):
+    # Num arquivo aberto (ex.: BytesIO) o xlsxwriter monta tudo em memória e ignora constant_memory;
+    # então escreve num arquivo temporário e copia os bytes para o destino
+    if not isinstance(destino, str):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'leads.xlsx')
+            _escrever_xlsxwriter(caminho, abas)
+            with open(caminho, 'rb') as f:
+                shutil.copyfileobj(f, destino)
+        return
+
+    livro = xlsxwriter.Workbook(destino, {'constant_memory': True})
+    for nome_aba, df in abas.items():
+        planilha = livro.add_worksheet(nome_aba)
+        colunas = colunas_exportacao(df)
+        planilha.write_row(0, 0, list(colunas))
+        for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+            for numero, linha in enumerate(_linhas_do_bloco(colunas, inicio, inicio + LINHAS_POR_BLOCO), start=inicio + 1):
+                planilha.write_row(numero, 0, linha)
+    livro.close()
+
+
+def _escrever_openpyxl(destino, abas):
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    for nome_aba, df in abas.items():
+        planilha = livro.create_sheet(nome_aba)
+        colunas = colunas_exportacao(df)
+        planilha.append(list(colunas))
+        for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+            for linha in _linhas_do_bloco(colunas, inicio, inicio + LINHAS_POR_BLOCO):
+                planilha.append(linha)
+    livro.save(destino)
+
+
+# Função para escrever uma ou mais listas num único XLSX (uma aba por lista)
+def escrever_xlsx(destino, abas):
+    """
+    `destino` é um caminho ou um arquivo aberto (ex.: BytesIO); `abas` é um
+    dicionário {nome da aba: DataFrame}, escrito na ordem dada.
+    """
+    destino = str(destino) if not hasattr(destino, 'write') else destino
+    if xlsxwriter is not None:
+        _escrever_xlsxwriter(destino, abas)
+    else:
+        _escrever_openpyxl(destino, abas)
+
+
+# CSV para o disparo de WhatsApp, direto das colunas canônicas
+def escrever_csv_whatsapp(destino, df_unico):
+    colunas = colunas_exportacao(df_unico, COLUNAS_WHATSAPP)
+    pd.DataFrame(colunas, copy=False).to_csv(destino, index=False, encoding='utf-8-sig')
+
+
+def escrever_csv(destino, df):
+    pd.DataFrame(colunas_exportacao(df), copy=False).to_csv(destino, index=False, encoding='utf-8-sig')
+
+
+def escrever_parquet(destino, df):
+    if not PARQUET_DISPONIVEL:
+        raise RuntimeError("Exportar Parquet requer pyarrow ou fastparquet (pip install pyarrow)")
+
+    tabela = pd.DataFrame(colunas_exportacao(df), copy=False)
+    # Colunas de texto com números soltos (ex.: CNPJ lido do Excel) viram texto para caber no schema
+    for coluna in tabela.columns[tabela.dtypes == object]:
+        tabela[coluna] = tabela[coluna].where(tabela[coluna].isna(), tabela[coluna].astype(str))
+    tabela.to_parquet(destino, index=False)
@@ -0,0 +1,122 @@
+"""
+📚 Leitura de qualquer número de fontes de leads, em paralelo
+
+Cada arquivo é lido num processo separado (a leitura de XLSX é pura CPU),
+então o tempo total acompanha o arquivo mais lento e não a soma de todos. O
+tipo da fonte sai da extensão: CSV no layout da Live ou planilha XLSX.
+
+Os processos devolvem cada fonte numa forma colunar compacta, barata de
+transferir: telefones como texto de largura fixa (um único buffer) e as
+demais colunas fatoradas em códigos int32 + valores distintos. O DataFrame
+só é remontado no processo principal.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingestao import COLUNAS_LEADS, TAMANHO_CHUNK, ler_excel, ler_inscritos_live, ler_inscritos_live_streaming
+from telefones import LARGURA_E164
+
+EXTENSOES_CSV = ('.csv',)
+EXTENSOES_EXCEL = ('.xlsx', '.xlsm')
+
+
+# Arquivos padrão das campanhas e a origem com que sempre foram gravados (CLI, app e base persistente)
+ARQUIVOS_PADRAO = {
+    'INSCRITOS_NA_LIVE.csv': 'Inscritos na Live',
+    'LOJAS_INTERESSADAS_NO_ECOMMERCE.xlsx': 'Lojas Interessadas',
+    'LOJAS_QUE_TEM_POTENCIAL_PARA_ECOMMERCE.xlsx': 'Lojas com Potencial',
+}
+
+
+# Nome de origem a partir do nome do arquivo: os arquivos padrão mantêm a origem de sempre; os
+# demais viram texto (LOJAS_NOVAS.xlsx -> "Lojas novas"), reaproveitando a grafia de uma origem padrão
+def origem_do_arquivo(nome):
+    padrao = {Path(arquivo).stem.lower(): origem for arquivo, origem in ARQUIVOS_PADRAO.items()}
+    stem = Path(nome).stem.strip()
+    if stem.lower() in padrao:
+        return padrao[stem.lower()]
+
+    origem = stem.replace('_', ' ').strip()
+    conhecidas = {conhecida.lower(): conhecida for conhecida in ARQUIVOS_PADRAO.values()}
+    return conhecidas.get(origem.lower(), origem.capitalize())
+
+
+# Função para ler uma fonte pelo tipo do arquivo; retorna (df, estatísticas do streaming ou None)
+def ler_fonte(arquivo, origem, nome=None, streaming=False, chunksize=TAMANHO_CHUNK):
+    nome = nome or str(arquivo)
+    if isinstance(arquivo, bytes):
+        arquivo = BytesIO(arquivo)
+
+    extensao = Path(nome).suffix.lower()
+    if extensao in EXTENSOES_CSV:
+        if streaming:
+            return ler_inscritos_live_streaming(arquivo, chunksize, origem=origem)
+        return ler_inscritos_live(arquivo, origem), None
+    if extensao in EXTENSOES_EXCEL:
+        return ler_excel(arquivo, origem), None
+    raise ValueError(f"Formato não suportado: {nome} (use o CSV da Live ou uma planilha XLSX)")
+
+
+# Forma colunar compacta de uma fonte já padronizada
+def compactar(df, origem):
+    colunas = {}
+    for coluna in COLUNAS_LEADS:
+        if coluna == 'Origem':
+            continue
+        if coluna == 'Telefone':
+            colunas[coluna] = np.asarray(df[coluna], dtype=f'U{LARGURA_E164}')
+        else:
+            codigos, valores = pd.factorize(df[coluna].to_numpy(), use_na_sentinel=False)
+            colunas[coluna] = (codigos.astype(np.int32), valores)
+    return {'origem': origem, 'linhas': len(df), 'colunas': colunas}
+
+
+# Remonta o DataFrame de uma fonte compacta
+def descompactar(compacta):
+    dados = {}
+    for coluna in COLUNAS_LEADS:
+        if coluna == 'Origem':
+            dados[coluna] = compacta['origem']
+        elif coluna == 'Telefone':
+            dados[coluna] = compacta['colunas'][coluna].astype(object)
+        else:
+            codigos, valores = compacta['colunas'][coluna]
+            dados[coluna] = valores[codigos]
+    return pd.DataFrame(dados, index=pd.RangeIndex(compacta['linhas']), columns=COLUNAS_LEADS)
+
+
+def _ler_compacta(arquivo, origem, nome, streaming, chunksize):
+    df, estatisticas = ler_fonte(arquivo, origem, nome, streaming, chunksize)
+    return compactar(df, origem), estatisticas
+
+
+# Processos novos (spawn), nunca fork: o app chama ler_fontes de dentro do servidor do Streamlit,
+# que tem várias threads, e um fork copiaria travas seguras por outras threads. Scripts que usam
+# ler_fontes precisam da guarda `if __name__ == '__main__'`, porque o spawn reimporta o __main__
+CONTEXTO_PROCESSOS = multiprocessing.get_context('spawn')
+
+
+# Função para ler várias fontes de uma vez, cada uma num processo
+def ler_fontes(fontes, streaming=False, chunksize=TAMANHO_CHUNK, processos=None):
+    """
+    `fontes` é uma lista de (origem, arquivo, nome): o arquivo pode ser um
+    caminho ou o conteúdo em bytes (upload) e o nome decide o tipo da fonte.
+    Retorna [(compacta, estatisticas)] na mesma ordem das fontes; use
+    descompactar() para ter o DataFrame.
+    """
+    processos = min(len(fontes), processos or os.cpu_count() or 1)
+    argumentos = [(arquivo, origem, nome, streaming, chunksize) for origem, arquivo, nome in fontes]
+
+    if processos <= 1:
+        return [_ler_compacta(*args) for args in argumentos]
+
+    with ProcessPoolExecutor(max_workers=processos, mp_context=CONTEXTO_PROCESSOS) as executor:
+        futuros = [executor.submit(_ler_compacta, *args) for args in argumentos]
+        return [futuro.result() for futuro in futuros]
@@ -0,0 +1,124 @@
+"""
+🧩 Resolução de identidade dos leads (telefone OU e-mail OU CNPJ)
+
+Registros que compartilham qualquer uma das chaves viram o mesmo lead. As
+ligações saem de índices por chave (cada registro liga-se à primeira
+ocorrência da sua chave) e os grupos são fechados com union-find vetorizado
+(união pelas raízes + compressão de caminhos), sem comparar pares.
+"""
+
+import numpy as np
+import pandas as pd
+
+from telefones import chaves_telefones
+
+# E-mails/CNPJs presentes em mais telefones que isso são genéricos (contabilidade, matriz de rede...)
+# e não servem para dizer que dois registros são a mesma pessoa
+MAX_TELEFONES_POR_CHAVE = 20
+
+
+# Função para normalizar e-mails (só vale se tiver "@")
+def normalizar_emails(serie):
+    emails = serie.fillna('').astype(str).str.strip().str.lower()
+    return emails.where(emails.str.contains('@', regex=False), '')
+
+
+# Função para normalizar CNPJs como inteiros (zeros à esquerda perdidos pelo Excel não importam); inválido vira 0
+def normalizar_cnpjs(serie):
+    digitos = serie.fillna('').astype(str).str.replace(r'\.0+$|\D', '', regex=True)
+    tamanho = digitos.str.len()
+    digitos = digitos.where((tamanho >= 12) & (tamanho <= 14), '0')
+
+    cnpjs = pd.to_numeric(digitos).to_numpy(dtype=np.int64)
+    # Placeholders como 00000000000000 ou 11111111111111
+    return np.where(cnpjs % 11_111_111_111_111 == 0, 0, cnpjs)
+
+
+# Códigos inteiros por chave (-1 onde a chave é inválida)
+def _codigos(chave, valido):
+    codigos = np.full(len(chave), -1, dtype=np.int64)
+    codigos[valido], _ = pd.factorize(chave[valido])
+    return codigos
+
+
+# Liga cada registro à primeira ocorrência da sua chave (arestas origem -> destino)
+def _arestas_por_chave(codigos):
+    linhas = np.flatnonzero(codigos >= 0)
+    if len(linhas) == 0:
+        return linhas, linhas
+
+    primeira = np.full(codigos.max() + 1, len(codigos), dtype=np.int64)
+    np.minimum.at(primeira, codigos[linhas], linhas)
+    return linhas, primeira[codigos[linhas]]
+
+
+# Invalida as chaves que aparecem em telefones demais
+def _sem_chaves_genericas(codigos, codigos_tel, max_telefones):
+    validos = (codigos >= 0) & (codigos_tel >= 0)
+    if not validos.any():
+        return codigos
+
+    base = codigos_tel.max() + 1
+    pares = pd.unique(codigos[validos] * base + codigos_tel[validos])
+    telefones_por_chave = np.bincount(pares // base, minlength=codigos.max() + 1)
+
+    genericas = np.zeros(len(codigos), dtype=bool)
+    genericas[codigos >= 0] = telefones_por_chave[codigos[codigos >= 0]] > max_telefones
+    return np.where(genericas, -1, codigos)
+
+
+# Union-find vetorizado: devolve a raiz (menor índice) do grupo de cada registro
+def _componentes(n, origem, destino):
+    pai = np.arange(n, dtype=np.int64)
+    while True:
+        raiz_a, raiz_b = pai[origem], pai[destino]
+        pendentes = raiz_a != raiz_b
+        if not pendentes.any():
+            return pai
+
+        # União: a raiz maior passa a apontar para a menor (pai[i] <= i sempre, então não há ciclos)
+        raiz_a, raiz_b = raiz_a[pendentes], raiz_b[pendentes]
+        np.minimum.at(pai, np.maximum(raiz_a, raiz_b), np.minimum(raiz_a, raiz_b))
+
+        # Compressão de caminhos até todo mundo apontar direto para a raiz
+        while True:
+            avo = pai[pai]
+            if np.array_equal(avo, pai):
+                break
+            pai = avo
+
+
+# Função para resolver identidades
+def resolver_identidades(telefones, emails, cnpjs, max_telefones_por_chave=MAX_TELEFONES_POR_CHAVE):
+    """
+    Retorna um lead_id (int64) por registro. Registros ligados por telefone,
+    e-mail ou CNPJ, direta ou indiretamente, recebem o mesmo lead_id.
+
+    O lead_id é o menor telefone canônico do grupo (sem o "+"), então não
+    depende da ordem das linhas. Grupos sem nenhum telefone recebem um id
+    negativo, válido só dentro da mesma execução.
+    """
+    n = len(telefones)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    chaves_tel = chaves_telefones(telefones)
+    codigos_tel = _codigos(chaves_tel, chaves_tel > 0)
+
+    emails = normalizar_emails(emails).to_numpy()
+    cnpjs = normalizar_cnpjs(cnpjs)
+    codigos_chaves = [
+        codigos_tel,
+        _sem_chaves_genericas(_codigos(emails, emails != ''), codigos_tel, max_telefones_por_chave),
+        _sem_chaves_genericas(_codigos(cnpjs, cnpjs > 0), codigos_tel, max_telefones_por_chave),
+    ]
+
+    origens, destinos = zip(*(_arestas_por_chave(codigos) for codigos in codigos_chaves))
+    raiz = _componentes(n, np.concatenate(origens), np.concatenate(destinos))
+
+    sem_telefone = np.iinfo(np.int64).max
+    menor_telefone = np.full(n, sem_telefone, dtype=np.int64)
+    np.minimum.at(menor_telefone, raiz, np.where(chaves_tel > 0, chaves_tel, sem_telefone))
+
+    lead_id = menor_telefone[raiz]
+    return np.where(lead_id == sem_telefone, -(raiz + 1), lead_id)
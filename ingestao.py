@@ -0,0 +1,184 @@
+"""
+📥 Leitura e padronização das fontes de leads
+
+Compartilhado entre app_leads.py e processar_leads.py. Todas as fontes saem
+com as mesmas colunas (COLUNAS_LEADS) e com o telefone já em E.164.
+"""
+
+from functools import lru_cache
+
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+from telefones import ConjuntoTelefones, canonicalizar_telefones, chaves_telefones
+
+COLUNAS_LEADS = ['Nome', 'Email', 'Telefone', 'Empresa', 'CNPJ', 'Origem']
+
+# Colunas do export da Live usadas na padronização
+COLUNAS_LIVE = [
+    'Nome',
+    'Sobrenome',
+    'E-mail',
+    'Informe o seu WhatsApp',
+    'Informe a razão social de sua farmácia',
+    'Informe o CNPJ de sua farmácia',
+]
+
+# Linhas por bloco no modo streaming
+TAMANHO_CHUNK = 100_000
+
+ORIGEM_LIVE = 'Inscritos na Live'
+
+
+# Função para padronizar um bloco do CSV da Live
+def padronizar_inscritos_live(df, origem=ORIGEM_LIVE):
+    df_clean = pd.DataFrame()
+    df_clean['Nome'] = df['Nome'].fillna('') + ' ' + df['Sobrenome'].fillna('')
+    df_clean['Nome'] = df_clean['Nome'].str.strip()
+    df_clean['Email'] = df['E-mail']
+    df_clean['Telefone'] = canonicalizar_telefones(df['Informe o seu WhatsApp'])
+    df_clean['Empresa'] = df['Informe a razão social de sua farmácia']
+    df_clean['CNPJ'] = df['Informe o CNPJ de sua farmácia']
+    df_clean['Origem'] = origem
+
+    return df_clean
+
+
+# Função para ler o CSV com cabeçalho específico
+def ler_inscritos_live(file, origem=ORIGEM_LIVE):
+    # Ler o arquivo pulando as linhas de cabeçalho
+    df = pd.read_csv(file, skiprows=5, encoding='utf-8-sig')
+    return padronizar_inscritos_live(df, origem)
+
+
+# Função para ler o CSV da Live em blocos, mantendo só a primeira ocorrência de cada telefone
+def ler_inscritos_live_streaming(file, chunksize=TAMANHO_CHUNK, vistos=None, origem=ORIGEM_LIVE):
+    """
+    Lê o CSV da Live bloco a bloco, padroniza e deduplica cada bloco contra os
+    telefones já vistos. Só as linhas novas são guardadas, então a memória
+    cresce com o número de leads únicos e não com o tamanho do arquivo.
+
+    `vistos` pode ser um ConjuntoTelefones compartilhado entre várias leituras.
+    Retorna (df_unicos, estatisticas).
+    """
+    vistos = vistos if vistos is not None else ConjuntoTelefones()
+    estatisticas = {'linhas_lidas': 0, 'sem_telefone': 0, 'duplicatas_descartadas': 0}
+    partes = []
+
+    leitor = pd.read_csv(
+        file, skiprows=5, encoding='utf-8-sig', usecols=COLUNAS_LIVE, dtype=str, chunksize=chunksize
+    )
+    for chunk in leitor:
+        limpo = padronizar_inscritos_live(chunk, origem)
+        chaves = chaves_telefones(limpo['Telefone'])
+
+        com_telefone = chaves > 0
+        primeira_no_bloco = ~pd.Series(chaves).duplicated().to_numpy()
+        novos = com_telefone & primeira_no_bloco & ~vistos.contem(chaves)
+        vistos.adicionar(chaves[novos])
+
+        estatisticas['linhas_lidas'] += len(limpo)
+        estatisticas['sem_telefone'] += int((~com_telefone).sum())
+        estatisticas['duplicatas_descartadas'] += int((com_telefone & ~novos).sum())
+        partes.append(limpo[novos])
+
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_LEADS), estatisticas
+    return pd.concat(partes, ignore_index=True), estatisticas
+
+
+# Motor de leitura do Excel: calamine (Rust) quando instalado, senão o padrão do pandas (openpyxl)
+try:
+    import python_calamine  # noqa: F401
+    MOTOR_EXCEL = 'calamine'
+except ImportError:
+    MOTOR_EXCEL = None
+
+# Palavras que identificam cada campo no cabeçalho das planilhas
+PISTAS_COLUNAS = {
+    'Nome': ('nome', 'razao', 'empresa'),
+    'Telefone': ('telefone', 'whats', 'contato'),
+    'Email': ('email', 'e-mail'),
+    'CNPJ': ('cnpj',),
+}
+
+
+# Resolve qual coluna da planilha alimenta cada campo; memoizado pela assinatura do cabeçalho
+@lru_cache(maxsize=64)
+def mapear_colunas(cabecalho):
+    mapeamento = {}
+    for campo, pistas in PISTAS_COLUNAS.items():
+        candidatas = [col for col in cabecalho if any(pista in str(col).lower() for pista in pistas)]
+        if candidatas:
+            mapeamento[campo] = candidatas[0]
+    return mapeamento
+
+
+# Lê só a linha de cabeçalho da planilha
+def ler_cabecalho_excel(file):
+    cabecalho = pd.read_excel(file, nrows=0, engine=MOTOR_EXCEL).columns
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    return tuple(cabecalho)
+
+
+# Converte o valor de uma célula como o leitor openpyxl do pandas (vazio = "", float inteiro = int)
+def _converter_celula(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+# Lê só as colunas indicadas da primeira aba com openpyxl, sem converter as demais células
+def _ler_colunas_openpyxl(file, cabecalho, colunas):
+    posicoes = [cabecalho.index(coluna) for coluna in colunas]
+    livro = load_workbook(file, read_only=True, data_only=True)
+    try:
+        planilha = livro.worksheets[0]
+        # A dimensão gravada no arquivo pode estar errada (planilhas geradas por outros programas) e cortar linhas
+        planilha.reset_dimensions()
+        linhas = planilha.iter_rows(min_row=2, values_only=True)
+        dados = [
+            [_converter_celula(linha[i] if i < len(linha) else None) for i in posicoes]
+            for linha in linhas
+        ]
+    finally:
+        livro.close()
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+    # Linhas vazias no fim da planilha não contam, como no read_excel
+    while dados and all(valor == '' for valor in dados[-1]):
+        dados.pop()
+    return TextParser([list(colunas)] + dados, header=0).read()
+
+
+# Função para ler arquivos Excel
+def ler_excel(file, origem):
+    """
+    Lê primeiro só o cabeçalho, resolve o mapeamento de colunas e depois
+    carrega apenas as colunas usadas. Planilhas com o mesmo layout reaproveitam
+    o mapeamento já resolvido.
+    """
+    cabecalho = ler_cabecalho_excel(file)
+    mapeamento = mapear_colunas(cabecalho)
+    colunas_usadas = list(dict.fromkeys(mapeamento.values()))
+    if not colunas_usadas:
+        df = pd.DataFrame()
+    elif MOTOR_EXCEL is not None:
+        df = pd.read_excel(file, usecols=colunas_usadas, engine=MOTOR_EXCEL)
+    else:
+        df = _ler_colunas_openpyxl(file, cabecalho, colunas_usadas)
+
+    df_clean = pd.DataFrame(index=df.index)
+    df_clean['Nome'] = df[mapeamento['Nome']] if 'Nome' in mapeamento else ''
+    df_clean['Email'] = df[mapeamento['Email']] if 'Email' in mapeamento else ''
+    df_clean['Telefone'] = canonicalizar_telefones(df[mapeamento['Telefone']]) if 'Telefone' in mapeamento else ''
+    df_clean['Empresa'] = df[mapeamento['Nome']] if 'Nome' in mapeamento else ''
+    df_clean['CNPJ'] = df[mapeamento['CNPJ']] if 'CNPJ' in mapeamento else ''
+    df_clean['Origem'] = origem
+
+    return df_clean
@@ -0,0 +1,131 @@
+"""
+📊 Vazão, previsão de término e métricas ao vivo dos disparos
+
+A previsão usa uma média móvel exponencial (EWMA) da duração real de cada
+contato, já somada ao intervalo entre mensagens, então acompanha a
+velocidade do disparo em vez de um valor fixo. As mesmas métricas (enviados,
+falhas, vazão, ETA) são gravadas num arquivo JSON e, opcionalmente, servidas
+por HTTP local para um painel acompanhar a campanha.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ALFA_EWMA = 0.2  # peso do contato mais recente na média
+CAMINHO_METRICAS_PADRAO = 'metricas_envio.json'
+SEGUNDOS_EXTRAS_INICIAIS = 5  # chute de duração de um contato (sem o intervalo) antes da primeira medida
+
+
+class EstimadorVazao:
+    """
+    Média móvel exponencial dos segundos por contato (trabalho + intervalo).
+    """
+
+    def __init__(self, segundos_iniciais, alfa=ALFA_EWMA):
+        self.alfa = alfa
+        self.segundos_por_contato = float(segundos_iniciais)
+        self.medidas = 0
+
+    def registrar(self, segundos):
+        if self.medidas == 0:
+            self.segundos_por_contato = float(segundos)
+        else:
+            self.segundos_por_contato += self.alfa * (segundos - self.segundos_por_contato)
+        self.medidas += 1
+
+    @property
+    def por_hora(self):
+        return 3600 / self.segundos_por_contato if self.segundos_por_contato > 0 else 0.0
+
+    def eta(self, restantes):
+        return restantes * self.segundos_por_contato
+
+
+class MetricasCampanha:
+    """
+    Estado atual da campanha, gravado em JSON (troca atômica do arquivo) a
+    cada atualização e servido em /metrics (texto Prometheus) e /metrics.json
+    quando há uma porta configurada.
+    """
+
+    def __init__(self, total, caminho=CAMINHO_METRICAS_PADRAO, porta=None):
+        self.caminho = caminho
+        self.trava = threading.Lock()
+        self.dados = {
+            'inicio': datetime.now().isoformat(timespec='seconds'),
+            'atualizado_em': datetime.now().isoformat(timespec='seconds'),
+            'total': total,
+            'enviados': 0,
+            'falhas': 0,
+            'invalidos': 0,
+            'restantes': total,
+            'contatos_por_hora': 0.0,
+            'eta_segundos': None,
+            'termino_previsto': None,
+        }
+        self.servidor = self._iniciar_servidor(porta) if porta else None
+        self._salvar()
+
+    def atualizar(self, **valores):
+        with self.trava:
+            self.dados.update(valores)
+            self.dados['atualizado_em'] = datetime.now().isoformat(timespec='seconds')
+        self._salvar()
+
+    def _salvar(self):
+        if not self.caminho:
+            return
+        temporario = f'{self.caminho}.tmp'
+        with self.trava, open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.dados, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
+
+    def texto_prometheus(self):
+        with self.trava:
+            dados = dict(self.dados)
+        linhas = []
+        for chave in ['total', 'enviados', 'falhas', 'invalidos', 'restantes', 'contatos_por_hora', 'eta_segundos']:
+            if dados[chave] is not None:
+                linhas.append(f"disparador_{chave} {dados[chave]}")
+        return '\n'.join(linhas) + '\n'
+
+    def _iniciar_servidor(self, porta):
+        metricas = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics.json':
+                    with metricas.trava:
+                        corpo = json.dumps(metricas.dados, ensure_ascii=False).encode('utf-8')
+                    tipo = 'application/json'
+                elif self.path == '/metrics':
+                    corpo = metricas.texto_prometheus().encode('utf-8')
+                    tipo = 'text/plain; version=0.0.4'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', tipo)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        servidor = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        return servidor
+
+    def fechar(self):
+        if self.servidor is not None:
+            self.servidor.shutdown()
+            self.servidor.server_close()
+
+
+def formatar_duracao(segundos):
+    minutos = segundos / 60
+    return f"{minutos / 60:.1f}h" if minutos >= 90 else f"{minutos:.0f}min"
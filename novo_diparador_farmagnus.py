@@ -2,26 +2,87 @@
 🚀 ENVIO PARA TODOS OS 27 LEADS - SEM LIMITES!
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import argparse
+
+from selenium.common.exceptions import TimeoutException
 import pandas as pd
 import time
-import urllib.parse
 from datetime import datetime
 
+from agendador import (
+    CAMINHO_FILA_PADRAO, JANELAS_PADRAO, FilaCampanha, JanelasEnvio, esperar_ate, ler_pesos_origem, pontuar_leads,
+    prever_termino
+)
+from diario_envios import (
+    CAMINHO_DIARIO_PADRAO, ESTADO_ENVIADO, ESTADO_FALHA, ESTADO_TENTANDO, DiarioEnvios, status_ja_enviado
+)
+from metricas_envio import (
+    CAMINHO_METRICAS_PADRAO, SEGUNDOS_EXTRAS_INICIAIS, EstimadorVazao, MetricasCampanha, formatar_duracao
+)
+from supressao import CAMINHO_SUPRESSAO_PADRAO, ListaSupressao, abrir_supressao
+from telefones import validar_telefones
+from whatsapp_web import (
+    MODO_APP, MODO_URL, PASTA_PERFIL_PADRAO, URL_WHATSAPP, NavegadorConversas, NumeroInvalido, enviar_mensagem_aberta,
+    formatar_tempos, iniciar_whatsapp
+)
+
+ARQUIVO_QUARENTENA = 'quarentena_telefones.csv'
+
+parser = argparse.ArgumentParser(description="Dispara a mensagem pelo WhatsApp Web para os leads do CSV")
+parser.add_argument('--leads', default='Farmagnus.csv',
+                    help="CSV com os leads (ex.: leads_para_whatsapp.csv do processar_leads.py, que traz as origens)")
+parser.add_argument('--perfil', default=PASTA_PERFIL_PADRAO,
+                    help=f"pasta do perfil do Chrome onde a sessão do WhatsApp fica salva (padrão: {PASTA_PERFIL_PADRAO})")
+parser.add_argument('--chromedriver', metavar='CAMINHO',
+                    help="chromedriver a usar; sem isso, o primeiro download do webdriver_manager fica salvo em cache")
+parser.add_argument('--diario', default=CAMINHO_DIARIO_PADRAO,
+                    help=f"arquivo JSONL onde cada envio é registrado (padrão: {CAMINHO_DIARIO_PADRAO})")
+parser.add_argument('--resume', action='store_true',
+                    help="retoma um disparo interrompido, pulando os contatos já confirmados no diário")
+parser.add_argument('--navegacao', choices=[MODO_APP, MODO_URL], default=MODO_APP,
+                    help="app: abre cada conversa pela pesquisa de nova conversa, sem recarregar o WhatsApp Web "
+                         "(cai para a URL se falhar); url: recarrega a página /send a cada contato")
+parser.add_argument('--incluir-fixos', action='store_true',
+                    help="também envia para telefones fixos (10 dígitos), que normalmente não têm WhatsApp")
+parser.add_argument('--quarentena', default=ARQUIVO_QUARENTENA,
+                    help=f"CSV onde ficam os telefones barrados na validação (padrão: {ARQUIVO_QUARENTENA})")
+parser.add_argument('--metricas', default=CAMINHO_METRICAS_PADRAO,
+                    help=f"arquivo JSON com o progresso ao vivo da campanha (padrão: {CAMINHO_METRICAS_PADRAO})")
+parser.add_argument('--porta-metricas', type=int, metavar='PORTA',
+                    help="também serve as métricas em http://127.0.0.1:PORTA/metrics (Prometheus) e /metrics.json")
+parser.add_argument('--url-whatsapp', default=URL_WHATSAPP,
+                    help="endereço do WhatsApp Web (ex.: o servidor_whatsapp_falso.py local para testes)")
+parser.add_argument('--headless', action='store_true', help="abre o Chrome sem janela")
+parser.add_argument('--supressao', default=CAMINHO_SUPRESSAO_PADRAO,
+                    help="lista de supressão (opt-out, clientes, já contatados) gerenciada com supressao.py")
+parser.add_argument('--fila', nargs='?', const=CAMINHO_FILA_PADRAO, metavar='ARQUIVO_JSON',
+                    help=f"guarda a fila da campanha para continuar em outro dia (padrão: {CAMINHO_FILA_PADRAO}); "
+                         "rodar de novo só acrescenta os leads novos")
+parser.add_argument('--janela', action='append', metavar='"DIAS HH:MM-HH:MM"',
+                    help=f"janela de envio, ex.: \"seg-sex 09:00-12:00\"; repita para várias "
+                         f"(padrão: {', '.join(JANELAS_PADRAO)})")
+parser.add_argument('--sem-janela', action='store_true', help="envia a qualquer hora")
+parser.add_argument('--peso-origem', action='append', metavar='ORIGEM=PESO',
+                    help="peso de uma fonte na prioridade (quem está em mais fontes vem sempre antes)")
+args = parser.parse_args()
+
+try:
+    pesos_origem = ler_pesos_origem(args.peso_origem)
+    janelas = None if args.sem_janela else JanelasEnvio(args.janela or JANELAS_PADRAO)
+except ValueError as e:
+    parser.error(str(e))
+
 print("🚀 DISPARADOR - ENVIANDO PARA TODOS OS LEADS!")
 print()
 
 # Carregar TODOS os leads
-df = pd.read_csv('Farmagnus.csv', dtype={'Telefone': str})  # ✅ FORÇAR TELEFONE COMO STRING
+df = pd.read_csv(args.leads, dtype={'Telefone': str})  # ✅ FORÇAR TELEFONE COMO STRING
 print(f"📋 Total de leads carregados: {len(df)}")
 print()
 
+# Intervalo entre mensagens (ritmo de envio), separado das esperas da página
+INTERVALO_ENVIO = 30  # segundos
+
 # Mensagem
 mensagem_template = """Olá {nome}, tudo bem?
 
@@ -39,25 +100,91 @@ Somos a melhor consultoria de E-commerce farmacêutico do Brasil, especializados
 Que tal começar o ano com uma estratégia profissional para crescer no digital?
 Podemos marcar um bate papo semana que vem . Qual horário fica melhor?"""
 
-# Preparar contatos
+# Validação antes de abrir o navegador: telefone em E.164, DDD existente e regra de celular (9 dígitos)
+df['Telefone_E164'], df['Motivo_Invalido'] = validar_telefones(df['Telefone'], aceitar_fixos=args.incluir_fixos)
+quarentena = df[df['Motivo_Invalido'] != '']
+
+print("🛫 PRÉ-VALIDAÇÃO DOS TELEFONES:")
+print(f"   ✅ Aptos para envio: {len(df) - len(quarentena)}")
+for motivo, quantidade in quarentena['Motivo_Invalido'].value_counts().items():
+    print(f"   ⛔ {motivo}: {quantidade}")
+if len(quarentena) > 0:
+    quarentena.drop(columns=['Telefone_E164']).to_csv(args.quarentena, index=False, encoding='utf-8-sig')
+    print(f"   📄 Barrados salvos em {args.quarentena}: {', '.join(quarentena['Nome'].astype(str))}")
+print()
+
+df = df[df['Motivo_Invalido'] == '']
+
+# Leads que a planilha já marca como contatados ("Menssagem enviada")
+if 'Status' in df.columns:
+    ja_contatados = status_ja_enviado(df['Status'])
+    if ja_contatados.any():
+        print(f"⏭️ {ja_contatados.sum()} leads com Status de mensagem já enviada na planilha, pulando")
+        print()
+        df = df[~ja_contatados]
+
+# Lista de supressão: todos os telefones conferidos de uma vez, antes de montar os contatos
+lista_supressao = ListaSupressao(abrir_supressao(args.supressao))
+motivos_supressao = lista_supressao.motivos(df['Telefone_E164'])
+suprimidos = motivos_supressao != ''
+if suprimidos.any():
+    print(f"🚫 {suprimidos.sum()} leads na lista de supressão ({args.supressao}), pulando:")
+    for motivo, quantidade in pd.Series(motivos_supressao[suprimidos]).value_counts().items():
+        print(f"   {motivo}: {quantidade}")
+    print()
+    df = df[~suprimidos]
+
+# Prioridade: quem aparece em mais fontes primeiro, depois o peso da fonte e a recência do cadastro
+df = df.assign(Prioridade=pontuar_leads(df, pesos_origem)).sort_values('Prioridade', ascending=False, kind='stable')
+
 contatos = []
-for _, row in df.iterrows():
+for row in df.to_dict('records'):
     nome_completo = str(row['Nome']).strip()
     primeiro_nome = nome_completo.split()[0] if nome_completo else 'Cliente'
-    telefone_sem_55 = str(row['Telefone']).strip()
-    
-    # ✅ AGORA ADICIONA O +55 CORRETAMENTE (telefone já está sem o 55)
-    telefone = f"+55{telefone_sem_55}"
+    telefone = row['Telefone_E164']
     
     contatos.append({
         'nome': primeiro_nome,
         'nome_completo': nome_completo,
-        'telefone': telefone
+        'telefone': telefone,
+        'prioridade': float(row['Prioridade'])
     })
 
+# Fila persistente: contatos já concluídos em execuções anteriores não voltam, os pendentes seguem a prioridade
+fila = None
+if args.fila:
+    fila = FilaCampanha(args.fila)
+    novos = fila.adicionar(contatos)
+    # A supressão vale também para quem já estava na fila (ex.: opt-out recebido depois de montada)
+    pendentes = fila.em_ordem()
+    na_supressao = lista_supressao.suprimidos([c['telefone'] for c in pendentes])
+    contatos = [c for c, suprimido in zip(pendentes, na_supressao) if not suprimido]
+    print(f"📥 Fila {args.fila}: {novos} contatos novos, {len(contatos)} pendentes, {len(fila.concluidos)} já concluídos")
+    print()
+
+# Diário de envios: com --resume, quem já está confirmado nele não recebe de novo
+diario = DiarioEnvios(args.diario)
+ja_no_diario = [c for c in contatos if diario.ja_enviado(c['telefone'])]
+if args.resume:
+    contatos = [c for c in contatos if not diario.ja_enviado(c['telefone'])]
+    print(f"🔁 Retomando: {len(ja_no_diario)} contatos já confirmados em {args.diario} foram pulados")
+    interrompidos = diario.interrompidos()
+    if interrompidos:
+        print(f"⚠️ {len(interrompidos)} envios foram interrompidos no meio e serão tentados de novo: {', '.join(interrompidos)}")
+    print()
+elif ja_no_diario:
+    print(f"⚠️ {len(ja_no_diario)} destes contatos já constam como enviados em {args.diario} (use --resume para pular)")
+    print()
+
+# Previsão de término: começa com intervalo + um chute e passa a seguir a vazão real (EWMA)
+estimador = EstimadorVazao(INTERVALO_ENVIO + SEGUNDOS_EXTRAS_INICIAIS)
+
 print(f"✅ {len(contatos)} contatos preparados para envio")
 print()
-print("⏱️ Tempo estimado: ~35 minutos")
+print(f"⏱️ Tempo estimado: ~{formatar_duracao(estimador.eta(len(contatos)))}")
+if janelas is not None:
+    print(f"🕘 Janelas de envio: {', '.join(args.janela or JANELAS_PADRAO)}")
+print(f"🏁 Término previsto: {prever_termino(janelas, estimador.eta(len(contatos))):%d/%m %H:%M}")
 print()
 
 resposta = input(f"🔴 CONFIRMA envio para TODOS os {len(contatos)} leads? (digite SIM): ").upper()
@@ -69,28 +196,19 @@ print()
 print("✅ Confirmado! Iniciando...")
 print()
 
-# Iniciar Chrome
-print("🌐 Abrindo Chrome...")
-options = webdriver.ChromeOptions()
-options.add_argument("--start-maximized")
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-# WhatsApp Web
-print("📱 Abrindo WhatsApp Web...")
-driver.get("https://web.whatsapp.com")
-print()
-print("⚠️ ESCANEIE O QR CODE!")
+# Iniciar Chrome + WhatsApp Web (perfil persistente: com a sessão salva não precisa de QR code)
+print("🌐 Abrindo Chrome e WhatsApp Web...")
+print("⚠️ Se aparecer o QR CODE, escaneie!")
 print()
 
 try:
-    WebDriverWait(driver, 120).until(
-        EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="3"]'))
+    driver, tempos_inicio = iniciar_whatsapp(
+        args.perfil, args.chromedriver, url_base=args.url_whatsapp, headless=args.headless
     )
     print("✅ Logado!")
-    time.sleep(3)
-except:
+    print(f"⏱️ Inicialização: {formatar_tempos(tempos_inicio)}")
+except TimeoutException:
     print("❌ Timeout!")
-    driver.quit()
     exit()
 
 # ENVIAR PARA TODOS
@@ -101,48 +219,103 @@ print()
 
 sucesso = 0
 falha = 0
+invalidos = 0
 inicio = datetime.now()
+navegador = NavegadorConversas(driver, args.navegacao, url_base=args.url_whatsapp)
+metricas = MetricasCampanha(len(contatos), args.metricas, args.porta_metricas)
+if args.porta_metricas:
+    print(f"📊 Métricas ao vivo em http://127.0.0.1:{args.porta_metricas}/metrics")
+    print()
 
 for i, c in enumerate(contatos, 1):
+    # Fora da janela de envio: espera a próxima abertura (Ctrl+C pausa; com --fila, continue outro dia)
+    if janelas is not None and not janelas.aberta(datetime.now()):
+        abertura = janelas.proxima_abertura(datetime.now())
+        print(f"🌙 Fora da janela de envio, aguardando até {abertura:%d/%m %H:%M}...")
+        try:
+            esperar_ate(abertura)
+        except KeyboardInterrupt:
+            print(f"\n⚠️ PAUSADO antes do lead #{i}")
+            break
+    
+    etapas = {}
+    inicio_contato = time.monotonic()
+    # O intervalo entre mensagens só vale quando uma mensagem pode ter saído (houve clique em enviar)
+    pausar = False
     try:
         percentual = (i / len(contatos)) * 100
         print(f"[{i}/{len(contatos)} - {percentual:.0f}%] 📤 {c['nome_completo']}")
         print(f"   📱 Telefone: {c['telefone']}")  # ✅ MOSTRAR TELEFONE PARA DEBUG
         
         mensagem = mensagem_template.replace('{nome}', c['nome'])
-        tel = c['telefone'].replace('+', '').replace('-', '').replace(' ', '')
-        msg_enc = urllib.parse.quote(mensagem)
-        url = f"https://web.whatsapp.com/send?phone={tel}&text={msg_enc}"
         
-        driver.get(url)
+        diario.registrar(c['telefone'], ESTADO_TENTANDO)
+        etapas = {'navegar': time.monotonic()}
+        caixa, modo_navegacao, tempo_navegacao = navegador.abrir(c['telefone'], mensagem)
+        etapas['conversa_pronta'] = time.monotonic()
+        print(f"   🧭 Conversa aberta via {modo_navegacao} em {tempo_navegacao:.1f}s")
         
-        caixa = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"][@data-tab="10"]'))
-        )
+        # Esperas por condição: botão de enviar habilitado e balão com tique
+        status = enviar_mensagem_aberta(driver, caixa, etapas=etapas)
         
-        time.sleep(2)
-        caixa.click()
-        time.sleep(1)
-        caixa.send_keys(Keys.ENTER)
-        time.sleep(3)
-        
-        print(f"   ✅ ENVIADO!")
+        diario.registrar(c['telefone'], ESTADO_ENVIADO, status=status, navegacao=modo_navegacao, etapas=etapas)
+        print(f"   ✅ ENVIADO! ({status})")
         sucesso += 1
-        
-        if i < len(contatos):
-            tempo_decorrido = (datetime.now() - inicio).total_seconds() / 60
-            tempo_restante = ((len(contatos) - i) * 30) / 60
-            print(f"   ⏱️ {tempo_decorrido:.0f}min | Faltam: {tempo_restante:.0f}min")
-            print()
-            time.sleep(30)
+        pausar = True
+        if fila is not None:
+            fila.concluir(c['telefone'], ESTADO_ENVIADO)
         
     except KeyboardInterrupt:
         print(f"\n⚠️ PAUSADO no lead #{i}")
         break
+    except NumeroInvalido as e:
+        # Nada foi enviado: segue direto para o próximo, sem o intervalo entre mensagens
+        print(f"   📵 Número sem WhatsApp/inválido: {str(e)}")
+        etapas['falha'] = time.monotonic()
+        diario.registrar(c['telefone'], ESTADO_FALHA, motivo=e.motivo, classe_erro=type(e).__name__,
+                         erro=str(e), etapas=etapas)
+        falha += 1
+        invalidos += 1
+        if fila is not None:
+            fila.concluir(c['telefone'], ESTADO_FALHA)
     except Exception as e:
-        print(f"   ❌ Erro: {str(e)}")
+        # Sem clique em enviar (ex.: a caixa de mensagem não apareceu a tempo), nada foi enviado: sem intervalo
+        pausar = 'submetido' in etapas
+        if isinstance(e, TimeoutException) and 'conversa_pronta' not in etapas:
+            motivo = 'conversa_nao_abriu'
+        else:
+            motivo = 'erro' if pausar else 'nao_enviado'
+        print(f"   ❌ Erro{'' if pausar else ' (nada enviado)'}: {str(e)}")
+        etapas['falha'] = time.monotonic()
+        diario.registrar(c['telefone'], ESTADO_FALHA, motivo=motivo, classe_erro=type(e).__name__,
+                         erro=str(e), etapas=etapas)
         falha += 1
-        time.sleep(30)
+    
+    # Duração real do contato (+ intervalo, se houver) alimenta a previsão e as métricas
+    restantes = len(contatos) - i
+    pausar = pausar and restantes > 0
+    estimador.registrar(time.monotonic() - inicio_contato + (INTERVALO_ENVIO if pausar else 0))
+    termino = prever_termino(janelas, estimador.eta(restantes))
+    metricas.atualizar(
+        enviados=sucesso, falhas=falha, invalidos=invalidos, restantes=restantes,
+        contatos_por_hora=round(estimador.por_hora, 1), eta_segundos=round(estimador.eta(restantes)),
+        termino_previsto=termino.isoformat(timespec='minutes'),
+    )
+    
+    if restantes > 0:
+        tempo_decorrido = (datetime.now() - inicio).total_seconds()
+        print(f"   ⏱️ {formatar_duracao(tempo_decorrido)} | Faltam: ~{formatar_duracao(estimador.eta(restantes))} "
+              f"({estimador.por_hora:.0f} contatos/h, término previsto {termino:%d/%m %H:%M})")
+        print()
+        if pausar:
+            try:
+                time.sleep(INTERVALO_ENVIO)
+            except KeyboardInterrupt:
+                print(f"\n⚠️ PAUSADO depois do lead #{i}")
+                break
+
+diario.fechar()
+metricas.fechar()
 
 # Resumo
 tempo_total = (datetime.now() - inicio).total_seconds() / 60
@@ -152,8 +325,9 @@ print("✅ FINALIZADO!")
 print("=" * 70)
 print(f"Total: {sucesso + falha}/{len(contatos)}")
 print(f"✅ Sucessos: {sucesso}")
-print(f"❌ Falhas: {falha}")
+print(f"❌ Falhas: {falha} ({invalidos} números inválidos)")
 print(f"⏱️ Tempo: {tempo_total:.0f} minutos")
+print(f"🧭 Navegação: {navegador.resumo()}")
 print()
 
 input("Pressione ENTER para fechar...")
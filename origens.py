@@ -0,0 +1,78 @@
+"""
+🏷️ Origens dos leads como máscara de bits
+
+Cada origem ocupa um bit, então "em quais fontes este lead aparece" é um
+inteiro por lead, calculado com uma redução vetorizada (OR por lead_id) em vez
+de juntar strings grupo a grupo. Filtros e contagens de múltiplas origens
+viram operações inteiras; o texto "Origem A, Origem B" só é montado na hora
+de exportar ou mostrar.
+
+Os bits valem para uma consolidação: a origem i (na ordem alfabética das
+origens presentes nos registros) é o bit i. A lista de nomes viaja junto das
+máscaras, em `df.attrs['origens']` do DataFrame que tem Mascara_Origens.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_ORIGENS = 63  # bits disponíveis num int64 sem usar o sinal
+
+
+# Origens de uma consolidação na ordem dos bits (alfabética)
+def nomes_origens(serie):
+    nomes = sorted(pd.unique(serie.fillna('').astype(str)))
+    if len(nomes) > MAX_ORIGENS:
+        raise ValueError(f"Mais de {MAX_ORIGENS} origens diferentes não cabem na máscara")
+    return nomes
+
+
+# Bit de cada registro a partir do nome da origem (0 para origens fora da lista)
+def bits_origens(serie, origens):
+    posicao = pd.Index(origens, dtype=object).get_indexer(serie.fillna('').astype(str))
+    return np.where(posicao >= 0, np.left_shift(1, np.maximum(posicao, 0), dtype=np.int64), 0)
+
+
+# OR das origens de cada lead: devolve (lead_ids, máscaras)
+def mascara_por_lead(lead_id, origem, origens):
+    codigos, lead_ids = pd.factorize(np.asarray(lead_id))
+    mascaras = np.zeros(len(lead_ids), dtype=np.int64)
+    np.bitwise_or.at(mascaras, codigos, bits_origens(origem, origens))
+    return lead_ids, mascaras
+
+
+# Quantas origens cada máscara tem
+def contar_origens(mascaras):
+    restante = np.array(mascaras, dtype=np.int64)
+    quantidade = np.zeros(len(restante), dtype=np.int64)
+    while restante.any():
+        quantidade += restante & 1
+        restante >>= 1
+    return quantidade
+
+
+# Texto legível das origens (ordem alfabética), montado uma vez por máscara distinta
+def rotular_origens(mascaras, origens, separador=', '):
+    codigos, distintas = pd.factorize(np.asarray(mascaras, dtype=np.int64))
+    rotulos = np.array(
+        [separador.join(nome for bit, nome in enumerate(origens) if (mascara >> bit) & 1) for mascara in distintas],
+        dtype=object,
+    )
+    return rotulos[codigos] if len(distintas) > 0 else np.empty(0, dtype=object)
+
+
+# Acrescenta Mascara_Origens e Qtd_Origens à lista única, a partir de todos os registros
+def adicionar_origens(df_unico, df_todos):
+    origens = nomes_origens(df_todos['Origem'])
+    lead_ids, mascaras = mascara_por_lead(df_todos['lead_id'], df_todos['Origem'], origens)
+    df_unico = df_unico.copy()
+    df_unico['Mascara_Origens'] = mascaras[pd.Index(lead_ids).get_indexer(df_unico['lead_id'])]
+    df_unico['Qtd_Origens'] = contar_origens(df_unico['Mascara_Origens'])
+    df_unico.attrs['origens'] = origens
+    return df_unico
+
+
+# Versão para exportar/mostrar: troca a máscara pela coluna Todas_Origens em texto
+def com_todas_origens(df):
+    df_export = df.drop(columns=['Mascara_Origens', 'Qtd_Origens'])
+    df_export['Todas_Origens'] = rotular_origens(df['Mascara_Origens'], df.attrs['origens'])
+    return df_export
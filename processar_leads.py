@@ -1,13 +1,36 @@
+import argparse
+import os
+from pathlib import Path
+
 import pandas as pd
-import re
 
-# Função para limpar números de telefone
-def limpar_telefone(telefone):
-    if pd.isna(telefone):
-        return ""
-    telefone_str = str(telefone)
-    numeros = re.sub(r'\D', '', telefone_str)
-    return numeros
+from base_leads import abrir_base, fonte_ja_importada, hash_arquivo, importar_fonte, ler_consolidado, ler_registros
+from identidade import resolver_identidades
+from fontes import ARQUIVOS_PADRAO, descompactar, ler_fontes, origem_do_arquivo
+from ingestao import TAMANHO_CHUNK
+from exportacao import PARQUET_DISPONIVEL, escrever_csv, escrever_csv_whatsapp, escrever_parquet, escrever_xlsx
+from origens import adicionar_origens, contar_origens, mascara_por_lead, nomes_origens, rotular_origens
+from supressao import CAMINHO_SUPRESSAO_PADRAO, ListaSupressao, abrir_supressao
+
+parser = argparse.ArgumentParser(description="Consolida e deduplica as listas de leads")
+parser.add_argument('--streaming', action='store_true',
+                    help="lê o CSV da Live em blocos, descartando telefones repetidos durante a leitura")
+parser.add_argument('--chunksize', type=int, default=TAMANHO_CHUNK,
+                    help=f"linhas por bloco no modo streaming (padrão: {TAMANHO_CHUNK})")
+parser.add_argument('--fonte', action='append', metavar='[ORIGEM=]ARQUIVO',
+                    help="fonte a processar (CSV da Live ou XLSX); repita para várias. Sem ORIGEM, o nome vem do "
+                         "arquivo. Padrão: as três fontes em /mnt/user-data/uploads")
+parser.add_argument('--processos', type=int, default=None,
+                    help="processos para ler as fontes em paralelo (padrão: um por fonte, até o número de CPUs)")
+parser.add_argument('--base', metavar='ARQUIVO_DB',
+                    help="mescla as fontes numa base SQLite persistente (ex.: leads.db) e consolida a partir dela")
+parser.add_argument('--formato', nargs='+', choices=['xlsx', 'csv', 'parquet'], default=['xlsx'],
+                    help="formatos das listas geradas (padrão: xlsx); o CSV para WhatsApp é sempre gerado")
+parser.add_argument('--planilha-unica', action='store_true',
+                    help="no formato xlsx, grava as listas como abas de um único arquivo leads_consolidacao.xlsx")
+parser.add_argument('--supressao', default=CAMINHO_SUPRESSAO_PADRAO,
+                    help="lista de supressão aplicada ao CSV para WhatsApp, se o arquivo existir "
+                         f"(padrão: {CAMINHO_SUPRESSAO_PADRAO})")
 
 # Função para normalizar texto
 def normalizar_texto(texto):
@@ -15,178 +38,192 @@ def normalizar_texto(texto):
         return ""
     return str(texto).strip().lower()
 
-# Ler arquivo CSV da Live
-print("=" * 80)
-print("PROCESSANDO DADOS DOS LEADS")
-print("=" * 80)
-
-# 1. Inscritos na Live
-print("\n1️⃣ Lendo: INSCRITOS NA LIVE")
-df_live = pd.read_csv('/mnt/user-data/uploads/INSCRITOS_NA_LIVE.csv', skiprows=5, encoding='utf-8-sig')
-
-df_live_clean = pd.DataFrame()
-df_live_clean['Nome'] = df_live['Nome'].fillna('') + ' ' + df_live['Sobrenome'].fillna('')
-df_live_clean['Nome'] = df_live_clean['Nome'].str.strip()
-df_live_clean['Email'] = df_live['E-mail']
-df_live_clean['Telefone'] = df_live['Informe o seu WhatsApp'].apply(limpar_telefone)
-df_live_clean['Empresa'] = df_live['Informe a razão social de sua farmácia']
-df_live_clean['CNPJ'] = df_live['Informe o CNPJ de sua farmácia']
-df_live_clean['Origem'] = 'Inscritos na Live'
-
-print(f"   ✅ Total de registros: {len(df_live_clean)}")
-print(f"   📋 Primeiras linhas:")
-print(df_live_clean.head(3).to_string())
-
-# 2. Lojas Interessadas
-print("\n2️⃣ Lendo: LOJAS INTERESSADAS NO ECOMMERCE")
-df_interessadas = pd.read_excel('/mnt/user-data/uploads/LOJAS_INTERESSADAS_NO_ECOMMERCE.xlsx')
-
-df_interessadas_clean = pd.DataFrame()
-colunas = df_interessadas.columns.tolist()
-print(f"   📊 Colunas disponíveis: {colunas}")
-
-# Mapear colunas
-colunas_nome = [col for col in colunas if 'nome' in col.lower() or 'razao' in col.lower() or 'empresa' in col.lower()]
-colunas_telefone = [col for col in colunas if 'telefone' in col.lower() or 'whats' in col.lower() or 'contato' in col.lower()]
-colunas_email = [col for col in colunas if 'email' in col.lower() or 'e-mail' in col.lower()]
-colunas_cnpj = [col for col in colunas if 'cnpj' in col.lower()]
-
-df_interessadas_clean['Nome'] = df_interessadas[colunas_nome[0]] if colunas_nome else ''
-df_interessadas_clean['Email'] = df_interessadas[colunas_email[0]] if colunas_email else ''
-df_interessadas_clean['Telefone'] = df_interessadas[colunas_telefone[0]].apply(limpar_telefone) if colunas_telefone else ''
-df_interessadas_clean['Empresa'] = df_interessadas[colunas_nome[0]] if colunas_nome else ''
-df_interessadas_clean['CNPJ'] = df_interessadas[colunas_cnpj[0]] if colunas_cnpj else ''
-df_interessadas_clean['Origem'] = 'Lojas Interessadas'
-
-print(f"   ✅ Total de registros: {len(df_interessadas_clean)}")
-print(f"   📋 Primeiras linhas:")
-print(df_interessadas_clean.head(3).to_string())
-
-# 3. Lojas com Potencial
-print("\n3️⃣ Lendo: LOJAS QUE TEM POTENCIAL PARA ECOMMERCE")
-df_potencial = pd.read_excel('/mnt/user-data/uploads/LOJAS_QUE_TEM_POTENCIAL_PARA_ECOMMERCE.xlsx')
-
-df_potencial_clean = pd.DataFrame()
-colunas = df_potencial.columns.tolist()
-print(f"   📊 Colunas disponíveis: {colunas}")
-
-colunas_nome = [col for col in colunas if 'nome' in col.lower() or 'razao' in col.lower() or 'empresa' in col.lower()]
-colunas_telefone = [col for col in colunas if 'telefone' in col.lower() or 'whats' in col.lower() or 'contato' in col.lower()]
-colunas_email = [col for col in colunas if 'email' in col.lower() or 'e-mail' in col.lower()]
-colunas_cnpj = [col for col in colunas if 'cnpj' in col.lower()]
-
-df_potencial_clean['Nome'] = df_potencial[colunas_nome[0]] if colunas_nome else ''
-df_potencial_clean['Email'] = df_potencial[colunas_email[0]] if colunas_email else ''
-df_potencial_clean['Telefone'] = df_potencial[colunas_telefone[0]].apply(limpar_telefone) if colunas_telefone else ''
-df_potencial_clean['Empresa'] = df_potencial[colunas_nome[0]] if colunas_nome else ''
-df_potencial_clean['CNPJ'] = df_potencial[colunas_cnpj[0]] if colunas_cnpj else ''
-df_potencial_clean['Origem'] = 'Lojas com Potencial'
-
-print(f"   ✅ Total de registros: {len(df_potencial_clean)}")
-print(f"   📋 Primeiras linhas:")
-print(df_potencial_clean.head(3).to_string())
-
-# Consolidar todos
-print("\n" + "=" * 80)
-print("📊 CONSOLIDAÇÃO E ANÁLISE DE DUPLICATAS")
-print("=" * 80)
-
-df_todos = pd.concat([df_live_clean, df_interessadas_clean, df_potencial_clean], ignore_index=True)
-df_todos = df_todos[df_todos['Telefone'].str.len() > 0]
-
-print(f"\n📌 Total de registros antes da deduplicação: {len(df_todos)}")
-
-# Criar colunas normalizadas
-df_todos['telefone_norm'] = df_todos['Telefone'].apply(normalizar_texto)
-df_todos['email_norm'] = df_todos['Email'].apply(normalizar_texto)
-
-# Identificar duplicatas
-df_todos['duplicata'] = df_todos.duplicated(subset=['telefone_norm'], keep=False)
-
-duplicatas = df_todos[df_todos['duplicata']].copy()
-print(f"🔄 Total de registros duplicados: {len(duplicatas)}")
-
-# Análise de duplicatas entre origens
-if len(duplicatas) > 0:
-    print("\n🔍 ANÁLISE DETALHADA DE DUPLICATAS:")
-    
-    duplicatas_por_tel = duplicatas.groupby('telefone_norm')['Origem'].apply(list).reset_index()
-    duplicatas_por_tel['qtd_origens'] = duplicatas_por_tel['Origem'].apply(len)
-    duplicatas_por_tel['origens_str'] = duplicatas_por_tel['Origem'].apply(lambda x: ', '.join(sorted(set(x))))
+PASTA_UPLOADS = '/mnt/user-data/uploads'
+
+# Fontes padrão (ícone, título, origem, caminho), com as mesmas origens que o app dá a esses arquivos
+FONTES = [
+    (icone, Path(arquivo).stem.replace('_', ' '), origem, f'{PASTA_UPLOADS}/{arquivo}')
+    for icone, (arquivo, origem) in zip(['1️⃣', '2️⃣', '3️⃣'], ARQUIVOS_PADRAO.items())
+]
+
+
+def main():
+    args = parser.parse_args()
+
+    if 'parquet' in args.formato and not PARQUET_DISPONIVEL:
+        parser.error("o formato parquet requer pyarrow ou fastparquet instalados")
+
+    fontes = FONTES
+    if args.fonte:
+        fontes = []
+        for fonte in args.fonte:
+            origem, _, caminho = fonte.rpartition('=')
+            origem = origem or origem_do_arquivo(caminho)
+            fontes.append(('📄', origem.upper(), origem, caminho))
+
+    print("=" * 80)
+    print("PROCESSANDO DADOS DOS LEADS")
+    print("=" * 80)
+
+    conn = abrir_base(args.base) if args.base else None
+    dfs = {}
+
+    # Com a base, arquivos já importados não são lidos de novo
+    a_ler = []
+    hashes = {}
+    for icone, titulo, origem, caminho in fontes:
+        if conn is not None:
+            hashes[caminho] = hash_arquivo(caminho)
+            if fonte_ja_importada(conn, hashes[caminho]):
+                print(f"\n{icone} {titulo}: 💾 arquivo já importado na base, pulando")
+                continue
+        a_ler.append((icone, titulo, origem, caminho))
+
+    # Todas as fontes são lidas ao mesmo tempo, cada uma num processo
+    if a_ler:
+        print(f"\n📚 Lendo {len(a_ler)} fonte(s) em paralelo...")
+    lidas = ler_fontes([(origem, caminho, caminho) for _, _, origem, caminho in a_ler],
+                       streaming=args.streaming, chunksize=args.chunksize, processos=args.processos)
+
+    for (icone, titulo, origem, caminho), (compacta, estatisticas_live) in zip(a_ler, lidas):
+        print(f"\n{icone} Lendo: {titulo}")
+        df_clean = descompactar(compacta)
+        if estatisticas_live:
+            print(f"   🌊 Streaming: {estatisticas_live['linhas_lidas']} linhas lidas, "
+                  f"{estatisticas_live['duplicatas_descartadas']} repetidas e "
+                  f"{estatisticas_live['sem_telefone']} sem telefone descartadas")
     
-    multiplas_origens = duplicatas_por_tel[duplicatas_por_tel['qtd_origens'] > 1]
+        print(f"   ✅ Total de registros: {len(df_clean)}")
+        print(f"   📋 Primeiras linhas:")
+        print(df_clean.head(3).to_string())
     
-    print(f"\n📍 Leads que aparecem em MÚLTIPLAS origens: {len(multiplas_origens)}")
+        if conn is not None:
+            resultado = importar_fonte(conn, df_clean, origem, hashes[caminho], caminho)
+            print(f"   💾 Base: {resultado['novos']} leads novos, {resultado['atualizados']} já existentes")
     
-    if len(multiplas_origens) > 0:
-        print("\n🎯 TOP 10 LEADS MAIS ENGAJADOS (aparecem em mais fontes):")
-        top_engajados = duplicatas[duplicatas['telefone_norm'].isin(multiplas_origens['telefone_norm'])]
-        top_engajados_grouped = top_engajados.groupby('telefone_norm').agg({
-            'Nome': 'first',
-            'Telefone': 'first',
-            'Email': 'first',
-            'Origem': lambda x: ' + '.join(sorted(set(x)))
-        }).reset_index(drop=True)
-        
-        print(top_engajados_grouped.head(10).to_string(index=False))
-
-# Criar lista única
-df_unico = df_todos.drop_duplicates(subset=['telefone_norm'], keep='first')
-
-# Agrupar todas as origens
-origens_por_telefone = df_todos.groupby('telefone_norm')['Origem'].apply(lambda x: ', '.join(sorted(set(x)))).to_dict()
-df_unico['Todas_Origens'] = df_unico['telefone_norm'].map(origens_por_telefone)
-
-# Remover colunas auxiliares
-df_unico = df_unico.drop(columns=['telefone_norm', 'email_norm', 'duplicata'])
-
-print(f"\n✅ Total de leads ÚNICOS após deduplicação: {len(df_unico)}")
-print(f"📊 Taxa de duplicação: {((len(df_todos) - len(df_unico)) / len(df_todos) * 100):.1f}%")
-
-# Distribuição por origem
-print("\n📈 DISTRIBUIÇÃO POR ORIGEM:")
-distribuicao = df_unico['Origem'].value_counts()
-print(distribuicao.to_string())
-
-# Leads em múltiplas origens
-multiplas = df_unico[df_unico['Todas_Origens'].str.contains(',', na=False)]
-print(f"\n🎯 Leads presentes em múltiplas fontes: {len(multiplas)}")
+        # Arquivos diferentes com a mesma origem viram uma fonte só
+        dfs[origem] = pd.concat([dfs[origem], df_clean], ignore_index=True) if origem in dfs else df_clean
 
-# Salvar resultados
-print("\n" + "=" * 80)
-print("💾 SALVANDO ARQUIVOS")
-print("=" * 80)
+    # Consolidar todos
+    print("\n" + "=" * 80)
+    print("📊 CONSOLIDAÇÃO E ANÁLISE DE DUPLICATAS")
+    print("=" * 80)
 
-output_dir = '/mnt/user-data/outputs'
+    if conn is not None:
+        # A base já guarda um registro por telefone e origem, acumulado entre execuções
+        df_todos = ler_registros(conn)
+    else:
+        df_todos = pd.concat(dfs.values(), ignore_index=True)
+        df_todos = df_todos[df_todos['Telefone'].str.len() > 0]
 
-# Lista consolidada
-arquivo_consolidado = f'{output_dir}/leads_consolidados_sem_duplicatas.xlsx'
-df_unico.to_excel(arquivo_consolidado, index=False, sheet_name='Leads Únicos')
-print(f"✅ Lista consolidada salva: leads_consolidados_sem_duplicatas.xlsx")
+    print(f"\n📌 Total de registros antes da deduplicação: {len(df_todos)}")
 
-# Lista para WhatsApp
-df_whatsapp = df_unico[['Nome', 'Telefone', 'Email', 'Todas_Origens']].copy()
-arquivo_whatsapp = f'{output_dir}/leads_para_whatsapp.csv'
-df_whatsapp.to_csv(arquivo_whatsapp, index=False, encoding='utf-8-sig')
-print(f"✅ Lista para WhatsApp salva: leads_para_whatsapp.csv")
+    # Criar colunas normalizadas
+    df_todos['telefone_norm'] = df_todos['Telefone']
+    df_todos['email_norm'] = df_todos['Email'].apply(normalizar_texto)
 
-# Lista completa com duplicatas
-arquivo_completo = f'{output_dir}/leads_completos_com_duplicatas.xlsx'
-df_todos_export = df_todos.drop(columns=['telefone_norm', 'email_norm'])
-df_todos_export.to_excel(arquivo_completo, index=False, sheet_name='Todos os Leads')
-print(f"✅ Lista completa salva: leads_completos_com_duplicatas.xlsx")
+    # Resolver identidade: mesmo telefone, e-mail ou CNPJ = mesmo lead
+    # (com a base, vale o lead_id já gravado, o mesmo que a lista única usa)
+    if conn is None:
+        df_todos['lead_id'] = resolver_identidades(df_todos['Telefone'], df_todos['Email'], df_todos['CNPJ'])
 
-# Relatório de leads em múltiplas origens
-if len(multiplas) > 0:
-    arquivo_multiplas = f'{output_dir}/leads_multiplas_origens.xlsx'
-    multiplas.to_excel(arquivo_multiplas, index=False, sheet_name='Leads Engajados')
-    print(f"✅ Leads em múltiplas origens salvos: leads_multiplas_origens.xlsx")
+    # Identificar duplicatas
+    df_todos['duplicata'] = df_todos.duplicated(subset=['lead_id'], keep=False)
 
-print("\n" + "=" * 80)
-print("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
-print("=" * 80)
+    duplicatas = df_todos[df_todos['duplicata']].copy()
+    print(f"🔄 Total de registros duplicados: {len(duplicatas)}")
 
-print(f"""
+    # Análise de duplicatas entre origens
+    if len(duplicatas) > 0:
+        print("\n🔍 ANÁLISE DETALHADA DE DUPLICATAS:")
+    
+        # Origens de cada lead como máscara de bits
+        origens = nomes_origens(duplicatas['Origem'])
+        lead_ids, mascaras = mascara_por_lead(duplicatas['lead_id'], duplicatas['Origem'], origens)
+        em_multiplas = contar_origens(mascaras) > 1
+    
+        print(f"\n📍 Leads que aparecem em MÚLTIPLAS origens: {int(em_multiplas.sum())}")
+    
+        if em_multiplas.any():
+            print("\n🎯 TOP 10 LEADS MAIS ENGAJADOS (aparecem em mais fontes):")
+            top_engajados = duplicatas[duplicatas['lead_id'].isin(lead_ids[em_multiplas])]
+            top_engajados_grouped = top_engajados.groupby('lead_id')[['Nome', 'Telefone', 'Email']].first().head(10)
+            posicao = pd.Index(lead_ids).get_indexer(top_engajados_grouped.index)
+            top_engajados_grouped['Origem'] = rotular_origens(mascaras[posicao], origens, separador=' + ')
+        
+            print(top_engajados_grouped.to_string(index=False))
+
+    if conn is not None:
+        # Lista única e Todas_Origens já mantidas pela base
+        df_unico = ler_consolidado(conn)
+    else:
+        # Criar lista única (um registro por lead)
+        df_unico = df_todos.drop_duplicates(subset=['lead_id'], keep='first')
+    
+        # Agrupar todas as origens (máscara de bits; o texto só é montado nos arquivos de saída)
+        df_unico = adicionar_origens(df_unico, df_todos)
+    
+        # Remover colunas auxiliares
+        df_unico = df_unico.drop(columns=['telefone_norm', 'email_norm', 'duplicata'])
+
+    print(f"\n✅ Total de leads ÚNICOS após deduplicação: {len(df_unico)}")
+    print(f"📊 Taxa de duplicação: {((len(df_todos) - len(df_unico)) / len(df_todos) * 100):.1f}%")
+
+    # Distribuição por origem
+    print("\n📈 DISTRIBUIÇÃO POR ORIGEM:")
+    distribuicao = df_unico['Origem'].value_counts()
+    print(distribuicao.to_string())
+
+    # Leads em múltiplas origens
+    multiplas = df_unico[df_unico['Qtd_Origens'] > 1]
+    print(f"\n🎯 Leads presentes em múltiplas fontes: {len(multiplas)}")
+
+    # Salvar resultados
+    print("\n" + "=" * 80)
+    print("💾 SALVANDO ARQUIVOS")
+    print("=" * 80)
+
+    output_dir = '/mnt/user-data/outputs'
+
+    # Lista para WhatsApp, sem quem está na lista de supressão
+    df_whatsapp = df_unico
+    if os.path.exists(args.supressao):
+        suprimidos = ListaSupressao(abrir_supressao(args.supressao)).suprimidos(df_unico['Telefone'])
+        df_whatsapp = df_unico[~suprimidos]
+        print(f"🚫 {suprimidos.sum()} leads da lista de supressão ({args.supressao}) ficaram fora da lista para WhatsApp")
+    escrever_csv_whatsapp(f'{output_dir}/leads_para_whatsapp.csv', df_whatsapp)
+    print(f"✅ Lista para WhatsApp salva: leads_para_whatsapp.csv")
+
+    # Listas (arquivo, aba, dados, mensagem); a de múltiplas origens só sai se houver alguém nela
+    df_todos_export = df_todos.drop(columns=['telefone_norm', 'email_norm'])
+    saidas = [
+        ('leads_consolidados_sem_duplicatas', 'Leads Únicos', df_unico, 'Lista consolidada salva'),
+        ('leads_completos_com_duplicatas', 'Todos os Leads', df_todos_export, 'Lista completa salva'),
+    ]
+    if len(multiplas) > 0:
+        saidas.append(('leads_multiplas_origens', 'Leads Engajados', multiplas, 'Leads em múltiplas origens salvos'))
+
+    for formato in args.formato:
+        if formato == 'xlsx' and args.planilha_unica:
+            escrever_xlsx(f'{output_dir}/leads_consolidacao.xlsx', {aba: df for _, aba, df, _ in saidas})
+            print(f"✅ Planilha única salva ({len(saidas)} abas): leads_consolidacao.xlsx")
+            continue
+    
+        for arquivo, aba, df, mensagem in saidas:
+            caminho = f'{output_dir}/{arquivo}.{formato}'
+            if formato == 'xlsx':
+                escrever_xlsx(caminho, {aba: df})
+            elif formato == 'csv':
+                escrever_csv(caminho, df)
+            else:
+                escrever_parquet(caminho, df)
+            print(f"✅ {mensagem}: {arquivo}.{formato}")
+
+    print("\n" + "=" * 80)
+    print("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
+    print("=" * 80)
+
+    print(f"""
 📊 RESUMO FINAL:
    • Total de registros processados: {len(df_todos)}
    • Leads únicos (sem duplicatas): {len(df_unico)}
@@ -198,4 +235,8 @@ print(f"""
    2. Priorize os leads que aparecem em múltiplas fontes
    3. Use a lista consolidada para sua campanha de WhatsApp
    4. Importe os dados para seu CRM
-""")
\ No newline at end of file
+""")
+
+
+if __name__ == '__main__':
+    main()
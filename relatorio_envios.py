@@ -0,0 +1,83 @@
+"""
+📈 Relatório de latência das campanhas a partir dos diários de envio
+
+Lê um ou mais diários (diario_envios.jsonl) e mostra, por etapa de cada
+contato, os percentis p50/p95/p99, a vazão por hora e as falhas por motivo.
+
+Uso: python relatorio_envios.py [diario.jsonl ...]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from diario_envios import CAMINHO_DIARIO_PADRAO, ESTADO_ENVIADO, ESTADO_FALHA, ETAPAS, ler_diario
+
+# Durações medidas entre etapas consecutivas (nome, etapa inicial, etapa final)
+DURACOES = [
+    ('navegacao', 'navegar', 'conversa_pronta'),
+    ('composicao', 'conversa_pronta', 'submetido'),
+    ('confirmacao', 'submetido', 'confirmado'),
+    ('total_envio', ETAPAS[0], ETAPAS[-1]),
+    ('ate_falha', 'navegar', 'falha'),
+]
+PERCENTIS = [50, 95, 99]
+
+parser = argparse.ArgumentParser(description="Percentis por etapa, vazão e falhas das campanhas de WhatsApp")
+parser.add_argument('diarios', nargs='*', default=[CAMINHO_DIARIO_PADRAO],
+                    help=f"diários JSONL dos disparadores (padrão: {CAMINHO_DIARIO_PADRAO})")
+args = parser.parse_args()
+
+# Só os registros finais de cada tentativa (enviado/falha) carregam as etapas
+registros = [
+    registro
+    for caminho in args.diarios
+    for registro in ler_diario(caminho)
+    if registro['estado'] in (ESTADO_ENVIADO, ESTADO_FALHA)
+]
+if not registros:
+    print("📭 Nenhum envio finalizado nos diários informados")
+    raise SystemExit()
+
+df = pd.DataFrame(registros)
+df['momento'] = pd.to_datetime(df['momento'])
+etapas = pd.DataFrame([registro.get('etapas') or {} for registro in registros])
+
+print("=" * 70)
+print("📈 RELATÓRIO DE ENVIOS")
+print("=" * 70)
+enviados = df['estado'] == ESTADO_ENVIADO
+print(f"Tentativas: {len(df)} | ✅ Enviados: {enviados.sum()} | ❌ Falhas: {(~enviados).sum()}")
+
+# Percentis por etapa (em segundos)
+print("\n⏱️ LATÊNCIA POR ETAPA (segundos):")
+linhas = []
+for nome, etapa_inicio, etapa_fim in DURACOES:
+    if etapa_inicio not in etapas or etapa_fim not in etapas:
+        continue
+    duracoes = (etapas[etapa_fim] - etapas[etapa_inicio]).dropna().to_numpy()
+    if len(duracoes) == 0:
+        continue
+    valores = np.percentile(duracoes, PERCENTIS)
+    linhas.append([nome, len(duracoes)] + [round(valor, 2) for valor in valores] + [round(duracoes.max(), 2)])
+print(pd.DataFrame(linhas, columns=['etapa', 'n'] + [f'p{p}' for p in PERCENTIS] + ['max']).to_string(index=False))
+
+if 'navegacao' in df.columns:
+    print("\n🧭 ENVIOS POR CAMINHO DE NAVEGAÇÃO:")
+    print(df.loc[enviados, 'navegacao'].value_counts().to_string())
+
+# Vazão: mensagens confirmadas por hora
+print("\n🚀 VAZÃO (mensagens enviadas por hora):")
+momentos_enviados = df.loc[enviados, 'momento']
+if len(momentos_enviados) > 1:
+    horas = (momentos_enviados.max() - momentos_enviados.min()).total_seconds() / 3600
+    print(f"Média da campanha: {len(momentos_enviados) / max(horas, 1 / 3600):.1f}/h")
+print(momentos_enviados.dt.floor('h').value_counts().sort_index().rename('enviados').to_string())
+
+# Falhas por motivo e classe de erro
+falhas = df[~enviados]
+if len(falhas) > 0:
+    print("\n❌ FALHAS POR MOTIVO:")
+    colunas = [coluna for coluna in ['motivo', 'classe_erro'] if coluna in falhas.columns]
+    print(falhas.groupby(colunas, dropna=False).size().rename('qtd').sort_values(ascending=False).to_string())
@@ -0,0 +1,216 @@
+"""
+🧪 WhatsApp Web falso para testar e medir os disparadores sem celular
+
+Servidor HTTP (só biblioteca padrão) com uma página que imita o que os
+disparadores usam do WhatsApp Web (whatsapp_web.py): a caixa de pesquisa
+data-tab="3" que marca o login, a conversa com a caixa data-tab="10" e o
+botão Enviar, o aviso de número inválido, os balões "message-out" com os
+tiques e o painel "Nova conversa", cuja pesquisa pelo número abre a
+conversa dentro do app. Latências e taxas de falha são configuráveis.
+
+Números cujos dois últimos dígitos ficam abaixo de taxa_invalidos * 100 são
+tratados como inválidos (aviso na URL, "nenhum resultado" na pesquisa), então o resultado é sempre o mesmo para a mesma lista.
+
+Uso: python servidor_whatsapp_falso.py [--porta 8089] [--latencia-conversa 0.5] ...
+Depois: python novo_diparador_farmagnus.py --url-whatsapp http://127.0.0.1:8089
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+PORTA_PADRAO = 8089
+
+CONFIG_PADRAO = {
+    'latencia_login': 0.5,  # segundos até a lista de conversas aparecer
+    'latencia_conversa': 0.3,  # segundos para abrir uma conversa
+    'latencia_pesquisa': 0.2,  # segundos até a pesquisa de nova conversa mostrar o resultado
+    'latencia_envio': 0.1,  # segundos entre clicar em enviar e o balão aparecer (relógio)
+    'latencia_tique': 0.5,  # segundos até o relógio virar um tique
+    'taxa_invalidos': 0.0,  # fração dos números tratados como sem WhatsApp
+    'taxa_falha_envio': 0.0,  # fração dos envios em que o balão nunca aparece
+}
+
+PAGINA = """<!doctype html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>WhatsApp (falso)</title>
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  #app { display: flex; height: 100vh; }
+  #lateral { width: 30%; border-right: 1px solid #ccc; padding: 8px; }
+  #main { flex: 1; display: flex; flex-direction: column; }
+  .mensagens { flex: 1; overflow: auto; padding: 8px; }
+  .message-out { background: #d9fdd3; margin: 4px 0 4px auto; padding: 6px; max-width: 60%; white-space: pre-wrap; }
+  footer { display: flex; border-top: 1px solid #ccc; padding: 8px; }
+  [contenteditable] { flex: 1; min-height: 24px; border: 1px solid #ccc; padding: 4px; }
+  #nova-conversa [role=listitem] { cursor: pointer; padding: 6px; border-bottom: 1px solid #eee; }
+  [role=dialog] { position: fixed; top: 40%; left: 35%; background: #fff; border: 1px solid #999; padding: 16px; }
+</style>
+</head>
+<body>
+<div id="app"></div>
+<script>
+const CONFIG = __CONFIG__;
+const ICONES = {pendente: 'msg-time', enviada: 'msg-check'};
+
+function esperar(segundos) { return new Promise(resolve => setTimeout(resolve, segundos * 1000)); }
+function invalido(numero) {
+  const final = parseInt(numero.slice(-2), 10);
+  return isNaN(final) || final < CONFIG.taxa_invalidos * 100;
+}
+
+function formatarNumero(numero) {
+  return '+' + numero.slice(0, 2) + ' ' + numero.slice(2, 4) + ' ' + numero.slice(4, -4) + '-' + numero.slice(-4);
+}
+
+function mostrarAvisoInvalido() {
+  const dialogo = document.createElement('div');
+  dialogo.setAttribute('role', 'dialog');
+  dialogo.innerHTML = '<div>O número de telefone compartilhado através de url é inválido.</div><button>OK</button>';
+  dialogo.querySelector('button').addEventListener('click', () => dialogo.remove());
+  document.body.appendChild(dialogo);
+}
+
+async function enviar(conversa) {
+  const caixa = conversa.querySelector('[data-tab="10"]');
+  const botao = conversa.querySelector('button');
+  const texto = caixa.innerText;
+  if (!texto.trim()) return;
+  caixa.textContent = '';
+  botao.disabled = true;
+
+  const falhar = Math.random() < CONFIG.taxa_falha_envio;
+  await esperar(CONFIG.latencia_envio);
+  if (falhar) return;
+
+  // Como no WhatsApp Web, o balão fica dentro da linha da mensagem, que tem o data-id
+  const linha = document.createElement('div');
+  linha.setAttribute('role', 'row');
+  linha.dataset.id = 'true_' + conversa.dataset.numero + '_' + Date.now() + '_' + Math.random().toString(16).slice(2);
+  const balao = document.createElement('div');
+  balao.className = 'message-out';
+  balao.textContent = texto;
+  linha.appendChild(balao);
+  const icone = document.createElement('span');
+  icone.dataset.icon = ICONES.pendente;
+  balao.appendChild(icone);
+  conversa.querySelector('.mensagens').appendChild(linha);
+
+  await esperar(CONFIG.latencia_tique);
+  icone.dataset.icon = ICONES.enviada;
+}
+
+async function abrirConversa(numero, texto) {
+  await esperar(CONFIG.latencia_conversa);
+  if (invalido(numero)) { mostrarAvisoInvalido(); return; }
+
+  // A conversa anterior sai do DOM inteira (a caixa antiga fica "stale" para o Selenium)
+  const main = document.getElementById('main');
+  main.innerHTML = '';
+  const conversa = document.createElement('div');
+  conversa.className = 'conversa';
+  conversa.dataset.numero = numero;
+  conversa.innerHTML = '<header><span title="' + formatarNumero(numero) + '">' + formatarNumero(numero) + '</span></header>'
+    + '<div class="mensagens"></div>'
+    + '<footer><div contenteditable="true" data-tab="10"></div>'
+    + '<button aria-label="Enviar" disabled><span data-icon="send">➤</span></button></footer>';
+  main.appendChild(conversa);
+
+  const caixa = conversa.querySelector('[data-tab="10"]');
+  const botao = conversa.querySelector('button');
+  const atualizarBotao = () => { botao.disabled = caixa.innerText.trim() === ''; };
+  caixa.textContent = texto;
+  caixa.addEventListener('input', atualizarBotao);
+  caixa.addEventListener('keydown', evento => {
+    if (evento.key === 'Enter' && !evento.shiftKey) { evento.preventDefault(); enviar(conversa); }
+  });
+  botao.addEventListener('click', () => enviar(conversa));
+  atualizarBotao();
+}
+
+// Painel "Nova conversa": pesquisa pelo número; clicar no resultado abre a conversa sem recarregar a página
+function abrirNovaConversa() {
+  const painel = document.getElementById('nova-conversa');
+  painel.innerHTML = '<div contenteditable="true" data-tab="3"></div><div class="resultados"></div>';
+  const pesquisa = painel.querySelector('[contenteditable]');
+  const resultados = painel.querySelector('.resultados');
+  let versao = 0;
+  pesquisa.addEventListener('input', async () => {
+    const numero = pesquisa.innerText.replace(/\\D/g, '');
+    const atual = ++versao;
+    resultados.innerHTML = '';
+    await esperar(CONFIG.latencia_pesquisa);
+    if (atual !== versao) return;
+    if (numero.length < 10 || invalido(numero)) {
+      resultados.innerHTML = '<div>Nenhum resultado encontrado</div>';
+      return;
+    }
+    const item = document.createElement('div');
+    item.setAttribute('role', 'listitem');
+    item.innerHTML = '<span title="' + formatarNumero(numero) + '">' + formatarNumero(numero) + '</span>';
+    item.addEventListener('click', () => { painel.innerHTML = ''; abrirConversa(numero, ''); });
+    resultados.appendChild(item);
+  });
+  pesquisa.focus();
+}
+
+(async () => {
+  await esperar(CONFIG.latencia_login);
+  document.getElementById('app').innerHTML =
+    '<div id="lateral"><div contenteditable="true" data-tab="3"></div>'
+    + '<button aria-label="Nova conversa"><span data-icon="new-chat-outline">✚</span></button>'
+    + '<div id="nova-conversa"></div></div><div id="main"></div>';
+  document.querySelector('[aria-label="Nova conversa"]').addEventListener('click', abrirNovaConversa);
+  const parametros = new URLSearchParams(location.search);
+  if (location.pathname === '/send' && parametros.get('phone')) {
+    abrirConversa(parametros.get('phone').replace(/\\D/g, ''), parametros.get('text') || '');
+  }
+})();
+</script>
+</body>
+</html>
+"""
+
+
+# Função para subir o servidor falso numa thread; retorna o servidor (chame .shutdown() ao terminar)
+def iniciar_servidor(porta=PORTA_PADRAO, **config):
+    pagina = PAGINA.replace('__CONFIG__', json.dumps({**CONFIG_PADRAO, **config})).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if urlparse(self.path).path not in ('/', '/send'):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(pagina)))
+            self.end_headers()
+            self.wfile.write(pagina)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="WhatsApp Web falso para testar os disparadores")
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    for chave, valor in CONFIG_PADRAO.items():
+        parser.add_argument(f"--{chave.replace('_', '-')}", type=float, default=valor)
+    args = parser.parse_args()
+
+    config = {chave: getattr(args, chave) for chave in CONFIG_PADRAO}
+    servidor = iniciar_servidor(args.porta, **config)
+    print(f"🧪 WhatsApp falso em http://127.0.0.1:{args.porta} ({config})")
+    print("   Ctrl+C para parar")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,168 @@
+"""
+🔎 Busca de leads com nomes/empresas parecidos (fuzzy), com blocagem
+
+Complementa a resolução de identidade: aponta pares de leads diferentes cujo
+Nome ou Empresa parecem ser a mesma pessoa/farmácia escrita de outro jeito.
+Só compara registros do mesmo bloco (raiz do CNPJ, DDD + início da empresa,
+DDD + início do nome) e, dentro do bloco, só vizinhos na ordem alfabética,
+então nunca faz a comparação de todos contra todos.
+
+A similaridade é o Jaccard dos conjuntos de tokens, calculado de forma
+vetorizada sobre uma matriz de códigos de token por registro.
+"""
+
+import numpy as np
+import pandas as pd
+
+from identidade import normalizar_cnpjs
+
+# Palavras que não ajudam a distinguir uma farmácia de outra
+PALAVRAS_GENERICAS = {
+    'farmacia', 'farmacias', 'drogaria', 'drogarias', 'drogas', 'ltda', 'me', 'epp', 'eireli', 'sa',
+    'comercio', 'medicamentos', 'de', 'da', 'do', 'das', 'dos', 'e',
+}
+
+LIMIAR_SIMILARIDADE = 0.6
+JANELA_VIZINHOS = 10
+TAMANHO_PREFIXO = 4
+MAX_TOKENS = 8  # tokens além disso são ignorados na comparação
+
+# Pontuação e palavras genéricas viram um único espaço, numa passada só
+_PADRAO_SEPARADORES = r'(?:[^a-z0-9]|\b(?:' + '|'.join(sorted(PALAVRAS_GENERICAS)) + r')\b)+'
+
+
+# Função para dobrar texto: minúsculas, sem acentos, sem pontuação e sem palavras genéricas
+def dobrar_texto(serie):
+    # Cada grafia distinta é dobrada uma vez só
+    codigos, unicos = pd.factorize(serie.fillna('').astype(str))
+    dobrados = (
+        pd.Series(unicos, dtype=object).str.lower()
+        .str.normalize('NFKD').str.encode('ascii', errors='ignore').str.decode('ascii')
+        .str.replace(_PADRAO_SEPARADORES, ' ', regex=True).str.strip()
+    )
+    return pd.Series(dobrados.to_numpy()[codigos], index=serie.index, dtype=object)
+
+
+# Matriz (registros x MAX_TOKENS) com os códigos dos tokens distintos de cada registro (-1 = vazio)
+def _matriz_tokens(dobrado):
+    # Tokeniza cada texto distinto uma vez só
+    codigos_texto, unicos = pd.factorize(dobrado)
+    tokens = pd.Series(unicos, dtype=object).str.split().explode()
+    tokens = tokens[tokens.notna() & (tokens != '')]
+
+    matriz = np.full((len(unicos), MAX_TOKENS), -1, dtype=np.int32)
+    if len(tokens) > 0:
+        linhas = tokens.index.to_numpy()
+        codigos, _ = pd.factorize(tokens)
+        distintos = ~pd.DataFrame({'linha': linhas, 'codigo': codigos}).duplicated().to_numpy()
+        linhas, codigos = linhas[distintos], codigos[distintos]
+
+        # Posição do token dentro do registro (os tokens de cada linha vêm contíguos e em ordem)
+        inicio_linha = np.r_[0, np.flatnonzero(np.diff(linhas)) + 1]
+        posicao = np.arange(len(linhas)) - np.repeat(inicio_linha, np.diff(np.r_[inicio_linha, len(linhas)]))
+        cabe = posicao < MAX_TOKENS
+        matriz[linhas[cabe], posicao[cabe]] = codigos[cabe]
+
+    # Só as colunas realmente usadas: o custo do Jaccard cresce com o quadrado da largura
+    largura = max(int((matriz >= 0).sum(axis=1).max()), 1) if len(matriz) > 0 else 1
+    return np.ascontiguousarray(matriz[:, :largura])[codigos_texto]
+
+
+# Jaccard exato dos conjuntos de tokens de cada par (a, b)
+def _jaccard(matriz, a, b):
+    tokens_a, tokens_b = matriz[a], matriz[b]
+    intersecao = np.zeros(len(a), dtype=np.int64)
+    for i in range(matriz.shape[1]):
+        coluna = tokens_a[:, i]
+        presente = coluna >= 0
+        for j in range(matriz.shape[1]):
+            intersecao += presente & (tokens_b[:, j] == coluna)
+
+    uniao = (tokens_a >= 0).sum(axis=1) + (tokens_b >= 0).sum(axis=1) - intersecao
+    return np.where(uniao > 0, intersecao / np.maximum(uniao, 1), 0.0)
+
+
+# Pares candidatos: vizinhos (até `janela` posições) na ordem (bloco, texto), dentro do mesmo bloco
+def _pares_do_bloco(bloco, texto, janela):
+    validos = np.flatnonzero(bloco.to_numpy() != '')
+    if len(validos) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    codigos_bloco, _ = pd.factorize(bloco.to_numpy()[validos])
+    codigos_texto, _ = pd.factorize(texto.to_numpy()[validos], sort=True)
+    ordem_local = np.lexsort((codigos_texto, codigos_bloco))
+    ordem = validos[ordem_local]
+    blocos = codigos_bloco[ordem_local]
+
+    pares = []
+    for distancia in range(1, min(janela, len(ordem) - 1) + 1):
+        mesmo_bloco = blocos[:-distancia] == blocos[distancia:]
+        pares.append(np.column_stack([ordem[:-distancia][mesmo_bloco], ordem[distancia:][mesmo_bloco]]))
+    return np.concatenate(pares)
+
+
+# Função para encontrar leads suspeitos de serem a mesma pessoa/farmácia
+def encontrar_semelhantes(df, limiar=LIMIAR_SIMILARIDADE, janela=JANELA_VIZINHOS):
+    """
+    Recebe a lista consolidada (um registro por lead, com lead_id) e devolve
+    um DataFrame com os pares suspeitos, a similaridade e o campo que bateu.
+    Nada é mesclado: os pares servem para revisão manual.
+    """
+    df = df.reset_index(drop=True)
+    colunas_saida = [
+        'Similaridade', 'Campo', 'Nome_A', 'Nome_B', 'Empresa_A', 'Empresa_B',
+        'Telefone_A', 'Telefone_B', 'lead_id_A', 'lead_id_B',
+    ]
+    if len(df) < 2:
+        return pd.DataFrame(columns=colunas_saida)
+
+    nome = dobrar_texto(df['Nome'])
+    empresa = dobrar_texto(df['Empresa'])
+    ddd = df['Telefone'].fillna('').astype(str).str[3:5]
+    raiz_cnpj = pd.Series(normalizar_cnpjs(df['CNPJ']) // 1_000_000)
+
+    blocos = [
+        (raiz_cnpj.astype(str).where(raiz_cnpj > 0, ''), empresa),
+        ((ddd + '|' + empresa.str[:TAMANHO_PREFIXO]).where(empresa != '', ''), empresa),
+        ((ddd + '|' + nome.str[:TAMANHO_PREFIXO]).where(nome != '', ''), nome),
+    ]
+    pares = np.concatenate([_pares_do_bloco(bloco, texto, janela) for bloco, texto in blocos])
+    if len(pares) == 0:
+        return pd.DataFrame(columns=colunas_saida)
+
+    # Mesmo par achado por mais de um bloco conta uma vez
+    pares = np.sort(pares, axis=1)
+    codigos_par = np.unique(pares[:, 0] * len(df) + pares[:, 1])
+    a, b = codigos_par // len(df), codigos_par % len(df)
+
+    lead_id = df['lead_id'].to_numpy()
+    distintos = lead_id[a] != lead_id[b]
+    a, b = a[distintos], b[distintos]
+
+    tokens_nome = _matriz_tokens(nome)
+    tokens_empresa = _matriz_tokens(empresa)
+
+    # Nome com um token só ("Lucas") bate demais por acaso: exige dois tokens dos dois lados
+    qtd_tokens_nome = (tokens_nome >= 0).sum(axis=1)
+    nome_comparavel = (qtd_tokens_nome[a] >= 2) & (qtd_tokens_nome[b] >= 2)
+    sim_nome = np.zeros(len(a))
+    sim_nome[nome_comparavel] = _jaccard(tokens_nome, a[nome_comparavel], b[nome_comparavel])
+    sim_empresa = _jaccard(tokens_empresa, a, b)
+
+    similaridade = np.maximum(sim_nome, sim_empresa)
+    suspeitos = similaridade >= limiar
+    a, b = a[suspeitos], b[suspeitos]
+
+    resultado = pd.DataFrame({
+        'Similaridade': similaridade[suspeitos].round(2),
+        'Campo': np.where(sim_empresa[suspeitos] >= sim_nome[suspeitos], 'Empresa', 'Nome'),
+        'Nome_A': df['Nome'].to_numpy()[a],
+        'Nome_B': df['Nome'].to_numpy()[b],
+        'Empresa_A': df['Empresa'].to_numpy()[a],
+        'Empresa_B': df['Empresa'].to_numpy()[b],
+        'Telefone_A': df['Telefone'].to_numpy()[a],
+        'Telefone_B': df['Telefone'].to_numpy()[b],
+        'lead_id_A': lead_id[a],
+        'lead_id_B': lead_id[b],
+    }, columns=colunas_saida)
+    return resultado.sort_values('Similaridade', ascending=False, ignore_index=True)
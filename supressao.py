@@ -0,0 +1,212 @@
+"""
+🚫 Lista de supressão: telefones que não podem receber a campanha
+
+Quem pediu para sair, quem já é cliente e quem já recebeu a mensagem ficam
+numa base SQLite (um registro por telefone canônico, com motivo e data).
+Para usar, a lista inteira é carregada num ConjuntoTelefones (chaves int64
+ordenadas, 8 bytes por telefone), então filtrar um lote de leads é uma
+única busca vetorizada, feita antes de qualquer envio ou exportação.
+
+Uso pela linha de comando:
+    python supressao.py adicionar 41999719021 48991808174 --motivo opt_out --obs "respondeu SAIR"
+    python supressao.py remover 41999719021
+    python supressao.py importar-diario diario_envios.jsonl
+    python supressao.py importar-status Farmagnus.csv
+    python supressao.py listar
+"""
+
+import argparse
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from diario_envios import ESTADO_ENVIADO, ler_diario, status_ja_enviado
+from telefones import ConjuntoTelefones, canonicalizar_telefones, chaves_telefones
+
+CAMINHO_SUPRESSAO_PADRAO = 'supressao.db'
+
+MOTIVO_OPT_OUT = 'opt_out'
+MOTIVO_CLIENTE = 'cliente'
+MOTIVO_JA_CONTATADO = 'ja_contatado'
+# Do mais forte para o mais fraco: um motivo nunca é trocado por um mais fraco
+MOTIVOS = [MOTIVO_OPT_OUT, MOTIVO_CLIENTE, MOTIVO_JA_CONTATADO]
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS supressao (
+    telefone TEXT PRIMARY KEY,
+    motivo TEXT NOT NULL,
+    observacao TEXT NOT NULL DEFAULT '',
+    incluido_em TEXT NOT NULL
+);
+
+-- Contador de linhas alteradas na lista (versão para os caches de quem filtra por ela)
+CREATE TABLE IF NOT EXISTS versao (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    mudancas INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO versao (id, mudancas) VALUES (1, 0);
+"""
+
+
+# Expressão SQL com a força de um motivo (0 = mais forte)
+def _forca_motivo(coluna):
+    casos = ' '.join(f"WHEN '{motivo}' THEN {forca}" for forca, motivo in enumerate(MOTIVOS))
+    return f"CASE {coluna} {casos} ELSE {len(MOTIVOS)} END"
+
+
+# Abre (e cria, se preciso) a base de supressão
+def abrir_supressao(caminho=CAMINHO_SUPRESSAO_PADRAO):
+    conn = sqlite3.connect(caminho, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(ESQUEMA)
+    return conn
+
+
+# Soma as linhas alteradas por uma escrita ao contador de versão (dentro da mesma transação)
+def _registrar_mudancas(conn, antes):
+    mudancas = conn.total_changes - antes
+    if mudancas:
+        conn.execute("UPDATE versao SET mudancas = mudancas + ? WHERE id = 1", (mudancas,))
+    return mudancas
+
+
+# Função para incluir telefones na lista; retorna (linhas incluídas ou atualizadas, telefones inválidos)
+def adicionar_supressoes(conn, telefones, motivo, observacao=''):
+    """
+    Telefones já suprimidos só são atualizados quando o novo motivo é tão
+    forte quanto o atual (um opt-out não vira "já contatado"), então a
+    contagem devolvida é a de linhas realmente gravadas. Números que não
+    viram E.164 são devolvidos sem entrar na lista.
+    """
+    telefones = pd.Series(list(telefones), dtype=object)
+    canonicos = canonicalizar_telefones(telefones)
+    validos = canonicos.str.len() > 0
+    agora = datetime.now().isoformat(timespec='seconds')
+
+    with conn:
+        antes = conn.total_changes
+        conn.executemany(f"""
+            INSERT INTO supressao (telefone, motivo, observacao, incluido_em) VALUES (?, ?, ?, ?)
+            ON CONFLICT(telefone) DO UPDATE SET
+                motivo = excluded.motivo, observacao = excluded.observacao, incluido_em = excluded.incluido_em
+            WHERE {_forca_motivo('excluded.motivo')} <= {_forca_motivo('supressao.motivo')}
+        """, ((telefone, motivo, observacao, agora) for telefone in canonicos[validos].unique()))
+        gravados = _registrar_mudancas(conn, antes)
+    return gravados, telefones[~validos].tolist()
+
+
+# Função para tirar telefones da lista; retorna quantos saíram
+def remover_supressoes(conn, telefones):
+    canonicos = canonicalizar_telefones(pd.Series(list(telefones), dtype=object))
+    with conn:
+        antes = conn.total_changes
+        conn.executemany("DELETE FROM supressao WHERE telefone = ?", ((t,) for t in canonicos if t))
+        return _registrar_mudancas(conn, antes)
+
+
+def ler_supressoes(conn):
+    return pd.read_sql_query(
+        "SELECT telefone, motivo, observacao, incluido_em FROM supressao ORDER BY incluido_em, telefone", conn
+    )
+
+
+# Muda sempre que a lista muda (mesmo várias vezes no mesmo segundo); serve de chave para caches de quem filtra por ela
+def versao_supressao(conn):
+    return conn.execute("SELECT mudancas FROM versao WHERE id = 1").fetchone()[0]
+
+
+class ListaSupressao:
+    """
+    A lista de supressão em memória: chaves int64 ordenadas e, na mesma
+    ordem, o motivo de cada telefone. Carregue uma vez e filtre lotes
+    inteiros com `motivos()` / `suprimidos()`.
+    """
+
+    def __init__(self, conn):
+        supressoes = ler_supressoes(conn)
+        chaves = chaves_telefones(supressoes['telefone'])
+        ordem = np.argsort(chaves, kind='stable')
+        self.conjunto = ConjuntoTelefones(chaves[ordem])
+        self.motivos_ordenados = supressoes['motivo'].to_numpy(dtype=object)[ordem]
+
+    def __len__(self):
+        return len(self.conjunto)
+
+    # Motivo de cada chave int64 ("" quando o telefone não está na lista)
+    def motivos_chaves(self, chaves):
+        posicoes = self.conjunto.posicoes(chaves)
+        motivos = np.full(len(posicoes), '', dtype=object)
+        encontrados = posicoes >= 0
+        motivos[encontrados] = self.motivos_ordenados[posicoes[encontrados]]
+        return motivos
+
+    def suprimidos_chaves(self, chaves):
+        return self.conjunto.contem(chaves)
+
+    # Mesmas consultas a partir de telefones já canônicos (E.164)
+    def motivos(self, canonicos):
+        return self.motivos_chaves(chaves_telefones(canonicos))
+
+    def suprimidos(self, canonicos):
+        return self.suprimidos_chaves(chaves_telefones(canonicos))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gerencia a lista de supressão dos disparos de WhatsApp")
+    parser.add_argument('--base', default=CAMINHO_SUPRESSAO_PADRAO,
+                        help=f"arquivo SQLite da lista (padrão: {CAMINHO_SUPRESSAO_PADRAO})")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    adicionar = comandos.add_parser('adicionar', help="inclui telefones (ex.: quem respondeu pedindo para sair)")
+    adicionar.add_argument('telefones', nargs='+')
+    adicionar.add_argument('--motivo', choices=MOTIVOS, default=MOTIVO_OPT_OUT)
+    adicionar.add_argument('--obs', default='', help="observação livre (ex.: texto da resposta)")
+
+    remover = comandos.add_parser('remover', help="tira telefones da lista")
+    remover.add_argument('telefones', nargs='+')
+
+    importar_diario = comandos.add_parser('importar-diario', help="inclui os envios confirmados de diários de envio")
+    importar_diario.add_argument('diarios', nargs='+')
+
+    importar_status = comandos.add_parser('importar-status',
+                                          help="inclui os leads que a coluna Status de um CSV marca como já enviados")
+    importar_status.add_argument('csv')
+
+    comandos.add_parser('listar', help="mostra a lista e as contagens por motivo")
+    args = parser.parse_args()
+
+    conn = abrir_supressao(args.base)
+
+    if args.comando == 'adicionar':
+        incluidos, invalidos = adicionar_supressoes(conn, args.telefones, args.motivo, args.obs)
+        print(f"🚫 {incluidos} telefones incluídos ou atualizados como {args.motivo}")
+        if invalidos:
+            print(f"⚠️ Ignorados (não são telefones válidos): {', '.join(map(str, invalidos))}")
+
+    elif args.comando == 'remover':
+        print(f"✅ {remover_supressoes(conn, args.telefones)} telefones removidos da lista")
+
+    elif args.comando == 'importar-diario':
+        enviados = [
+            registro['telefone'] for caminho in args.diarios for registro in ler_diario(caminho)
+            if registro.get('estado') == ESTADO_ENVIADO
+        ]
+        incluidos, _ = adicionar_supressoes(conn, enviados, MOTIVO_JA_CONTATADO, ', '.join(args.diarios))
+        print(f"🚫 {incluidos} telefones com envio confirmado incluídos ou atualizados como {MOTIVO_JA_CONTATADO}")
+
+    elif args.comando == 'importar-status':
+        df = pd.read_csv(args.csv, dtype={'Telefone': str})
+        contatados = df.loc[status_ja_enviado(df['Status']), 'Telefone']
+        incluidos, invalidos = adicionar_supressoes(conn, contatados, MOTIVO_JA_CONTATADO, args.csv)
+        print(f"🚫 {incluidos} telefones com Status de mensagem enviada incluídos ou atualizados como {MOTIVO_JA_CONTATADO}")
+        if invalidos:
+            print(f"⚠️ Ignorados (telefone inválido): {', '.join(map(str, invalidos))}")
+
+    supressoes = ler_supressoes(conn)
+    if args.comando == 'listar':
+        print(supressoes.to_string(index=False) if len(supressoes) else "(lista vazia)")
+    print(f"📋 {len(supressoes)} telefones na lista de supressão ({args.base})")
+    for motivo, quantidade in supressoes['motivo'].value_counts().items():
+        print(f"   {motivo}: {quantidade}")
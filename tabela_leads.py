@@ -0,0 +1,159 @@
+"""
+🗜️ Tabela canônica e compacta dos leads, compartilhada entre as sessões do app
+
+Uma única tabela colunar guarda todos os registros: textos repetidos viram
+categorias (cada texto distinto guardado uma vez), Origem é categórica e o
+telefone é a chave int64 (8 bytes em vez de uma string Python). A lista
+única e os registros de cada origem não são cópias: são arrays de posições
+nessa tabela, e as colunas auxiliares (normalizadas, flags de duplicata)
+são calculadas só quando alguém precisa delas. Os DataFrames no formato
+antigo são montados sob demanda, de preferência só para a página visível.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ingestao import COLUNAS_LEADS
+from telefones import chaves_telefones
+
+COLUNAS_TEXTO = ['Nome', 'Email', 'Empresa', 'CNPJ']
+
+# Colunas com menos distintos que isso (fração das linhas) viram categorias
+LIMITE_CATEGORIA = 0.5
+
+
+# Texto como categoria quando compensa (valores repetidos entre fontes são guardados uma vez só)
+def _compactar_texto(serie):
+    codigos, distintos = pd.factorize(serie.to_numpy())
+    if len(serie) == 0 or len(distintos) > LIMITE_CATEGORIA * len(serie):
+        return serie.to_numpy(dtype=object)
+    return pd.Categorical.from_codes(codigos, categories=pd.Index(distintos, dtype=object))
+
+
+# Chaves int64 de volta para E.164 ("" onde não há telefone)
+def _telefones_e164(chaves):
+    texto = np.char.add('+', chaves.astype(str)).astype(object)
+    texto[chaves <= 0] = ''
+    return texto
+
+
+class VisaoLeads:
+    """
+    Um subconjunto das linhas da tabela (lista única, todos os registros...)
+    guardado como posições. `df()` monta o DataFrame; `linhas()` só as
+    posições pedidas (relativas à visão), para paginar. `attrs` vai junto
+    para os DataFrames montados (ex.: os nomes das origens da máscara).
+    """
+
+    def __init__(self, tabela, posicoes, extras=None, attrs=None):
+        self.tabela = tabela
+        self.posicoes = posicoes
+        self.extras = extras or {}
+        self.attrs = attrs or {}
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    # Uma coluna da visão como Series (colunas extras por lead ou colunas da tabela)
+    def __getitem__(self, coluna):
+        if coluna in self.extras:
+            return pd.Series(self.extras[coluna], copy=False)
+        return self.linhas(np.arange(len(self)), [coluna])[coluna]
+
+    def linhas(self, posicoes, colunas=None):
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        df = self.tabela.montar(self.posicoes[posicoes], colunas, {
+            nome: valores[posicoes] for nome, valores in self.extras.items()
+            if colunas is None or nome in colunas
+        })
+        df.attrs.update(self.attrs)
+        return df
+
+    def df(self):
+        return self.linhas(np.arange(len(self)))
+
+
+class TabelaLeads:
+    """
+    Registros consolidados numa tabela só. `todos` é a visão com todos os
+    registros (formato de df_todos) e `unicos` a lista única (formato de
+    df_unico, com Mascara_Origens e Qtd_Origens).
+    """
+
+    def __init__(self, df_todos, df_unico, posicoes_unicos=None):
+        """
+        `posicoes_unicos` são as posições, em df_todos, do registro que
+        representa cada lead de df_unico (caso de consolidar_leads). Sem elas
+        (base persistente, em que a lista única tem campos completados depois),
+        as linhas de df_unico entram na tabela depois dos registros.
+        """
+        blocos = [df_todos] if posicoes_unicos is not None else [df_todos, df_unico]
+        dados = pd.concat([bloco[COLUNAS_LEADS + ['lead_id']] for bloco in blocos], ignore_index=True)
+
+        self.colunas = {coluna: _compactar_texto(dados[coluna]) for coluna in COLUNAS_TEXTO}
+        self.colunas['Origem'] = dados['Origem'].astype('category').array
+        self.telefones = chaves_telefones(dados['Telefone'])
+        self.lead_id = dados['lead_id'].to_numpy(dtype=np.int64)
+
+        posicoes_todos = np.arange(len(df_todos))
+        if posicoes_unicos is None:
+            posicoes_unicos = np.arange(len(df_todos), len(dados))
+
+        # Registros do mesmo lead (duplicatas) como máscara sobre os registros
+        _, codigos, contagem = np.unique(self.lead_id[posicoes_todos], return_inverse=True, return_counts=True)
+        self.todos = VisaoLeads(self, posicoes_todos, {'duplicata_lead': contagem[codigos] > 1})
+        self.unicos = VisaoLeads(self, np.asarray(posicoes_unicos, dtype=np.int64), {
+            'Mascara_Origens': df_unico['Mascara_Origens'].to_numpy(dtype=np.int64),
+            'Qtd_Origens': df_unico['Qtd_Origens'].to_numpy().astype(np.int8),
+        }, {'origens': list(df_unico.attrs['origens'])})
+
+    # DataFrame com as linhas pedidas, nas colunas canônicas + lead_id + colunas extras da visão
+    def montar(self, posicoes, colunas=None, extras=None):
+        dados = {}
+        for coluna in COLUNAS_LEADS + ['lead_id']:
+            if colunas is not None and coluna not in colunas:
+                continue
+            if coluna == 'Telefone':
+                dados[coluna] = _telefones_e164(self.telefones[posicoes])
+            elif coluna == 'lead_id':
+                dados[coluna] = self.lead_id[posicoes]
+            else:
+                dados[coluna] = np.asarray(self.colunas[coluna].take(posicoes), dtype=object)
+        dados.update(extras or {})
+        return pd.DataFrame(dados, index=pd.RangeIndex(len(posicoes)))
+
+    @property
+    def origens(self):
+        return list(self.colunas['Origem'].categories)
+
+    # Posições (na visão `todos`) dos registros de uma origem
+    def posicoes_origem(self, origem):
+        codigo = self.colunas['Origem'].categories.get_loc(origem)
+        return np.flatnonzero(self.colunas['Origem'].codes[self.todos.posicoes] == codigo)
+
+    def memoria(self):
+        return memoria_objeto([self.colunas, self.telefones, self.lead_id, self.todos.posicoes, self.todos.extras,
+                               self.unicos.posicoes, self.unicos.extras])
+
+
+# Bytes ocupados por um objeto (DataFrames, arrays, tabelas e coleções deles), contando os textos
+def memoria_objeto(objeto):
+    if isinstance(objeto, TabelaLeads):
+        return objeto.memoria()
+    if isinstance(objeto, VisaoLeads):
+        return memoria_objeto([objeto.posicoes, objeto.extras])
+    if isinstance(objeto, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(objeto.memory_usage(deep=True)))
+    if isinstance(objeto, pd.Categorical):
+        return int(objeto.memory_usage(deep=True))
+    if isinstance(objeto, np.ndarray):
+        if objeto.dtype == object:
+            return objeto.nbytes + sum(sys.getsizeof(valor) for valor in objeto.ravel())
+        return objeto.nbytes
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(memoria_objeto(valor) for valor in objeto.values())
+    if isinstance(objeto, (list, tuple, set)):
+        return sys.getsizeof(objeto) + sum(memoria_objeto(valor) for valor in objeto)
+    return sys.getsizeof(objeto)
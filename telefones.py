@@ -0,0 +1,207 @@
+"""
+📱 Canonicalização vetorizada de telefones brasileiros para E.164 (+55DDNNNNNNNNN)
+
+Usado pelos importadores (app_leads.py / processar_leads.py) e pelos disparadores,
+para que todo o sistema compare e envie sempre o mesmo formato de número.
+
+Os números são tratados como uma matriz de caracteres (numpy), então o custo
+não depende de chamadas Python por linha.
+"""
+
+import numpy as np
+import pandas as pd
+
+CODIGO_PAIS = '55'
+LARGURA_E164 = 14  # '+' + 55 + DDD + 9 dígitos
+
+_ZERO = ord('0')
+_NOVE = ord('9')
+_PONTO = ord('.')
+
+
+# Converte a Series em matriz (linhas x posições) com os dígitos de cada número, já como inteiros 0-9
+def _matriz_digitos(serie):
+    texto = serie.astype(str).to_numpy().astype('U')
+    if texto.dtype.itemsize == 0:
+        texto = texto.astype('U1')
+    matriz = texto.view(np.uint32).reshape(len(texto), -1)
+
+    eh_digito = (matriz >= _ZERO) & (matriz <= _NOVE)
+
+    # Excel costuma entregar telefones como float ("41999719021.0"): descarta o ".0" final
+    ponto = matriz == _PONTO
+    if ponto.any():
+        so_zeros_ate_o_fim = np.flip(
+            np.logical_and.accumulate(np.flip((matriz == _ZERO) | (matriz == 0), axis=1), axis=1),
+            axis=1,
+        )
+        ponto_decimal = ponto & np.concatenate(
+            [so_zeros_ate_o_fim[:, 1:], np.ones((len(matriz), 1), dtype=bool)], axis=1
+        )
+        eh_digito &= ~np.logical_or.accumulate(ponto_decimal, axis=1)
+
+    # Compacta os dígitos de cada linha para a esquerda, em índices planos
+    largura = matriz.shape[1] + 16  # folga para ler posições além do fim sem checar limites
+    origem = np.flatnonzero(eh_digito)
+    contador = np.int8 if matriz.shape[1] < 128 else np.int32
+    posicao = np.cumsum(eh_digito, axis=1, dtype=contador).ravel()[origem] - 1
+
+    digitos = np.zeros(len(matriz) * largura, dtype=np.int8)
+    digitos[(origem // matriz.shape[1]) * largura + posicao] = matriz.ravel()[origem] - _ZERO
+    return digitos.reshape(len(matriz), largura), eh_digito.sum(axis=1)
+
+
+# Função para canonicalizar uma coluna inteira de telefones (sem apply por linha)
+def canonicalizar_telefones(serie):
+    """
+    Converte uma Series de telefones em texto livre para E.164.
+
+    Trata números que já vêm com o 55, prefixo internacional 0055, prefixo de
+    tronco 0 (com ou sem código de operadora) e celulares antigos sem o nono
+    dígito. Números que não formam um telefone brasileiro viram "".
+    """
+    if len(serie) == 0:
+        return pd.Series([], index=serie.index, dtype=object)
+
+    digitos, tamanho = _matriz_digitos(serie)
+
+    def d(posicao):
+        return digitos[:, posicao]
+
+    # Prefixos na ordem de preferência: 0055, 55, tronco com operadora (0XX), tronco (0), nenhum
+    prefixos = [
+        (4, (d(0) == 0) & (d(1) == 0) & (d(2) == 5) & (d(3) == 5)),
+        (2, (d(0) == 5) & (d(1) == 5)),
+        (3, (d(0) == 0) & (d(1) >= 1)),
+        (1, d(0) == 0),
+        (0, np.ones(len(digitos), dtype=bool)),
+    ]
+
+    inicio = np.zeros(len(digitos), dtype=np.int64)
+    valido = np.zeros(len(digitos), dtype=bool)
+    for largura_prefixo, casa_prefixo in prefixos:
+        nacional = tamanho - largura_prefixo
+        primeiro = d(largura_prefixo + 2)
+        ok = (
+            casa_prefixo
+            & ~valido
+            & (d(largura_prefixo) >= 1)
+            & (d(largura_prefixo + 1) >= 1)
+            & (((nacional == 11) & (primeiro == 9)) | ((nacional == 10) & (primeiro >= 2)))
+        )
+        inicio[ok] = largura_prefixo
+        valido |= ok
+
+    nacional = np.take_along_axis(digitos, inicio[:, None] + np.arange(11), axis=1)
+    tamanho_nacional = tamanho - inicio
+
+    # Celular antigo (DDD + 8 dígitos começando em 6-9) ganha o nono dígito
+    sem_nono = (tamanho_nacional == 10) & (nacional[:, 2] >= 6)
+    nacional[sem_nono, 3:] = nacional[sem_nono, 2:10]
+    nacional[sem_nono, 2] = 9
+    fixo = (tamanho_nacional == 10) & ~sem_nono
+
+    saida = np.zeros((len(digitos), LARGURA_E164), dtype=np.uint32)
+    saida[:, 0] = ord('+')
+    saida[:, 1:3] = [ord(c) for c in CODIGO_PAIS]
+    saida[:, 3:] = nacional + _ZERO
+    saida[fixo, LARGURA_E164 - 1] = 0
+    saida[~valido] = 0
+
+    canonicos = saida.view(f'U{LARGURA_E164}').ravel().astype(object)
+    return pd.Series(canonicos, index=serie.index, dtype=object)
+
+
+# DDDs em uso no Brasil (Anatel)
+DDDS_VALIDOS = frozenset([
+    11, 12, 13, 14, 15, 16, 17, 18, 19,
+    21, 22, 24, 27, 28,
+    31, 32, 33, 34, 35, 37, 38,
+    41, 42, 43, 44, 45, 46, 47, 48, 49,
+    51, 53, 54, 55,
+    61, 62, 63, 64, 65, 66, 67, 68, 69,
+    71, 73, 74, 75, 77, 79,
+    81, 82, 83, 84, 85, 86, 87, 88, 89,
+    91, 92, 93, 94, 95, 96, 97, 98, 99,
+])
+
+# Motivos da validação antes do envio ('' = número ok para WhatsApp)
+MOTIVO_VAZIO = 'vazio'
+MOTIVO_FORMATO = 'formato_invalido'
+MOTIVO_DDD = 'ddd_inexistente'
+MOTIVO_FIXO = 'fixo'
+
+
+# Função para validar telefones antes do disparo (sem abrir o navegador)
+def validar_telefones(serie, aceitar_fixos=False):
+    """
+    Canonicaliza a coluna e classifica cada número: vazio, formato inválido,
+    DDD inexistente ou fixo (10 dígitos, sem o 9 de celular). Retorna
+    (canonicos, motivos), com motivo '' para os números aptos ao envio.
+    """
+    canonicos = canonicalizar_telefones(serie)
+    texto = canonicos.to_numpy(dtype=f'U{LARGURA_E164}')
+    tamanho = np.char.str_len(texto)
+
+    ddd = np.zeros(len(texto), dtype=np.int64)
+    com_numero = tamanho > 0
+    ddd[com_numero] = chaves_telefones(texto[com_numero]) // 10 ** (tamanho[com_numero] - 5) % 100
+    ddd_valido = np.isin(ddd, list(DDDS_VALIDOS))
+
+    vazio = serie.isna().to_numpy() | serie.astype(str).str.strip().str.lower().isin(['', 'nan']).to_numpy()
+    motivos = np.select(
+        [vazio, ~com_numero, ~ddd_valido, (tamanho == LARGURA_E164 - 1) & (not aceitar_fixos)],
+        [MOTIVO_VAZIO, MOTIVO_FORMATO, MOTIVO_DDD, MOTIVO_FIXO],
+        default='',
+    )
+    return canonicos, pd.Series(motivos, index=serie.index, dtype=object)
+
+
+# Versão escalar, para quem precisa de um único número (ex.: entrada pela linha de comando)
+def canonicalizar_telefone(telefone):
+    return canonicalizar_telefones(pd.Series([telefone])).iloc[0]
+
+
+# Converte telefones canônicos (E.164) em chaves int64 (sem o "+"); vazio vira 0
+def chaves_telefones(canonicos):
+    texto = np.asarray(canonicos, dtype=f'U{LARGURA_E164}')
+    matriz = texto.view(np.uint32).reshape(len(texto), LARGURA_E164)[:, 1:]
+
+    chaves = np.zeros(len(texto), dtype=np.int64)
+    for coluna in matriz.T:
+        presente = coluna > 0
+        chaves = np.where(presente, chaves * 10 + (coluna.astype(np.int64) - _ZERO), chaves)
+    return chaves
+
+
+class ConjuntoTelefones:
+    """
+    Conjunto de telefones já vistos, guardado como um array int64 ordenado.
+
+    Ocupa 8 bytes por telefone e responde pertinência de um lote inteiro com
+    busca binária vetorizada, o que mantém a deduplicação incremental barata
+    mesmo com milhões de leads.
+    """
+
+    def __init__(self, chaves=None):
+        self.chaves = np.unique(np.asarray(chaves, dtype=np.int64)) if chaves is not None else np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.chaves)
+
+    # Posição de cada chave no array ordenado, ou -1 quando ela não está no conjunto
+    def posicoes(self, chaves):
+        chaves = np.asarray(chaves, dtype=np.int64)
+        if len(self.chaves) == 0:
+            return np.full(len(chaves), -1, dtype=np.int64)
+        posicoes = np.minimum(np.searchsorted(self.chaves, chaves), len(self.chaves) - 1)
+        return np.where(self.chaves[posicoes] == chaves, posicoes, -1)
+
+    def contem(self, chaves):
+        return self.posicoes(chaves) >= 0
+
+    def adicionar(self, chaves):
+        chaves = np.asarray(chaves, dtype=np.int64)
+        novas = np.unique(chaves[~self.contem(chaves)])
+        if len(novas) > 0:
+            self.chaves = np.insert(self.chaves, np.searchsorted(self.chaves, novas), novas)
@@ -0,0 +1,378 @@
+"""
+💬 Interação com o WhatsApp Web compartilhada pelos disparadores
+
+Em vez de pausas fixas, cada passo espera uma condição do DOM: caixa de
+mensagem interagível, botão de enviar habilitado e o balão da mensagem
+enviada aparecendo com o tique de pendente/enviada. Assim o custo por
+contato acompanha o tempo real da página.
+
+O navegador usa um perfil persistente (a sessão do WhatsApp Web sobrevive
+entre execuções, sem novo QR code) e o caminho do chromedriver fica salvo
+depois da primeira resolução, sem ida à rede a cada início.
+"""
+
+import json
+import os
+import re
+import time
+import urllib.parse
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Endereço do WhatsApp Web; aponta para o servidor falso (servidor_whatsapp_falso.py) em testes e benchmarks
+URL_WHATSAPP = os.environ.get('WHATSAPP_URL', "https://web.whatsapp.com").rstrip('/')
+
+# Seletores do WhatsApp Web
+XPATH_CAIXA_PESQUISA = '//div[@contenteditable="true"][@data-tab="3"]'
+XPATH_CAIXA_MENSAGEM = '//div[@contenteditable="true"][@data-tab="10"]'
+XPATH_BOTAO_ENVIAR = '//button[@aria-label="Enviar" or @aria-label="Send"] | //span[@data-icon="send"]/ancestor::button'
+XPATH_MENSAGENS_SAIDA = '//div[contains(@class, "message-out")]'
+# Aviso "O número de telefone compartilhado através de url é inválido"
+XPATH_DIALOGO_NUMERO_INVALIDO = (
+    '//div[@role="dialog"][.//*[contains(text(), "inválido") or contains(text(), "invalid")]]'
+)
+XPATH_BOTAO_DIALOGO = './/button'
+# Botão "Nova conversa" da lista de conversas (rótulo em português/inglês ou o ícone)
+XPATH_BOTAO_NOVA_CONVERSA = (
+    '//*[@aria-label="Nova conversa" or @aria-label="New chat" or @title="Nova conversa" or @title="New chat"]'
+    ' | //span[@data-icon="new-chat-outline" or @data-icon="new-chat"]/ancestor::*[@role="button" or self::button][1]'
+)
+# Aviso de pesquisa sem resultado no painel lateral (fora da conversa aberta)
+XPATH_SEM_RESULTADO = (
+    '//*[not(ancestor::div[@id="main"])][contains(text(), "Nenhum resultado") or contains(text(), "No results")]'
+)
+# Relógio = pendente; um tique = enviada; dois tiques = entregue
+ICONES_STATUS = {'msg-time': 'pendente', 'msg-check': 'enviada', 'msg-dblcheck': 'entregue'}
+# Identificador (data-id da linha da mensagem) de cada balão de saída já na conversa
+JS_IDS_BALOES = """
+return Array.from(document.querySelectorAll('[class*="message-out"]'))
+  .map(balao => { const linha = balao.closest('[data-id]'); return linha ? linha.getAttribute('data-id') : null; })
+  .filter(id => id);
+"""
+CARACTERES_COMPARADOS = 40  # início do texto conferido no balão (mensagens longas aparecem cortadas)
+
+# Perfil do Chrome com a sessão do WhatsApp Web e cache do caminho do chromedriver
+PASTA_PERFIL_PADRAO = os.environ.get('WHATSAPP_PERFIL', str(Path.home() / '.disparador' / 'perfil_chrome'))
+ARQUIVO_CACHE_DRIVER = Path.home() / '.disparador' / 'chromedriver.json'
+
+TIMEOUT_LOGIN = 120
+TIMEOUT_CONVERSA = 30
+TIMEOUT_CONFIRMACAO = 15
+TIMEOUT_NAVEGACAO_APP = 8
+TEMPO_SEM_RESULTADO = 1.5  # a pesquisa mostra "nenhum resultado" antes de consultar o número no servidor
+INTERVALO_VERIFICACAO = 0.1  # frequência com que as condições da página são checadas
+
+# Navegação até a conversa: pela pesquisa de nova conversa, com o app já carregado (padrão), ou
+# recarregando a página pela URL /send
+MODO_APP = 'app'
+MODO_URL = 'url'
+MAX_FALHAS_APP = 2  # falhas seguidas no modo app antes de usar só a URL no resto do disparo
+
+# Digita o texto no editor como uma colagem (send_keys não aceita emojis fora do BMP e ENTER enviaria no meio)
+JS_INSERIR_TEXTO = """
+arguments[0].focus();
+document.execCommand('insertText', false, arguments[1]);
+"""
+
+
+# Caminho do chromedriver: o informado, o salvo em cache ou (só na primeira vez) o baixado pelo webdriver_manager
+# Com `renovar`, o cache é apagado e o caminho é resolvido de novo (ex.: o Chrome foi atualizado)
+def resolver_chromedriver(caminho=None, cache=ARQUIVO_CACHE_DRIVER, renovar=False):
+    if caminho:
+        return caminho
+
+    cache = Path(cache)
+    if renovar:
+        cache.unlink(missing_ok=True)
+    elif cache.exists():
+        salvo = json.loads(cache.read_text()).get('caminho')
+        if salvo and Path(salvo).exists():
+            return salvo
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    caminho = ChromeDriverManager().install()
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    cache.write_text(json.dumps({'caminho': caminho}))
+    return caminho
+
+
+# Função para abrir o Chrome no WhatsApp Web já logado (ou esperando o QR code)
+def iniciar_whatsapp(perfil=PASTA_PERFIL_PADRAO, chromedriver=None, timeout_login=TIMEOUT_LOGIN,
+                     url_base=URL_WHATSAPP, headless=False):
+    """
+    Abre o Chrome com o perfil persistente, carrega o WhatsApp Web e espera o
+    login. Retorna (driver, tempos), com a duração de cada etapa em segundos.
+    Com a sessão salva no perfil, o login acontece sem QR code.
+    """
+    tempos = {}
+    marco = time.perf_counter()
+
+    def etapa(nome):
+        nonlocal marco
+        agora = time.perf_counter()
+        tempos[nome] = agora - marco
+        marco = agora
+
+    caminho_driver = resolver_chromedriver(chromedriver)
+    etapa('driver')
+
+    Path(perfil).mkdir(parents=True, exist_ok=True)
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    options.add_argument(f"--user-data-dir={Path(perfil).resolve()}")
+    if headless:
+        options.add_argument("--headless=new")
+    try:
+        driver = webdriver.Chrome(service=Service(caminho_driver), options=options)
+    except SessionNotCreatedException:
+        # O chromedriver salvo não serve para o Chrome instalado: resolve de novo, uma vez só
+        if chromedriver:
+            raise
+        caminho_driver = resolver_chromedriver(renovar=True)
+        driver = webdriver.Chrome(service=Service(caminho_driver), options=options)
+    etapa('chrome')
+
+    driver.get(url_base)
+    etapa('pagina')
+
+    try:
+        esperar_login(driver, timeout_login)
+    except TimeoutException:
+        driver.quit()
+        raise
+    etapa('login')
+
+    tempos['total'] = sum(tempos.values())
+    return driver, tempos
+
+
+def formatar_tempos(tempos):
+    return ' | '.join(f"{etapa} {segundos:.1f}s" for etapa, segundos in tempos.items())
+
+
+# Espera o login (caixa de pesquisa da lista de conversas disponível)
+def esperar_login(driver, timeout=TIMEOUT_LOGIN):
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, XPATH_CAIXA_PESQUISA)))
+
+
+class NumeroInvalido(Exception):
+    """O WhatsApp Web avisou que o número não existe ou não tem WhatsApp."""
+
+    motivo = 'numero_invalido'
+
+
+# Fecha o aviso de número inválido para o app seguir usável
+def _fechar_dialogo(dialogo):
+    botoes = dialogo.find_elements(By.XPATH, XPATH_BOTAO_DIALOGO)
+    if botoes:
+        botoes[-1].click()
+
+
+# Título (span[@title]) igual ao número, ignorando a formatação "+55 41 99971-9021"
+def _xpath_titulo_numero(numero):
+    return f'span[@title][translate(@title, "+ -()\u00a0", "")="{numero}"]'
+
+
+# Função para esperar a conversa abrir, disputando a caixa de mensagem contra o aviso de número inválido
+def esperar_caixa_mensagem(driver, timeout=TIMEOUT_CONVERSA, anterior=None):
+    """
+    Retorna a caixa de mensagem assim que estiver clicável, ou levanta
+    NumeroInvalido assim que o aviso aparecer, o que vier primeiro. Com
+    `anterior` (a caixa da conversa que estava aberta), só aceita uma caixa nova.
+    """
+    def conversa_ou_aviso(driver):
+        dialogos = driver.find_elements(By.XPATH, XPATH_DIALOGO_NUMERO_INVALIDO)
+        if dialogos:
+            texto = dialogos[0].text.strip()
+            _fechar_dialogo(dialogos[0])
+            raise NumeroInvalido(texto or "número inválido")
+        if anterior is not None and not EC.staleness_of(anterior)(driver):
+            return False
+        return EC.element_to_be_clickable((By.XPATH, XPATH_CAIXA_MENSAGEM))(driver)
+
+    espera = WebDriverWait(
+        driver, timeout, poll_frequency=INTERVALO_VERIFICACAO, ignored_exceptions=(StaleElementReferenceException,)
+    )
+    return espera.until(conversa_ou_aviso)
+
+
+# Status (pendente/enviada/entregue) do balão de saída, ou None se ainda não tem tique
+def _status_do_balao(balao):
+    for icone, status in ICONES_STATUS.items():
+        if balao.find_elements(By.XPATH, f'.//span[@data-icon="{icone}"]'):
+            return status
+    return None
+
+
+# data-id do balão (ou da linha da mensagem que o contém), ou None
+def _id_do_balao(balao):
+    marcados = balao.find_elements(By.XPATH, './ancestor-or-self::*[@data-id][1]')
+    return marcados[0].get_attribute('data-id') if marcados else None
+
+
+# Só letras e dígitos: no balão os emojis viram imagens e o horário é acrescentado ao texto
+def _texto_comparavel(texto):
+    return re.sub(r'\W', '', texto or '').lower()
+
+
+# Função para enviar o texto já digitado na conversa aberta e confirmar o envio
+def enviar_mensagem_aberta(driver, caixa=None, timeout=TIMEOUT_CONFIRMACAO, etapas=None):
+    """
+    Clica em enviar assim que o botão estiver habilitado e espera o balão da
+    mensagem enviada aparecer com algum tique. O balão só conta se for o
+    último, com o texto digitado e um data-id que não existia antes do
+    clique (mensagens antigas ainda carregando não confirmam nada). Retorna
+    o status visto ('pendente', 'enviada' ou 'entregue'); levanta
+    TimeoutException se não houver confirmação.
+
+    Se `etapas` for um dicionário, recebe os instantes (time.monotonic) de
+    'submetido' (gravado logo antes do clique em enviar: sem ele, nada saiu)
+    e 'confirmado'.
+    """
+    etapas = etapas if etapas is not None else {}
+    caixa = caixa if caixa is not None else esperar_caixa_mensagem(driver)
+    baloes_antes = len(driver.find_elements(By.XPATH, XPATH_MENSAGENS_SAIDA))
+    ids_antes = set(driver.execute_script(JS_IDS_BALOES))
+    esperado = _texto_comparavel(caixa.text)[:CARACTERES_COMPARADOS]
+
+    caixa.click()
+    botao = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.XPATH, XPATH_BOTAO_ENVIAR)))
+    etapas['submetido'] = time.monotonic()
+    botao.click()
+
+    def novo_balao_com_tique(driver):
+        baloes = driver.find_elements(By.XPATH, XPATH_MENSAGENS_SAIDA)
+        if not baloes:
+            return False
+        balao = baloes[-1]
+        identificador = _id_do_balao(balao)
+        if identificador in ids_antes or (identificador is None and len(baloes) <= baloes_antes):
+            return False
+        if esperado not in _texto_comparavel(balao.text):
+            return False
+        return _status_do_balao(balao) or False
+
+    try:
+        # O balão é re-renderizado quando o tique muda
+        espera = WebDriverWait(driver, timeout, ignored_exceptions=(StaleElementReferenceException,))
+        status = espera.until(novo_balao_com_tique)
+        etapas['confirmado'] = time.monotonic()
+        return status
+    except TimeoutException:
+        raise TimeoutException("mensagem não apareceu como enviada na conversa")
+
+
+class NavegadorConversas:
+    """
+    Abre a conversa de cada contato sem recarregar o WhatsApp Web: botão
+    "Nova conversa", pesquisa pelo número e clique no resultado com esse
+    número. Só recorre à URL /send, que recarrega o app inteiro, quando a
+    pesquisa falha (ou depois de MAX_FALHAS_APP falhas seguidas, para o resto
+    do disparo). Guarda o tempo de navegação de cada contato por caminho
+    usado; o tempo da URL não inclui a tentativa frustrada no app.
+    """
+
+    def __init__(self, driver, modo=MODO_APP, max_falhas_app=MAX_FALHAS_APP, url_base=URL_WHATSAPP):
+        self.driver = driver
+        self.url_base = url_base.rstrip('/')
+        self.modo = modo
+        self.max_falhas_app = max_falhas_app
+        self.falhas_app_seguidas = 0
+        self.tempos = {MODO_APP: [], MODO_URL: []}
+
+    # Retorna a caixa de mensagem da conversa, ou None se a pesquisa não achar o número
+    def _abrir_no_app(self, numero):
+        espera = WebDriverWait(
+            self.driver, TIMEOUT_NAVEGACAO_APP, poll_frequency=INTERVALO_VERIFICACAO,
+            ignored_exceptions=(StaleElementReferenceException,),
+        )
+        foco_antes = self.driver.switch_to.active_element
+        espera.until(EC.element_to_be_clickable((By.XPATH, XPATH_BOTAO_NOVA_CONVERSA))).click()
+
+        # O painel de nova conversa abre com o foco na própria caixa de pesquisa
+        # (nunca a caixa de mensagem da conversa aberta nem o que tinha o foco antes do clique)
+        def pesquisa_com_foco(driver):
+            ativo = driver.switch_to.active_element
+            if ativo == foco_antes or ativo.get_attribute('contenteditable') != 'true':
+                return False
+            return False if ativo.find_elements(By.XPATH, 'ancestor::div[@id="main"]') else ativo
+
+        espera.until(pesquisa_com_foco).send_keys(numero)
+
+        xpath_resultado = f'//{_xpath_titulo_numero(numero)}[not(ancestor::div[@id="main"])]'
+        sem_resultado_desde = None
+
+        def resultado_ou_nenhum(driver):
+            nonlocal sem_resultado_desde
+            resultados = driver.find_elements(By.XPATH, xpath_resultado)
+            if resultados:
+                return resultados[0]
+            if not driver.find_elements(By.XPATH, XPATH_SEM_RESULTADO):
+                sem_resultado_desde = None
+                return False
+            sem_resultado_desde = sem_resultado_desde or time.monotonic()
+            return 'nenhum' if time.monotonic() - sem_resultado_desde >= TEMPO_SEM_RESULTADO else False
+
+        resultado = espera.until(resultado_ou_nenhum)
+        if resultado == 'nenhum':
+            return None
+        resultado.click()
+
+        # A caixa só vale quando o cabeçalho da conversa já é o do número pesquisado
+        xpath_cabecalho = f'//div[@id="main"]//header//{_xpath_titulo_numero(numero)}'
+
+        def conversa_do_numero(driver):
+            if not driver.find_elements(By.XPATH, xpath_cabecalho):
+                return False
+            return EC.element_to_be_clickable((By.XPATH, XPATH_CAIXA_MENSAGEM))(driver)
+
+        return espera.until(conversa_do_numero)
+
+    def _abrir_pela_url(self, numero, mensagem):
+        self.driver.get(f"{self.url_base}/send?phone={numero}&text={urllib.parse.quote(mensagem)}")
+        return esperar_caixa_mensagem(self.driver)
+
+    # Função para abrir a conversa com a mensagem já escrita
+    def abrir(self, telefone, mensagem):
+        """
+        Retorna (caixa, modo usado, segundos até a conversa ficar pronta). O
+        tempo não inclui a digitação da mensagem. Levanta NumeroInvalido
+        quando o WhatsApp recusa o número. Um número que a pesquisa não acha
+        vai para a URL, que dá o veredito, sem contar como falha do modo app.
+        """
+        numero = telefone.replace('+', '')
+        inicio = time.perf_counter()
+
+        if self.modo == MODO_APP:
+            try:
+                caixa = self._abrir_no_app(numero)
+                self.falhas_app_seguidas = 0
+                if caixa is not None:
+                    segundos = time.perf_counter() - inicio
+                    self.tempos[MODO_APP].append(segundos)
+                    self.driver.execute_script(JS_INSERIR_TEXTO, caixa, mensagem)
+                    return caixa, MODO_APP, segundos
+            except TimeoutException:
+                self.falhas_app_seguidas += 1
+                if self.falhas_app_seguidas >= self.max_falhas_app:
+                    self.modo = MODO_URL
+
+        inicio = time.perf_counter()
+        caixa = self._abrir_pela_url(numero, mensagem)
+        segundos = time.perf_counter() - inicio
+        self.tempos[MODO_URL].append(segundos)
+        return caixa, MODO_URL, segundos
+
+    def resumo(self):
+        partes = []
+        for modo, tempos in self.tempos.items():
+            if tempos:
+                partes.append(f"{modo}: {len(tempos)} conversas, média {sum(tempos) / len(tempos):.2f}s")
+        return ' | '.join(partes) or 'nenhuma conversa aberta'